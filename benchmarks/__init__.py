@@ -0,0 +1,11 @@
+"""
+Headless benchmarks of the clock's hot paths: the api, the log handlers and the
+`TimePiece` updates (against a stubbed Flet page, no client needed)
+
+Each benchmark reports the nanoseconds per operation, the results are written as JSON
+and compared with the stored `baseline.json`, so that a slower change gets caught.
+Usage:
+>>> python -m benchmarks                      # run all, compare with the baseline
+>>> python -m benchmarks -k api.get_time      # only the matching benchmarks
+>>> python -m benchmarks --save-baseline      # store the results as the new baseline
+"""
@@ -0,0 +1,91 @@
+"""Runs the benchmarks, writes the results and compares them with the baseline"""
+
+import argparse
+import fnmatch
+import sys
+from pathlib import Path
+
+from benchmarks import (  # noqa: F401 (registers them)
+    bench_api,
+    bench_cache,
+    bench_gui,
+    bench_logger,
+    bench_metrics,
+    bench_parser,
+    bench_scheduler,
+)
+from benchmarks._harness import (
+    BENCHMARKS,
+    DEFAULT_TOLERANCE,
+    compare,
+    dump,
+    load,
+    run,
+)
+
+HERE = Path(__file__).parent
+BASELINE = HERE / "baseline.json"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument(
+        "-k", dest="pattern", default="*", help="only the benchmarks matching the glob"
+    )
+    parser.add_argument("--rounds", type=int, default=5, help="timed rounds per benchmark")
+    parser.add_argument(
+        "--output", type=Path, default=HERE / "results.json", help="results file"
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="allowed slowdown before failing (0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="store the results as the baseline"
+    )
+    parser.add_argument("--list", action="store_true", help="list the benchmarks")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    pattern = args.pattern if any(c in args.pattern for c in "*?[") else f"*{args.pattern}*"
+    names = [name for name in BENCHMARKS if fnmatch.fnmatchcase(name, pattern)]
+    if args.list:
+        print("\n".join(names))
+        return 0
+    if not names:
+        print(f"No benchmark matches {args.pattern!r}", file=sys.stderr)
+        return 2
+
+    baseline = load(args.baseline) if args.baseline.exists() else {}
+    results = []
+    for result in run(names, args.rounds):
+        results.append(result)
+        previous = baseline.get(result.name)
+        change = f"{result.ns_per_op / previous - 1:+7.1%}" if previous else "    new"
+        print(f"{result.name:<45} {result.ns_per_op:>12,.1f} ns/op  {change}")
+
+    measured = {result.name: result.ns_per_op for result in results}
+    dump(measured, args.output)
+    print(f"Results written to {args.output}")
+    if args.save_baseline:
+        dump({**baseline, **measured}, args.baseline)  # keeps the ones that were not run
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.name}: {regression.baseline:,.1f} -> "
+            f"{regression.current:,.1f} ns/op ({regression.ratio:.2f}x)",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""The registry, timing and baseline comparison of the benchmarks"""
+
+import gc
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Iterator, Literal, NamedTuple
+
+from clock.backend.logger import app_logger
+
+# A benchmark factory sets up its state and returns a callable running the operation
+# `n` times, so that the loop overhead of the harness stays out of the numbers
+Operation = Callable[[int], object]
+Factory = Callable[[], Operation]
+
+BENCHMARKS: dict[str, Factory] = {}
+
+DEFAULT_TOLERANCE = 0.25  # slower by more than 25% is a regression
+MIN_ROUND_TIME = 0.05  # seconds
+
+
+class Result(NamedTuple):
+    name: str
+    ns_per_op: float
+    ops: int  # operations per round
+
+
+class Regression(NamedTuple):
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+def benchmark(name: str) -> Callable[[Factory], Factory]:
+    """Registers the decorated factory under the given name"""
+
+    def register(factory: Factory) -> Factory:
+        if name in BENCHMARKS:
+            raise ValueError(f"Duplicate benchmark {name!r}")
+        BENCHMARKS[name] = factory
+        return factory
+
+    return register
+
+
+def measure(operation: Operation, rounds: int = 5) -> tuple[float, int]:
+    """Returns the best nanoseconds per operation of the rounds, and the operations per round"""
+    n = 1
+    while True:  # calibrate, so that a round lasts at least `MIN_ROUND_TIME`
+        start = time.perf_counter_ns()
+        operation(n)
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= MIN_ROUND_TIME * 1e9:
+            break
+        n *= 2 if elapsed == 0 else max(2, min(10, int(MIN_ROUND_TIME * 1e9 / elapsed) + 1))
+
+    best = elapsed
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter_ns()
+            operation(n)
+            best = min(best, time.perf_counter_ns() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return best / n, n
+
+
+def run(names: list[str], rounds: int = 5) -> Iterator[Result]:
+    for name in names:
+        ns_per_op, ops = measure(BENCHMARKS[name](), rounds)
+        yield Result(name, ns_per_op, ops)
+
+
+def environment() -> dict[str, str]:
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def dump(results: dict[str, float], path: Path) -> None:
+    """Writes the results as JSON: the environment, and the ns/op of every benchmark"""
+    document = {
+        "environment": environment(),
+        "results": {name: round(ns_per_op, 1) for name, ns_per_op in results.items()},
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+
+def load(path: Path) -> dict[str, float]:
+    return json.loads(path.read_text(encoding="utf-8"))["results"]
+
+
+def compare(
+    results: list[Result], baseline: dict[str, float], tolerance: float = DEFAULT_TOLERANCE
+) -> list[Regression]:
+    """Returns the benchmarks slower than their baseline by more than the tolerance"""
+    return [
+        Regression(result.name, baseline[result.name], result.ns_per_op)
+        for result in results
+        if result.name in baseline
+        and result.ns_per_op > baseline[result.name] * (1 + tolerance)
+    ]
+
+
+LogMode = Literal["debug", "info", "disabled"]
+LOG_MODES: tuple[LogMode, ...] = ("debug", "info", "disabled")
+_devnull_handler: logging.Handler | None = None
+
+
+def set_log_mode(mode: LogMode) -> None:
+    """Sets the app's loggers to the mode, the records that pass are formatted and
+    written to `os.devnull`, so that only the logging cost itself is measured"""
+    global _devnull_handler
+
+    if _devnull_handler is None:
+        _devnull_handler = logging.StreamHandler(open(os.devnull, "w", encoding="utf-8"))
+        _devnull_handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")
+        )
+    app_logger.handlers = [_devnull_handler]
+    app_logger.propagate = False
+    levels = {"debug": logging.DEBUG, "info": logging.INFO, "disabled": logging.CRITICAL + 1}
+    app_logger.setLevel(levels[mode])
@@ -0,0 +1,44 @@
+"""Benchmarks of `DateTime`'s per-tick calls, with the logger at DEBUG, at INFO and disabled"""
+
+from benchmarks._harness import LOG_MODES, LogMode, benchmark, set_log_mode
+from clock.backend.api import DateTime
+
+_CALLS = {
+    "get_time": lambda dt: dt.get_time("hh:mm:ss A"),
+    "get_date": lambda dt: dt.get_date("DD MMM, YYYY"),
+    "get_time_data": lambda dt: dt.get_time_data(),
+    "get_date_data": lambda dt: dt.get_date_data(),
+}
+
+
+def _register(call: str, mode: LogMode) -> None:
+    @benchmark(f"api.{call}[{mode}]")
+    def factory():
+        set_log_mode(mode)
+        date_time = DateTime()
+        function = _CALLS[call]
+
+        def operation(n: int):
+            for _ in range(n):
+                function(date_time)
+
+        return operation
+
+
+for _call in _CALLS:
+    for _mode in LOG_MODES:
+        _register(_call, _mode)
+
+
+@benchmark("api.snapshot_range[minutes]")
+def snapshot_range():
+    """Per snapshot, of a range stepping every minute"""
+    set_log_mode("disabled")
+    date_time = DateTime()
+
+    def operation(n: int):
+        start = 1_700_000_000
+        for _ in date_time.snapshot_range(start, start + (n - 1) * 60, 60):
+            pass
+
+    return operation
@@ -0,0 +1,51 @@
+"""Benchmarks of the threads reading the time through a shared `ClockCache`, or not"""
+
+import threading
+
+from dateutil import tz as dateutil_tz
+
+from benchmarks._harness import benchmark, set_log_mode
+from clock.backend.api import DateTime
+from clock.backend.cache import ClockCache
+
+THREADS = 16
+_TZ = dateutil_tz.gettz("Asia/Kolkata")
+
+
+def _register(cached: bool) -> None:
+    @benchmark(f"cache.get_time[{THREADS} threads, {'cached' if cached else 'uncached'}]")
+    def factory():
+        """Per call, the calls split among the threads (each with its own `DateTime`)"""
+        set_log_mode("disabled")
+        cache = ClockCache() if cached else None
+        date_times = [DateTime(_TZ, cache=cache) for _ in range(THREADS)]
+
+        def operation(n: int):
+            def read(date_time: DateTime) -> None:
+                for _ in range(n // THREADS):
+                    date_time.get_time("hh:mm:ss A")
+                    date_time.get_time_data()
+
+            threads = [threading.Thread(target=read, args=(dt,)) for dt in date_times]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        return operation
+
+
+for _cached in (False, True):
+    _register(_cached)
+
+
+@benchmark("cache.format[hit]")
+def format_hit():
+    set_log_mode("disabled")
+    cache = ClockCache()
+
+    def operation(n: int):
+        for _ in range(n):
+            cache.format("hh:mm:ss A", _TZ)
+
+    return operation
@@ -0,0 +1,138 @@
+"""Benchmarks of the `TimePiece` / `WorldClockGrid` updates, against a stubbed Flet page.
+
+The stubbed connection answers like the Flet server would, without any client, so the
+numbers are the Python side of an update: diffing the controls and building the commands"""
+
+import asyncio
+import itertools
+
+import flet as ft
+from flet_core.connection import Connection
+from flet_core.protocol import Command, PageCommandsBatchResponsePayload
+
+from benchmarks._harness import benchmark, set_log_mode
+from clock.backend.api import DateData, TimeData
+from clock.backend.renderer import Change, ChangeSet
+from clock.backend.world import ZoneReading
+from clock.main import WORLD_ZONES, SubSecondDisplay, TimePiece, WorldClockGrid
+
+
+class StubConnection(Connection):
+    """Accepts every command, and hands out the ids of the added controls"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.ids = itertools.count(1)
+        self.sent = 0
+
+    def send_commands(self, session_id: str, commands: list[Command]):
+        self.sent += 1
+        results = [
+            " ".join(f"_{next(self.ids)}" for _ in command.commands)
+            for command in commands
+            if command.name == "add"
+        ]
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+    async def send_commands_async(self, session_id: str, commands: list[Command]):
+        return self.send_commands(session_id, commands)
+
+
+def stub_page() -> ft.Page:
+    return ft.Page(StubConnection(), "benchmark")
+
+
+def _change_sets() -> list[ChangeSet]:
+    """A minute of ticks: the time changes on every one, the date on none"""
+    return [
+        ChangeSet(Change.SECOND, f"10:42:{second:02d} AM", None) for second in range(60)
+    ]
+
+
+def _time_piece(page: ft.Page) -> TimePiece:
+    # An unbounded frame rate, so that every change is sent rather than coalesced
+    time_piece = TimePiece(show="timedate", frame_rate=float("inf"))
+    time_piece.apply(ChangeSet(Change.ALL, "10:41:59 AM", "18 Oct, 2026"))
+    page.add(time_piece)
+    return time_piece
+
+
+@benchmark("gui.TimePiece.apply")
+def time_piece_apply():
+    set_log_mode("disabled")
+    time_piece = _time_piece(stub_page())
+    changes = _change_sets()
+
+    def operation(n: int):
+        for index in range(n):
+            time_piece.apply(changes[index % 60])
+
+    return operation
+
+
+@benchmark("gui.TimePiece.apply[unchanged]")
+def time_piece_apply_unchanged():
+    """A tick that changes nothing that is shown, so nothing must be sent"""
+    set_log_mode("disabled")
+    time_piece = _time_piece(stub_page())
+    unchanged = ChangeSet(Change.SUB_SECOND, None, None)
+
+    def operation(n: int):
+        for _ in range(n):
+            time_piece.apply(unchanged)
+
+    return operation
+
+
+@benchmark("gui.TimePiece.apply_async")
+def time_piece_apply_async():
+    set_log_mode("disabled")
+    loop = asyncio.new_event_loop()
+    time_piece = _time_piece(stub_page())
+    changes = _change_sets()
+
+    async def apply(n: int):
+        for index in range(n):
+            await time_piece.apply_async(changes[index % 60])
+
+    return lambda n: loop.run_until_complete(apply(n))
+
+
+@benchmark("gui.SubSecondDisplay.frame[60 Hz]")
+def sub_second_display_frame():
+    """A frame of the sub-second display: rendering its deadline and sending the change"""
+    set_log_mode("disabled")
+    loop = asyncio.new_event_loop()
+    page = stub_page()
+    time_piece = TimePiece(show="timedate")
+    page.add(time_piece)
+    display = SubSecondDisplay(time_piece, rate=60)
+
+    async def frames(n: int):
+        for index in range(n):
+            await display._frame(1_700_000_000 + index / 60)
+
+    return lambda n: loop.run_until_complete(frames(n))
+
+
+@benchmark("gui.WorldClockGrid.apply_async")
+def world_clock_grid_apply_async():
+    set_log_mode("disabled")
+    loop = asyncio.new_event_loop()
+    page = stub_page()
+    grid = WorldClockGrid(WORLD_ZONES)
+    page.add(grid)
+    date = DateData(2026, 10, 18)
+    ticks = [
+        [
+            ZoneReading(zone, TimeData(10, 42, second), date, 0)
+            for zone in WORLD_ZONES
+        ]
+        for second in range(60)
+    ]
+
+    async def apply(n: int):
+        for index in range(n):
+            await grid.apply_async(ticks[index % 60])
+
+    return lambda n: loop.run_until_complete(apply(n))
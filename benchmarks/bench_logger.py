@@ -0,0 +1,82 @@
+"""Benchmarks of the per-record throughput of the log handlers"""
+
+import logging
+import os
+import queue
+import tempfile
+from pathlib import Path
+
+from rich.console import Console
+
+from benchmarks._harness import benchmark, set_log_mode
+from clock.backend.logger import RichConsoleHandler, RichFileHandler, StructuredFileHandler
+from clock.backend.logger._queued_handler import QueuedHandler
+from clock.backend.logger._structured_handler import Format
+
+
+def _record() -> logging.LogRecord:
+    return logging.LogRecord(
+        name="clock.api",
+        level=logging.INFO,
+        pathname=__file__,
+        lineno=1,
+        msg="[DateTime] Returning current time as %s",
+        args=("string",),
+        exc_info=None,
+    )
+
+
+def _handle(handler: logging.Handler):
+    record = _record()
+
+    def operation(n: int):
+        for _ in range(n):
+            handler.handle(record)
+
+    return operation
+
+
+@benchmark("logger.RichConsoleHandler")
+def rich_console_handler():
+    set_log_mode("disabled")
+    handler = RichConsoleHandler()
+    # Renders like on a terminal, but writes to nowhere
+    handler.console = Console(
+        file=open(os.devnull, "w", encoding="utf-8"), width=115, force_terminal=True
+    )
+    return _handle(handler)
+
+
+@benchmark("logger.RichFileHandler")
+def rich_file_handler():
+    set_log_mode("disabled")
+    directory = tempfile.mkdtemp(prefix="clock-bench-")
+    return _handle(RichFileHandler(file=Path(directory) / "bench.log"))
+
+
+def _register_structured(format: Format) -> None:
+    @benchmark(f"logger.StructuredFileHandler[{format}]")
+    def factory():
+        set_log_mode("disabled")
+        directory = tempfile.mkdtemp(prefix="clock-bench-")
+        return _handle(StructuredFileHandler(file=Path(directory) / "bench.log", format=format))
+
+
+for _format in ("jsonl", "binary"):
+    _register_structured(_format)  # type: ignore
+
+
+@benchmark("logger.QueuedHandler.enqueue")
+def queued_handler():
+    """The cost left on the caller's thread, with the queued logging"""
+    set_log_mode("disabled")
+    records: queue.Queue = queue.Queue()
+    handler = QueuedHandler(records, when_full="drop")
+    handle = _handle(handler)
+
+    def operation(n: int):
+        handle(n)
+        with records.mutex:  # don't let the (unconsumed) queue grow between the rounds
+            records.queue.clear()
+
+    return operation
@@ -0,0 +1,29 @@
+"""Benchmarks of the instrumentation's own cost, once turned on"""
+
+from benchmarks._harness import benchmark, set_log_mode
+from clock.backend import metrics
+
+
+@benchmark("metrics.Histogram.observe")
+def histogram_observe():
+    set_log_mode("disabled")
+    histogram = metrics.Histogram("bench_observe_seconds", "Benchmark")
+
+    def operation(n: int):
+        for _ in range(n):
+            histogram.observe(0.000123)
+
+    return operation
+
+
+@benchmark("metrics.instrumented_call")
+def instrumented_call():
+    """The overhead added to every call of an instrumented method (here, a no-op)"""
+    set_log_mode("disabled")
+    call = metrics._timed(lambda: None, metrics.Histogram("bench_call_seconds", "Benchmark"))
+
+    def operation(n: int):
+        for _ in range(n):
+            call()
+
+    return operation
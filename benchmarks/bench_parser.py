@@ -0,0 +1,46 @@
+"""Benchmarks of parsing a column of timestamps, against `arrow.get` row by row"""
+
+from itertools import cycle, islice
+
+import arrow
+from dateutil import tz
+
+from benchmarks._harness import benchmark, set_log_mode
+from clock.backend.parser import parse_many
+
+FORMATS = ("DD MMM, YYYY hh:mm:ss A", "YYYY-MM-DD HH:mm:ss.SSS")
+ROWS = 1_000
+
+
+def _strings(format: str) -> list[str]:
+    return [arrow.get(1_700_000_000 + index * 37).format(format) for index in range(ROWS)]
+
+
+def _register(format: str) -> None:
+    @benchmark(f"parser.parse_many[{format}]")
+    def parser_factory():
+        """Per row, in the local time zone"""
+        set_log_mode("disabled")
+        strings = _strings(format)
+
+        def operation(n: int):
+            parse_many(islice(cycle(strings), n), format)
+
+        return operation
+
+    @benchmark(f"parser.arrow_get[{format}]")
+    def arrow_factory():
+        """Per row, the reference"""
+        set_log_mode("disabled")
+        strings = _strings(format)
+        local = tz.tzlocal()
+
+        def operation(n: int):
+            for string in islice(cycle(strings), n):
+                arrow.get(string, format, tzinfo=local).int_timestamp
+
+        return operation
+
+
+for _format in FORMATS:
+    _register(_format)
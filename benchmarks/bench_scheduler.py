@@ -0,0 +1,41 @@
+"""Benchmarks of scheduling and cancelling the jobs, among many pending ones"""
+
+from datetime import time
+
+from benchmarks._harness import benchmark, set_log_mode
+from clock.backend.scheduler import Scheduler
+
+PENDING = 10_000
+
+
+def _scheduler() -> Scheduler:
+    scheduler = Scheduler()
+    for index in range(PENDING):
+        scheduler.timer(3600 + index, lambda job: None)
+    return scheduler
+
+
+@benchmark(f"scheduler.timer+cancel[{PENDING} pending]")
+def timer_and_cancel():
+    set_log_mode("disabled")
+    scheduler = _scheduler()
+
+    def operation(n: int):
+        for index in range(n):
+            scheduler.timer(index % 7200, lambda job: None).cancel()
+
+    return operation
+
+
+@benchmark(f"scheduler.alarm[{PENDING} pending]")
+def alarm():
+    """A daily alarm, its next occurrence is computed in the time zone"""
+    set_log_mode("disabled")
+    scheduler = _scheduler()
+    at = time(6, 30)
+
+    def operation(n: int):
+        for _ in range(n):
+            scheduler.alarm(at, lambda job: None).cancel()
+
+    return operation
@@ -0,0 +1,86 @@
+"""
+The import-time regression check of the backend, based on `python -X importtime`
+
+Every module is imported in a fresh interpreter (a few times, keeping the fastest run).
+The check fails when a module's cumulative import time goes over its budget, or when it
+pulls in a module that backend-only consumers must not pay for (Flet, Rich, NumPy).
+Usage:
+>>> python -m benchmarks.importtime
+>>> python -m benchmarks.importtime --runs 10 --scale 2  # twice the budgets, slow machines
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import NamedTuple
+
+# Cumulative import time budgets, in milliseconds
+BUDGETS: dict[str, float] = {
+    "clock.backend.logger": 20,
+    "clock.backend.api": 60,
+    "clock.backend.cache": 60,
+    "clock.backend.world": 60,
+    "clock.backend.renderer": 60,
+    "clock.backend.ticker": 75,
+    "clock.backend.service": 120,
+}
+# The backend must only import these once they are actually used
+FORBIDDEN = ("flet", "flet_core", "rich", "numpy", "logging.handlers")
+
+
+class ImportTime(NamedTuple):
+    module: str
+    milliseconds: float
+    forbidden: list[str]
+
+
+def parse(stderr: str) -> dict[str, float]:
+    """Returns the cumulative import time (ms) of every module of an `-X importtime` output"""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        if cumulative.strip().isdigit():
+            times[module.strip()] = int(cumulative) / 1000
+    return times
+
+
+def measure(module: str, runs: int = 5) -> ImportTime:
+    best = float("inf")
+    imported: set[str] = set()
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        times = parse(completed.stderr)
+        best = min(best, times[module])
+        imported.update(times)
+    forbidden = [name for name in FORBIDDEN if name in imported]
+    return ImportTime(module, best, forbidden)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.importtime")
+    parser.add_argument("--runs", type=int, default=5, help="imports per module")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplies the budgets")
+    args = parser.parse_args()
+
+    failed = False
+    for module, budget in BUDGETS.items():
+        result = measure(module, args.runs)
+        budget *= args.scale
+        over = result.milliseconds > budget
+        status = "FAIL" if over or result.forbidden else "ok"
+        print(f"{status:<4} {module:<25} {result.milliseconds:>7.1f} ms (budget {budget:.0f} ms)")
+        if result.forbidden:
+            print(f"     imports {', '.join(result.forbidden)}", file=sys.stderr)
+        failed |= status == "FAIL"
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+The local load generator of the tick stream server (`clock.server`)
+
+Opens many concurrent SSE / WebSocket subscribers, keeps them for a while and reports the
+delivered messages, the lateness after the second boundary and the server's CPU usage.
+By default the server is spawned in its own process, so that it gets a core to itself.
+Usage:
+>>> python -m benchmarks.loadgen --clients 10000 --duration 20
+>>> python -m benchmarks.loadgen --clients 10000 --mode ws
+>>> python -m benchmarks.loadgen --no-spawn --port 8765  # against a running server
+"""
+
+import argparse
+import asyncio
+import base64
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from clock.server import raise_open_files_limit
+
+_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+class Subscriber(asyncio.Protocol):
+    """Counts the messages of a stream, and how late after the second boundary they came"""
+
+    def __init__(self, stats: "Stats", request: bytes, mode: str) -> None:
+        self.stats = stats
+        self.request = request
+        self.mode = mode
+        self.buffer = b""
+        self.handshaken = False
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        transport.write(self.request)  # type: ignore
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.stats.disconnected += 1
+
+    def data_received(self, data: bytes) -> None:
+        now = time.time()
+        self.buffer += data
+        if not self.handshaken:
+            head, separator, self.buffer = self.buffer.partition(b"\r\n\r\n")
+            if not separator:
+                self.buffer = head
+                return
+            self.handshaken = True
+            self.stats.connected += 1
+        messages = self._messages()
+        if messages and self.stats.recording:
+            self.stats.messages += messages
+            self.stats.lateness.append(now % 1)
+
+    def _messages(self) -> int:
+        count = 0
+        if self.mode == "sse":
+            count = self.buffer.count(b"\n\n")
+            self.buffer = self.buffer[self.buffer.rfind(b"\n\n") + 2 :] if count else self.buffer
+            return count
+        while len(self.buffer) >= 2:  # unmasked server frames
+            length, offset = self.buffer[1] & 0x7F, 2
+            if length == 126:
+                length, offset = int.from_bytes(self.buffer[2:4], "big"), 4
+            if len(self.buffer) < offset + length:
+                break
+            self.buffer = self.buffer[offset + length :]
+            count += 1
+        return count
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.connected = 0
+        self.disconnected = 0
+        self.messages = 0
+        self.lateness: list[float] = []
+        self.recording = False
+
+
+def _request(mode: str, host: str, port: int, query: str) -> bytes:
+    if mode == "sse":
+        return f"GET /events?{query} HTTP/1.1\r\nHost: {host}:{port}\r\n\r\n".encode()
+    key = base64.b64encode(os.urandom(16)).decode()
+    return (
+        f"GET /ws?{query} HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\n"
+        f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+        f"Sec-WebSocket-Version: 13\r\n\r\n"
+    ).encode()
+
+
+def _cpu_seconds(pid: int) -> float | None:
+    """The user + system CPU time of a process, from `/proc` (Linux only)"""
+    try:
+        with open(f"/proc/{pid}/stat") as stat:
+            fields = stat.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / _TICKS
+
+
+async def _wait_for_server(host: str, port: int, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def load(args: argparse.Namespace, server_pid: int | None) -> int:
+    loop = asyncio.get_running_loop()
+    await _wait_for_server(args.host, args.port)
+    stats = Stats()
+    transports = []
+
+    started = time.perf_counter()
+    for start in range(0, args.clients, args.batch):
+        batch = range(start, min(start + args.batch, args.clients))
+        connections = await asyncio.gather(
+            *(
+                loop.create_connection(
+                    lambda: Subscriber(
+                        stats, _request(args.mode, args.host, args.port, args.query), args.mode
+                    ),
+                    args.host,
+                    args.port,
+                )
+                for _ in batch
+            ),
+            return_exceptions=True,
+        )
+        for connection in connections:
+            if isinstance(connection, BaseException):
+                print(f"Connection failed: {connection!r}", file=sys.stderr)
+                continue
+            transports.append(connection[0])
+    await asyncio.sleep(1)  # the handshakes
+    print(
+        f"{stats.connected}/{args.clients} {args.mode} subscribers connected "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+    cpu_before = _cpu_seconds(server_pid) if server_pid else None
+    stats.recording = True
+    await asyncio.sleep(args.duration)
+    stats.recording = False
+    cpu_after = _cpu_seconds(server_pid) if server_pid else None
+
+    expected = int(stats.connected * args.duration)
+    print(f"messages: {stats.messages} of ~{expected} ({stats.messages / max(expected, 1):.1%})")
+    if stats.lateness:
+        lateness = sorted(stats.lateness)
+        p99 = lateness[int(len(lateness) * 0.99) - 1]
+        print(
+            f"lateness after the second: median {statistics.median(lateness) * 1000:.1f} ms, "
+            f"p99 {p99 * 1000:.1f} ms"
+        )
+    if cpu_before is not None and cpu_after is not None:
+        print(f"server CPU: {(cpu_after - cpu_before) / args.duration:.1%} of one core")
+    print(f"disconnected: {stats.disconnected}")
+
+    for transport in transports:
+        transport.close()
+    return 0 if stats.connected == args.clients and not stats.disconnected else 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadgen")
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--mode", choices=["sse", "ws"], default="sse")
+    parser.add_argument("--duration", type=float, default=10, help="seconds to measure")
+    parser.add_argument("--batch", type=int, default=500, help="connections opened at once")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--query", default="tz=UTC&time_format=hh:mm:ss%20A")
+    parser.add_argument(
+        "--no-spawn", dest="spawn", action="store_false", help="use a running server"
+    )
+    args = parser.parse_args()
+
+    limit = raise_open_files_limit()
+    if limit is not None and limit < args.clients + 100:
+        print(f"The open files limit ({limit}) is too low for the clients", file=sys.stderr)
+        return 2
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen(
+            [sys.executable, "-m", "clock", "--serve", "--host", args.host, "--port", str(args.port)]
+        )
+    try:
+        return asyncio.run(load(args, server.pid if server else None))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+The throughput of the tick pipeline on a simulated clock, over a year of ticks in seconds
+
+The service's `RendererChannel` computes the time and date strings of every tick (and,
+unless `--no-gui`, applies them to a `TimePiece` on a stubbed Flet page), driven by
+`Ticker.simulate` on a `FixedStepClock` (or a `ReplayClock` of a file), without any
+sleep. The ticks at the day and year rollovers, right past the DST transitions and a
+sample of the others are recorded, and checked afterwards against
+`datetime.fromtimestamp`. The run fails on a mismatch.
+Usage:
+>>> python -m benchmarks.simulate                       # a year, a tick per minute
+>>> python -m benchmarks.simulate --days 30 --step 1 --tz America/New_York
+>>> python -m benchmarks.simulate --replay stamps.log --format "YYYY-MM-DD HH:mm:ss"
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, tzinfo
+from typing import Awaitable, Callable
+
+from dateutil import tz as dateutil_tz
+
+from benchmarks._harness import set_log_mode
+from clock.backend.formatter import compile_format
+from clock.backend.renderer import ChangeSet
+from clock.backend.service import RendererChannel
+from clock.backend.source import FixedStepClock, ReplayClock, SimulatedClock
+from clock.backend.ticker import Ticker
+from clock.backend.zone import ZoneOffset
+
+# 2023-12-31 00:00 UTC: a year rollover, then a leap year with both of its DST transitions
+START = 1_703_980_800
+TIME_FORMAT = "hh:mm:ss A"
+DATE_FORMAT = "DD MMM, YYYY"
+# Every this many ticks, one is checked besides the rollovers and transitions
+SAMPLE_EVERY = 997
+
+
+def transitions(tz: tzinfo, start: float, end: float) -> list[int]:
+    """Returns the epochs (in seconds) of the DST transitions between `start` and `end`"""
+    zone = ZoneOffset(tz)
+    found = []
+    epoch = int(start)
+    while epoch < end:
+        offset = zone.at(epoch)
+        epoch = max(zone.valid_until, epoch + 1)
+        if epoch < end and zone.at(epoch) != offset:
+            found.append(epoch)
+    return found
+
+
+def make_tick(
+    tz: tzinfo, gui: bool, recorded: list[tuple[float, str, str]], changes_at: list[int]
+) -> Callable[[float], Awaitable[None] | None]:
+    """Returns the tick of the pipeline, recording the ticks to check into `recorded`"""
+    channel = RendererChannel(tz, TIME_FORMAT, DATE_FORMAT)
+    count = 0
+    pending = iter(changes_at)
+    next_change = next(pending, None)
+
+    def record(now: float, changes: ChangeSet | None) -> None:
+        nonlocal count, next_change
+        count += 1
+        past_change = next_change is not None and now >= next_change
+        if past_change:
+            next_change = next(pending, None)
+        if past_change or count % SAMPLE_EVERY == 0 or (changes and changes.date):
+            current = channel.current()
+            recorded.append((now, current.time, current.date))  # type: ignore
+
+    if not gui:
+
+        def render_only(now: float) -> None:
+            record(now, channel.compute(now))
+
+        return render_only
+
+    from benchmarks.bench_gui import stub_page
+    from clock.main import TimePiece
+
+    page = stub_page()
+    time_piece = TimePiece(show="timedate", frame_rate=float("inf"))
+    page.add(time_piece)
+    apply_async = time_piece.apply_async
+
+    async def tick(now: float) -> None:
+        changes = channel.compute(now)
+        if changes is not None:
+            await apply_async(changes)
+        record(now, changes)
+
+    return tick
+
+
+def check(tz: tzinfo, recorded: list[tuple[float, str, str]]) -> list[str]:
+    """Returns the mismatches of the recorded ticks, against `datetime.fromtimestamp`"""
+    time_plan, date_plan = compile_format(TIME_FORMAT), compile_format(DATE_FORMAT)
+    mismatches = []
+    for now, shown_time, shown_date in recorded:
+        dt = datetime.fromtimestamp(now, tz)
+        expected = (time_plan.render(dt), date_plan.render(dt))
+        if (shown_time, shown_date) != expected:
+            mismatches.append(f"{now}: {(shown_time, shown_date)} != {expected}")
+    return mismatches
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.simulate")
+    parser.add_argument("--days", type=float, default=366, help="simulated days of ticks")
+    parser.add_argument("--step", type=float, default=60, help="simulated seconds per tick")
+    parser.add_argument("--tz", default="Europe/London", help="(default: %(default)s)")
+    parser.add_argument(
+        "--no-gui", dest="gui", action="store_false", help="leave the `TimePiece` out"
+    )
+    parser.add_argument("--replay", help="a file of epochs (or timestamps, see --format)")
+    parser.add_argument("--format", help="the `Arrow` format of the replayed timestamps")
+    args = parser.parse_args()
+
+    set_log_mode("info")
+    tz = dateutil_tz.gettz(args.tz)
+    source: SimulatedClock
+    if args.replay:
+        source = ReplayClock.from_file(args.replay, args.format, tz=tz)
+        until = None
+    else:
+        source = FixedStepClock(START, step=args.step)
+        until = START + args.days * 86_400
+    changes_at = transitions(tz, source.time(), until or source.time() + 366 * 86_400)
+    # The epochs that roll the year over, checked like the transitions
+    first_year = datetime.fromtimestamp(source.time(), tz).year + 1
+    years = [datetime(year, 1, 1, tzinfo=tz).timestamp() for year in range(first_year, 2200)]
+    changes_at = sorted(changes_at + [int(epoch) for epoch in years if epoch < (until or 0)])
+
+    recorded: list[tuple[float, str, str]] = []
+    tick = make_tick(tz, args.gui, recorded, changes_at)
+    ticker = Ticker(1 / args.step)
+    started = time.perf_counter()
+    ticks = asyncio.run(ticker.simulate(tick, source, until=until))
+    seconds = time.perf_counter() - started
+
+    mismatches = check(tz, recorded)
+    print(
+        f"{ticks:,} ticks in {seconds:.1f}s: {ticks / seconds:,.0f} ticks/s, "
+        f"{ticks * args.step / seconds:,.0f}x real time"
+        if not args.replay
+        else f"{ticks:,} replayed ticks in {seconds:.1f}s: {ticks / seconds:,.0f} ticks/s"
+    )
+    print(
+        f"checked {len(recorded):,} ticks ({len(changes_at)} DST transitions / new years), "
+        f"{len(mismatches)} mismatch(es)"
+    )
+    for mismatch in mismatches[:10]:
+        print(f"FAIL {mismatch}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+The soak test of the steady-state tick path, over simulated days of ticks
+
+Every tick renders the time and date of the (simulated) instant with the
+`IncrementalRenderer`, like the clock service does, and applies the changes to a
+`TimePiece` on a stubbed Flet page, along with the `WorldClock` readings to a
+`WorldClockGrid`. The simulated clock starts right before a DST
+transition, and steps a second per tick without any sleep. After a warm-up, `tracemalloc`
+measures the memory allocated within each tick (the peak over what was allocated before
+it) and the memory retained by the whole soak, and `gc` counts the collections. The check
+fails when one of them goes over its budget.
+Usage:
+>>> python -m benchmarks.soak                   # two simulated days
+>>> python -m benchmarks.soak --days 7 --tz America/New_York
+>>> python -m benchmarks.soak --no-gui          # the `DateTime` / renderer path only
+"""
+
+import argparse
+import asyncio
+import gc
+import sys
+import time
+import tracemalloc
+from typing import Awaitable, Callable, NamedTuple
+
+from dateutil import tz as dateutil_tz
+
+from benchmarks._harness import set_log_mode
+from clock.backend.api import DateTime
+from clock.backend.renderer import IncrementalRenderer
+from clock.backend.source import FixedStepClock
+
+# Saturday 2024-03-30 12:00 UTC, the European clocks go forward the next night
+START = 1_711_800_000
+TICKS_PER_DAY = 86_400
+WARM_UP_TICKS = 3_600
+
+# Budgets, of the memory allocated within a tick (on average, in bytes), of the memory
+# retained by the whole soak (in KiB), and of the full collections per simulated day. A
+# tick sends the `TimePiece` and the five zones of the grid, most of it is Flet's update
+TICK_BUDGET = 6144
+RETAINED_BUDGET = 64
+FULL_COLLECTIONS_BUDGET = 2
+
+
+class SoakResult(NamedTuple):
+    ticks: int
+    seconds: float  # wall clock time of the soak
+    mean_tick_bytes: float
+    max_tick_bytes: int
+    retained_bytes: int
+    collections: tuple[int, int, int]  # per generation
+    unreachable: int  # objects in reference cycles, found by the last collection
+
+
+def make_tick(tz_name: str, gui: bool) -> tuple[FixedStepClock, Callable[[], Awaitable[None]]]:
+    """Returns the simulated clock and the tick, as wired up by `clock.main.main`"""
+    clock = FixedStepClock(START, step=1)
+    renderer = IncrementalRenderer(
+        DateTime(dateutil_tz.gettz(tz_name), source=clock), "hh:mm:ss A", "DD MMM, YYYY"
+    )
+    if not gui:
+
+        async def render_only() -> None:
+            clock.tick(1)
+            renderer.tick()
+
+        return clock, render_only
+
+    from benchmarks.bench_gui import stub_page
+    from clock.backend.world import WorldClock
+    from clock.main import WORLD_ZONES, TimePiece, WorldClockGrid
+
+    page = stub_page()
+    time_piece = TimePiece(show="timedate", frame_rate=float("inf"))
+    page.add(time_piece)
+    grid = WorldClockGrid(WORLD_ZONES)
+    page.add(grid)
+    world_clock = WorldClock(WORLD_ZONES, clock=clock.time)
+    apply_async, apply_grid_async = time_piece.apply_async, grid.apply_async
+
+    async def tick() -> None:
+        clock.tick(1)
+        await apply_async(renderer.tick())
+        await apply_grid_async(world_clock.read())
+
+    return clock, tick
+
+
+async def soak(tick: Callable[[], Awaitable[None]], ticks: int) -> SoakResult:
+    for _ in range(WARM_UP_TICKS):
+        await tick()
+
+    gc.collect()
+    collections = [stats["collections"] for stats in gc.get_stats()]
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+
+    total = largest = 0
+    get_traced_memory, reset_peak = tracemalloc.get_traced_memory, tracemalloc.reset_peak
+    for _ in range(ticks):
+        before = get_traced_memory()[0]
+        reset_peak()
+        await tick()
+        allocated = get_traced_memory()[1] - before
+        total += allocated
+        largest = max(largest, allocated)
+
+    seconds = time.perf_counter() - started
+    collected = tuple(
+        stats["collections"] - before for stats, before in zip(gc.get_stats(), collections)
+    )
+    unreachable = gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return SoakResult(
+        ticks, seconds, total / ticks, largest, retained, collected, unreachable  # type: ignore
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.soak")
+    parser.add_argument("--days", type=float, default=2, help="simulated days of ticks")
+    parser.add_argument("--tz", default="Europe/London", help="(default: %(default)s)")
+    parser.add_argument(
+        "--no-gui", dest="gui", action="store_false", help="leave the `TimePiece` out"
+    )
+    parser.add_argument("--tick-budget", type=float, default=TICK_BUDGET, help="bytes")
+    parser.add_argument("--retained-budget", type=float, default=RETAINED_BUDGET, help="KiB")
+    parser.add_argument(
+        "--full-collections-budget",
+        type=float,
+        default=FULL_COLLECTIONS_BUDGET,
+        help="per simulated day",
+    )
+    args = parser.parse_args()
+
+    set_log_mode("info")  # the app's debug records are dropped, like in production
+    _, tick = make_tick(args.tz, args.gui)
+    ticks = int(args.days * TICKS_PER_DAY)
+    result = asyncio.run(soak(tick, ticks))
+
+    days = result.ticks / TICKS_PER_DAY
+    full_collections = result.collections[2] / days
+    checks = [
+        (
+            "allocated per tick",
+            result.mean_tick_bytes,
+            args.tick_budget,
+            f"{result.mean_tick_bytes:,.0f} B (max {result.max_tick_bytes:,} B)",
+            f"{args.tick_budget:,.0f} B",
+        ),
+        (
+            "retained",
+            result.retained_bytes / 1024,
+            args.retained_budget,
+            f"{result.retained_bytes / 1024:,.1f} KiB",
+            f"{args.retained_budget:,.0f} KiB",
+        ),
+        (
+            "full collections",
+            full_collections,
+            args.full_collections_budget,
+            f"{full_collections:.1f} per day",
+            f"{args.full_collections_budget:g} per day",
+        ),
+    ]
+
+    print(
+        f"{result.ticks:,} ticks ({days:g} simulated days) in {result.seconds:.1f}s, "
+        f"collections per generation: {result.collections}, "
+        f"unreachable objects: {result.unreachable}"
+    )
+    failed = False
+    for name, value, budget, shown, budget_shown in checks:
+        over = value > budget
+        status = "FAIL" if over else "ok"
+        print(f"{status:<4} {name:<20} {shown:>32} (budget {budget_shown})")
+        failed |= over
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
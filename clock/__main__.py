@@ -0,0 +1,94 @@
+"""
+The entry point of the clock, also installed as the `clock` script
+Usage:
+>>> python -m clock                       # launches the Flet app
+>>> python -m clock --sub-second 30       # with the time down to the hundredths, at 30 Hz
+>>> python -m clock --now                 # prints the current time and exits
+>>> python -m clock --now "YYYY-MM-DD HH:mm:ss"
+>>> python -m clock --terminal --show time  # the headless clock, in the terminal
+>>> python -m clock --serve --port 8765     # the SSE / WebSocket tick stream server
+>>> python -m clock --terminal --metrics-port 9464  # with the instrumentation on, for Prometheus
+
+`--now`, `--terminal` and `--serve` only import the backend (no Flet, no Rich), so that a one-shot
+timestamp of a script or a cron job stays cheap. Check the import cost with:
+>>> python -m benchmarks.importtime
+"""
+
+import argparse
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="clock", description="Simple Clock")
+    parser.add_argument(
+        "--now",
+        nargs="?",
+        const="hh:mm:ss A DD MMM, YYYY",
+        metavar="FORMAT",
+        help="print the current time (Arrow style format tokens) and exit",
+    )
+    parser.add_argument(
+        "--terminal", action="store_true", help="run the clock in the terminal, headless"
+    )
+    parser.add_argument(
+        "--show",
+        choices=["time", "date", "datetime", "timedate"],
+        default="timedate",
+        help="what the terminal clock shows (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--serve", action="store_true", help="serve the ticks over SSE and WebSocket"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="(default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8765, help="(default: %(default)s)")
+    parser.add_argument(
+        "--sub-second",
+        type=float,
+        metavar="HZ",
+        help="show the app's time down to the hundredths, at 10 to 60 frames per second",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="PORT",
+        help="turn the instrumentation on, and serve it for Prometheus on this local port",
+    )
+    args = parser.parse_args(argv)
+    if args.sub_second is not None:
+        from clock.backend.renderer import SUB_SECOND_RATES
+
+        low, high = SUB_SECOND_RATES
+        if not low <= args.sub_second <= high:
+            parser.error(f"--sub-second must be within {low:g} and {high:g} Hz")
+    return args
+
+
+def run(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if args.metrics_port is not None:
+        from clock.backend import metrics
+
+        metrics.enable()
+        metrics.serve(port=args.metrics_port)
+    if args.now is not None:
+        from clock.backend.api import DateTime
+
+        print(DateTime().get_time(args.now))
+        return
+    if args.terminal:
+        from clock.terminal import run as run_terminal
+
+        run_terminal(args.show)
+        return
+    if args.serve:
+        from clock.server import run as run_server
+
+        run_server(args.host, args.port)
+        return
+
+    from clock.main import run as run_app  # Flet is only imported for the app
+
+    run_app(args.sub_second)
+
+
+if __name__ == "__main__":
+    run()
@@ -4,48 +4,212 @@ Usage:
 >>> dt = Datetime()
 >>> dt.get_time_data()
 >>> dt.get_date_data()
+>>> dt.snapshot()
+>>> for snapshot in dt.snapshot_range(start, end, timedelta(minutes=1)): ...
 """
 
-from dataclasses import asdict, dataclass, field
-from datetime import date, time, tzinfo
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, NamedTuple
+
+from arrow import Arrow, locales
+from arrow.constants import DEFAULT_LOCALE
+from dateutil import tz as dateutil_tz
+
+from clock.backend import metrics
+from clock.backend._calendar import (
+    MICROSECONDS_PER_DAY,
+    MONTH_DAYS,
+    SECONDS_PER_DAY,
+    civil_from_days,
+)
+from clock.backend.bulk import Unit, format_many
+from clock.backend.formatter import DIGITS, HOUR_12, TWO_DIGITS, compile_format
+from clock.backend.logger import app_logger
+from clock.backend.source import ClockSource, default_source
+from clock.backend.zone import ZoneOffset
+
+if TYPE_CHECKING:
+    from clock.backend.cache import ClockCache
+
+LOCAL_TZ: tzinfo = dateutil_tz.tzlocal()
+_LOCALE = locales.get_locale(DEFAULT_LOCALE)
+_MONTH_ABBREVIATIONS = tuple(
+    _LOCALE.month_abbreviation(month) if month else "" for month in range(13)
+)
+_SESSIONS = tuple(_LOCALE.meridian(hour, "A") for hour in range(24))
+_YEARS: dict[int, str] = {}
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
-from arrow import Arrow
 
-from clock.logger import app_logger
+class TimeData:
+    """Contains Time related datum
 
+    Stored as plain integers in `__slots__`, the string forms ("hh", "mm", "ss", "S" and "A"
+    tokens) are only rendered when asked for, from tables shared by every instance"""
 
-@dataclass
-class TimeData:
-    """Contains Time related datum"""
+    __slots__ = ("_hour", "_minute", "_second", "_microsecond")
+
+    def __init__(
+        self, hour: int = 0, minute: int = 0, second: int = 0, microsecond: int = 0
+    ) -> None:
+        self._hour = hour
+        self._minute = minute
+        self._second = second
+        self._microsecond = microsecond
+
+    @property
+    def hour(self) -> str:
+        return TWO_DIGITS[HOUR_12[self._hour]]
+
+    @property
+    def minute(self) -> str:
+        return TWO_DIGITS[self._minute]
+
+    @property
+    def second(self) -> str:
+        return TWO_DIGITS[self._second]
+
+    @property
+    def sub_second(self) -> str:
+        return DIGITS[self._microsecond // 100000]
+
+    @property
+    def session(self) -> str:
+        return _SESSIONS[self._hour]
+
+    def astuple(self) -> tuple[int, int, int, int]:
+        """Returns the integer fields: (hour (0-23), minute, second, microsecond)"""
+        return (self._hour, self._minute, self._second, self._microsecond)
 
-    hour: str | None = field(default=None)
-    minute: str | None = field(default=None)
-    second: str | None = field(default=None)
-    sub_second: str | None = field(default=None)
-    session: str | None = field(default=None)
+    def asdict(self) -> dict[str, str]:
+        return {
+            "hour": self.hour,
+            "minute": self.minute,
+            "second": self.second,
+            "sub_second": self.sub_second,
+            "session": self.session,
+        }
 
-    def asdict(self):
-        return asdict(self)
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    def __hash__(self) -> int:
+        return hash(self.astuple())
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{key}={value!r}" for key, value in self.asdict().items())
+        return f"{self.__class__.__name__}({fields})"
 
 
-@dataclass
 class DateData:
-    """Contains Date related datum"""
+    """Contains Date related datum
 
-    day: str | None = field(default=None)
-    month: str | None = field(default=None)
-    year: str | None = field(default=None)
+    Stored as plain integers in `__slots__`, the string forms ("DD", "MMM" and "YYYY"
+    tokens) are only rendered when asked for, from tables shared by every instance"""
 
-    def asdict(self):
-        return asdict(self)
+    __slots__ = ("_year", "_month", "_day")
 
+    def __init__(self, year: int = 1, month: int = 1, day: int = 1) -> None:
+        self._year = year
+        self._month = month
+        self._day = day
 
-class DateTime:
-    """A naive implementation of the `arrow` module, with logging facility"""
+    @property
+    def day(self) -> str:
+        return TWO_DIGITS[self._day]
+
+    @property
+    def month(self) -> str:
+        return _MONTH_ABBREVIATIONS[self._month]
+
+    @property
+    def year(self) -> str:
+        year = _YEARS.get(self._year)
+        if year is None:
+            year = _YEARS[self._year] = _LOCALE.year_full(self._year)
+        return year
+
+    def astuple(self) -> tuple[int, int, int]:
+        """Returns the integer fields: (year, month, day)"""
+        return (self._year, self._month, self._day)
+
+    def asdict(self) -> dict[str, str]:
+        return {"day": self.day, "month": self.month, "year": self.year}
+
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    def __hash__(self) -> int:
+        return hash(self.astuple())
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{key}={value!r}" for key, value in self.asdict().items())
+        return f"{self.__class__.__name__}({fields})"
 
-    def __init__(self, tz: tzinfo | None = None) -> None:
+
+class Snapshot(NamedTuple):
+    """Time and Date datum of a single clock reading"""
+
+    time: TimeData
+    date: DateData
+
+
+def time_data_of(dt: datetime) -> TimeData:
+    """Fills a `TimeData` in a single pass from the fields of the `datetime`"""
+    return TimeData(dt.hour, dt.minute, dt.second, dt.microsecond)
+
+
+def date_data_of(dt: datetime) -> DateData:
+    """Fills a `DateData` in a single pass from the fields of the `datetime`"""
+    return DateData(dt.year, dt.month, dt.day)
+
+
+def time_data_of_day(microseconds: int) -> TimeData:
+    """Fills a `TimeData` from the microseconds since the (local) midnight"""
+    seconds, microsecond = divmod(microseconds, 1_000_000)
+    hour, seconds = divmod(seconds, 3600)
+    minute, second = divmod(seconds, 60)
+    return TimeData(hour, minute, second, microsecond)
+
+
+def _following_day(data: DateData) -> DateData:
+    """Returns the `DateData` of the next day, carrying the fields forward"""
+    year, month, day = data._year, data._month, data._day
+    last = MONTH_DAYS[month]
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        last = 29
+    if day < last:
+        return DateData(year, month, day + 1)
+    if month < 12:
+        return DateData(year, month + 1, 1)
+    return DateData(year + 1, 1, 1)
+
+
+class DateTime:
+    """A naive implementation of the `arrow` module, with logging facility
+
+    The current instant is read from the `source` (by default, the process-wide
+    `MonotonicClock`), and an `Arrow` object is only built when `date_time` is asked for.
+    Given a `ClockCache` (shared by the threads), the current time / date strings and data
+    are read from it, and only computed once per second (or tenth of a second) for all.
+    The log messages of the per-call methods are passed as `%` arguments, so that nothing
+    is formatted when their level is off"""
+
+    def __init__(
+        self,
+        tz: tzinfo | None = None,
+        source: ClockSource | None = None,
+        cache: "ClockCache | None" = None,
+    ) -> None:
         self.logger = app_logger.getChild("api")
         self._tz = tz
+        self._zone = ZoneOffset(tz or LOCAL_TZ)
+        self.source = source if source is not None else default_source()
+        self.cache = cache
 
         self.class_name = f"[{self.__class__.__name__}]"
 
@@ -118,15 +282,19 @@ class DateTime:
         """
         self.logger.debug(f"{self.class_name} Returning Arrow object (tz={self.tz}) ")
 
-        return Arrow.now(tzinfo=self.tz)
+        return Arrow.fromdatetime(self.now())
+
+    def now(self) -> datetime:
+        """Returns the current (aware) `datetime` read from the clock source, in this time zone"""
+        return self._zone.datetime_at(self.source.time_ns() // 1000)
 
     @property
     def time(self) -> time:
-        return self.date_time.time()
+        return self.now().time()
 
     @property
     def date(self) -> date:
-        return self.date_time.date()
+        return self.now().date()
 
     @property
     def tz(self) -> tzinfo | None:
@@ -137,19 +305,24 @@ class DateTime:
         self.logger.info(f"{self.class_name} Updating the Time Zone Info")
         self.logger.debug(f"{self.class_name} Existing TimeZone: {self.time.tzname}")
         self._tz = tz
+        self._zone = ZoneOffset(tz or LOCAL_TZ)
         self.logger.debug(f"{self.class_name} New TimeZone: {self.time.tzname}")
         self.logger.info(f"{self.class_name} Updated the Time Zone Info")
         return self.tz
 
-    def get_time(self, format: str = "HH:mm:ss") -> str:
+    def get_time(self, format: str = "HH:mm:ss", locale: str = DEFAULT_LOCALE) -> str:
         """Returns the string representation of the current time, with the given format. Refer to the `Arrow` module's documentation for the formatting options"""
-        self.logger.debug(f"{self.class_name} Returning current time as string")
-        return self.date_time.format(format)
+        self.logger.debug("%s Returning current time as string", self.class_name)
+        if self.cache is not None:
+            return self.cache.format(format, self._tz, locale, at=self.source.time_ns() // 1000)
+        return compile_format(format, locale).render(self.now())
 
-    def get_date(self, format: str = "DD/MM/YYYY") -> str:
+    def get_date(self, format: str = "DD/MM/YYYY", locale: str = DEFAULT_LOCALE) -> str:
         """Returns the string representation of the current date, with the given format. Refer to the `Arrow` module's documentation for the formatting options"""
-        self.logger.debug(f"{self.class_name} Returning current date as string")
-        return self.date_time.format(format)
+        self.logger.debug("%s Returning current date as string", self.class_name)
+        if self.cache is not None:
+            return self.cache.format(format, self._tz, locale, at=self.source.time_ns() // 1000)
+        return compile_format(format, locale).render(self.now())
 
         # def get_time_hour(self, time: Arrow | None = None) -> int:
         #     """Returns the hour of the given time object as an integer"""
@@ -209,77 +382,242 @@ class DateTime:
         )
         return time.format("A")
 
+    def get_times(
+        self,
+        epochs: Any,
+        format: str = "HH:mm:ss",
+        unit: Unit = "s",
+        locale: str = DEFAULT_LOCALE,
+        as_bytes: bool = False,
+    ) -> Any:
+        """Returns the string representations of a whole column of epochs (a NumPy array or a buffer of int64), with the given format. Needs `numpy`, refer to `clock.backend.bulk.format_many`"""
+        self.logger.debug("%s Returning a column of times as strings", self.class_name)
+        return format_many(epochs, format, self.tz, unit, locale, as_bytes)
+
+    def get_dates(
+        self,
+        epochs: Any,
+        format: str = "DD/MM/YYYY",
+        unit: Unit = "s",
+        locale: str = DEFAULT_LOCALE,
+        as_bytes: bool = False,
+    ) -> Any:
+        """Returns the string representations of a whole column of epochs (a NumPy array or a buffer of int64), with the given format. Needs `numpy`, refer to `clock.backend.bulk.format_many`"""
+        self.logger.debug("%s Returning a column of dates as strings", self.class_name)
+        return format_many(epochs, format, self.tz, unit, locale, as_bytes)
+
     def get_time_data(self, time: Arrow | None = None) -> TimeData:
-        self.logger.info(f"{self.class_name} Getting Time Data")
+        self.logger.info("%s Getting Time Data", self.class_name)
 
         if time is None:
             self.logger.debug(
-                f"{self.class_name} time object is not supplied, returning the current time data"
-            )
-            time = self.date_time
-            data = TimeData(
-                hour=time.format("hh"),
-                minute=time.format("mm"),
-                second=time.format("ss"),
-                sub_second=f"{time.format("S")}",
-                session=time.format("A"),
+                "%s time object is not supplied, returning the current time data", self.class_name
             )
+            if self.cache is not None:
+                data = self.cache.time_data(self._tz, at=self.source.time_ns() // 1000)
+            else:
+                data = time_data_of(self.now())
 
-            self.logger.info(f"{self.class_name} Returning time data")
-            self.logger.debug(f"{self.class_name} Returning data:\n{data.asdict()}")
+            self.logger.info("%s Returning time data", self.class_name)
+            self.logger.debug("%s Returning data:\n%s", self.class_name, data)
 
             return data
 
         else:
             self.logger.debug(
-                f"{self.class_name} time object supplied, stripping time data from the object"
+                "%s time object supplied, stripping time data from the object", self.class_name
             )
 
-            data = TimeData(
-                hour=time.format("hh"),
-                minute=time.format("mm"),
-                second=time.format("ss"),
-                sub_second=f"{time.format("S"):02}",
-                session=time.format("A"),
-            )
+            data = time_data_of(time.datetime)
 
-            self.logger.info(f"{self.class_name} Returning time data")
-            self.logger.debug(f"{self.class_name} Returning data:\n{data.asdict()}")
+            self.logger.info("%s Returning time data", self.class_name)
+            self.logger.debug("%s Returning data:\n%s", self.class_name, data)
 
             return data
 
     def get_date_data(self, date: Arrow | None = None) -> DateData:
-        self.logger.info(f"{self.class_name} Getting Date Data")
+        self.logger.info("%s Getting Date Data", self.class_name)
 
         if date is None:
             self.logger.debug(
-                f"{self.class_name} date object is not supplied, returning the current date data"
+                "%s date object is not supplied, returning the current date data", self.class_name
             )
 
-            date = self.date_time
-            data = DateData(
-                day=date.format("DD"),
-                month=date.format("MMM"),
-                year=date.format("YYYY"),
-            )
+            if self.cache is not None:
+                data = self.cache.date_data(self._tz, at=self.source.time_ns() // 1000)
+            else:
+                data = date_data_of(self.now())
 
-            self.logger.info(f"{self.class_name} Returning time data")
-            self.logger.debug(f"{self.class_name} Returning data:\n{data.asdict()}")
+            self.logger.info("%s Returning time data", self.class_name)
+            self.logger.debug("%s Returning data:\n%s", self.class_name, data)
 
             return data
 
         else:
             self.logger.debug(
-                f"{self.class_name} date object supplied, stripping date data from the object"
+                "%s date object supplied, stripping date data from the object", self.class_name
             )
 
-            data = DateData(
-                day=date.format("DD"),
-                month=date.format("MMM"),
-                year=date.format("YYYY"),
-            )
+            data = date_data_of(date.datetime)
 
-            self.logger.info(f"{self.class_name} Returning time data")
-            self.logger.debug(f"{self.class_name} Returning data:\n{data.asdict()}")
+            self.logger.info("%s Returning time data", self.class_name)
+            self.logger.debug("%s Returning data:\n%s", self.class_name, data)
 
             return data
+
+    def as_datetime(self, value: Arrow | int | float) -> datetime:
+        """Returns the `datetime` of an `Arrow` object or of an epoch (seconds), in this time zone"""
+        if isinstance(value, Arrow):
+            return value.datetime
+        return self._zone.datetime_at(round(value * 1_000_000))
+
+    def snapshot(self, time: Arrow | int | float | None = None) -> Snapshot:
+        """Reads the clock once (or the given `Arrow` / epoch) and returns both the time and date data"""
+        self.logger.info("%s Taking a snapshot", self.class_name)
+
+        if time is None:
+            self.logger.debug(
+                "%s time object is not supplied, using the current time", self.class_name
+            )
+            dt = self.now()
+        else:
+            dt = self.as_datetime(time)
+
+        snapshot = Snapshot(time=time_data_of(dt), date=date_data_of(dt))
+        self.logger.debug("%s Returning snapshot:\n%s", self.class_name, snapshot)
+
+        return snapshot
+
+    def snapshot_many(self, times: Iterable[Arrow | int | float]) -> list[Snapshot]:
+        """Returns the snapshots of the given `Arrow` objects or epochs (seconds), in the same order"""
+        self.logger.info("%s Taking a batch of snapshots", self.class_name)
+
+        snapshots = []
+        for time in times:
+            dt = self.as_datetime(time)
+            snapshots.append(Snapshot(time=time_data_of(dt), date=date_data_of(dt)))
+
+        self.logger.debug("%s Returning %s snapshots", self.class_name, len(snapshots))
+        return snapshots
+
+    def _as_microseconds(self, value: Arrow | datetime | int | float) -> int:
+        """Returns the epoch (in microseconds) of an `Arrow` object, a `datetime` (a naive one
+        is a wall time in this time zone) or an epoch (seconds)"""
+        if isinstance(value, Arrow):
+            value = value.datetime
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                local = (value.replace(tzinfo=timezone.utc) - _EPOCH) // timedelta(microseconds=1)
+                seconds, microsecond = divmod(local, 1_000_000)
+                return self._zone.epoch_of(seconds) * 1_000_000 + microsecond
+            return (value - _EPOCH) // timedelta(microseconds=1)
+        return round(value * 1_000_000)
+
+    def _local_steps(
+        self,
+        start: Arrow | datetime | int | float,
+        end: Arrow | datetime | int | float,
+        step: timedelta | float,
+    ) -> Iterator[tuple[int, int]]:
+        """Yields the local (days since the epoch, microseconds of the day) of the instants
+        from `start` to `end` (inclusive). A step of whole days keeps the wall time across
+        the DST transitions, any other step is an exact duration"""
+        first = self._as_microseconds(start)
+        last = self._as_microseconds(end)
+        if isinstance(step, timedelta):
+            step_us = step // timedelta(microseconds=1)
+        else:
+            step_us = round(step * 1_000_000)
+        if step_us <= 0:
+            raise ValueError(f"step must be positive, got {step!r}")
+
+        zone = self._zone
+        seconds, microsecond = divmod(first, 1_000_000)
+        if step_us % MICROSECONDS_PER_DAY:
+            instant = first
+            while instant <= last:
+                seconds, microsecond = divmod(instant, 1_000_000)
+                days, day_seconds = divmod(seconds + zone.at(seconds), SECONDS_PER_DAY)
+                yield days, day_seconds * 1_000_000 + microsecond
+                instant += step_us
+            return
+
+        step_days = step_us // MICROSECONDS_PER_DAY
+        days, wall = divmod(seconds + zone.at(seconds), SECONDS_PER_DAY)
+        while True:
+            if seconds * 1_000_000 + microsecond > last:
+                return
+            # The wall time moves only when it was skipped (by a DST gap), for that day
+            local_days, day_seconds = divmod(seconds + zone.at(seconds), SECONDS_PER_DAY)
+            yield local_days, day_seconds * 1_000_000 + microsecond
+            days += step_days
+            seconds = zone.epoch_of(days * SECONDS_PER_DAY + wall)
+
+    def snapshot_range(
+        self,
+        start: Arrow | datetime | int | float,
+        end: Arrow | datetime | int | float,
+        step: timedelta | float = timedelta(minutes=1),
+    ) -> Iterator[Snapshot]:
+        """Lazily yields the snapshots from `start` to `end` (inclusive, `Arrow` / `datetime` /
+        epoch seconds) every `step` (a `timedelta` or seconds), in this time zone. A step of
+        whole days keeps the wall time across the DST transitions. The `TimeData` / `DateData`
+        of the fields that did not change are shared with the previous snapshot"""
+        self.logger.info("%s Taking the snapshots from %s to %s", self.class_name, start, end)
+
+        last_day_time = last_days = None
+        time_data = date_data = None
+        for days, day_time in self._local_steps(start, end, step):
+            if day_time != last_day_time:
+                time_data = time_data_of_day(day_time)
+                last_day_time = day_time
+            if days != last_days:
+                if date_data is not None and days == last_days + 1:  # type: ignore
+                    date_data = _following_day(date_data)
+                else:
+                    date_data = DateData(*civil_from_days(days))
+                last_days = days
+            yield Snapshot(time=time_data, date=date_data)  # type: ignore
+
+    def time_data_range(
+        self,
+        start: Arrow | datetime | int | float,
+        end: Arrow | datetime | int | float,
+        step: timedelta | float = timedelta(minutes=1),
+    ) -> Iterator[TimeData]:
+        """Lazily yields the `TimeData` from `start` to `end`, refer to `snapshot_range`"""
+        last_day_time = None
+        time_data = None
+        for _, day_time in self._local_steps(start, end, step):
+            if day_time != last_day_time:
+                time_data = time_data_of_day(day_time)
+                last_day_time = day_time
+            yield time_data  # type: ignore
+
+    def date_data_range(
+        self,
+        start: Arrow | datetime | int | float,
+        end: Arrow | datetime | int | float,
+        step: timedelta | float = timedelta(days=1),
+    ) -> Iterator[DateData]:
+        """Lazily yields the `DateData` from `start` to `end`, refer to `snapshot_range`"""
+        last_days = None
+        date_data = None
+        for days, _ in self._local_steps(start, end, step):
+            if days != last_days:
+                if date_data is not None and days == last_days + 1:  # type: ignore
+                    date_data = _following_day(date_data)
+                else:
+                    date_data = DateData(*civil_from_days(days))
+                last_days = days
+            yield date_data  # type: ignore
+
+
+for _method in ("now", "get_time", "get_date", "get_time_data", "get_date_data", "snapshot"):
+    metrics.instrument(
+        DateTime,
+        _method,
+        metrics.Histogram(
+            "clock_datetime_call_seconds", "The duration of the DateTime calls", {"method": _method}
+        ),
+    )
@@ -0,0 +1,367 @@
+"""
+Contains the vectorized (NumPy) formatting of whole columns of epoch timestamps
+
+`numpy` is an optional dependency, only needed by this module.
+
+Usage:
+>>> format_many(np.array([0, 1_700_000_000]), "DD MMM, YYYY hh:mm:ss A", tz=tz.UTC)
+array(['01 Jan, 1970 12:00:00 AM', '14 Nov, 2023 10:13:20 PM'], dtype='<U24')
+"""
+
+from datetime import datetime, tzinfo
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple
+
+from arrow import locales
+from arrow.constants import DEFAULT_LOCALE
+from arrow.formatter import DateTimeFormatter
+from dateutil import tz as dateutil_tz
+
+from clock.backend.formatter import compile_format
+from clock.backend.logger import app_logger
+
+if TYPE_CHECKING:
+    import numpy as np
+
+Unit = Literal["s", "ms", "us", "ns"]
+
+UNITS: dict[str, int] = {"s": 1, "ms": 1_000, "us": 1_000_000, "ns": 1_000_000_000}
+_SUB_SECONDS: dict[str, int] = {f"S{'S' * i}": 10 ** (5 - i) for i in range(6)}
+_VECTORIZED_TOKENS = frozenset(
+    ["YYYY", "YY", "MMMM", "MMM", "MM", "M", "DDDD", "DDD", "DD", "D", "Do"]
+    + ["dddd", "ddd", "d", "HH", "H", "hh", "h", "mm", "m", "ss", "s", "ZZ", "Z"]
+    + ["a", "A", *_SUB_SECONDS]
+)
+# Cumulative days before each month (index 1-12), of a common year
+_DAYS_BEFORE_MONTH = (0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+
+logger = app_logger.getChild("bulk")
+
+
+def require_numpy():
+    try:
+        import numpy
+    except ImportError as error:  # pragma: no cover
+        raise ImportError(
+            "Bulk formatting needs `numpy`, install it with: pip install numpy"
+        ) from error
+    return numpy
+
+
+def _tokenize(format: str) -> list[tuple[bool, str]]:
+    """Splits the format into (is_token, text) parts, exactly like `Arrow.format` matches them"""
+    parts: list[tuple[bool, str]] = []
+    position = 0
+    for match in DateTimeFormatter._FORMAT_RE.finditer(format):
+        if match.start() > position:
+            parts.append((False, format[position : match.start()]))
+        token = match.group(0)
+        if token.startswith("[") and token.endswith("]"):
+            parts.append((False, token[1:-1]))
+        else:
+            parts.append((True, token))
+        position = match.end()
+    if position < len(format):
+        parts.append((False, format[position:]))
+    return parts
+
+
+def _utc_offsets(seconds: "np.ndarray", tz: tzinfo) -> "np.ndarray":
+    """Returns the UTC offset (in seconds) of every epoch, resolving the time zone once per hour.
+
+    An hour whose first and last second have different offsets holds a transition,
+    only the values falling in such an hour are resolved one by one"""
+    np = require_numpy()
+
+    def offset(epoch: int) -> int:
+        return int(datetime.fromtimestamp(epoch, tz).utcoffset().total_seconds())  # type: ignore
+
+    hours, inverse = np.unique(seconds // 3600, return_inverse=True)
+    starts = np.array([offset(int(hour) * 3600) for hour in hours], dtype=np.int64)
+    ends = np.array([offset(int(hour) * 3600 + 3599) for hour in hours], dtype=np.int64)
+
+    offsets = starts[inverse]
+    transitions = (starts != ends)[inverse]
+    if transitions.any():
+        indices = np.flatnonzero(transitions)
+        offsets[indices] = [offset(int(epoch)) for epoch in seconds[indices]]
+    return offsets
+
+
+def _civil_from_days(days: "np.ndarray") -> tuple["np.ndarray", ...]:
+    """Returns the (year, month, day) of days since the epoch, in the proleptic Gregorian calendar"""
+    np = require_numpy()
+
+    z = days + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = np.where(mp < 10, mp + 3, mp - 9)
+    year = yoe + era * 400 + (month <= 2)
+    return year, month, day
+
+
+class _Fields:
+    """Calendar fields of the local epochs, each computed on first use only"""
+
+    def __init__(
+        self, local: "np.ndarray", sub_second: "np.ndarray", offsets: "np.ndarray"
+    ) -> None:
+        self.np = require_numpy()
+        self.days, self.day_seconds = self.np.divmod(local, 86400)
+        self.sub_second = sub_second  # microseconds
+        self.offsets = offsets
+
+    @cached_property
+    def _civil(self) -> tuple["np.ndarray", ...]:
+        return _civil_from_days(self.days)
+
+    @property
+    def year(self) -> "np.ndarray":
+        return self._civil[0]
+
+    @property
+    def month(self) -> "np.ndarray":
+        return self._civil[1]
+
+    @property
+    def day(self) -> "np.ndarray":
+        return self._civil[2]
+
+    @cached_property
+    def yearday(self) -> "np.ndarray":
+        year, month = self.year, self.month
+        leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+        before = self.np.asarray(_DAYS_BEFORE_MONTH)[month]
+        return before + self.day + (leap & (month > 2))
+
+    @cached_property
+    def isoweekday(self) -> "np.ndarray":
+        return (self.days + 3) % 7 + 1
+
+    @cached_property
+    def hour(self) -> "np.ndarray":
+        return self.day_seconds // 3600
+
+    @cached_property
+    def hour_12(self) -> "np.ndarray":
+        hour = self.hour
+        return self.np.where((hour > 0) & (hour < 13), hour, abs(hour - 12))
+
+    @cached_property
+    def minute(self) -> "np.ndarray":
+        return self.day_seconds // 60 % 60
+
+    @cached_property
+    def second(self) -> "np.ndarray":
+        return self.day_seconds % 60
+
+
+class _Number(NamedTuple):
+    """Integers rendered in decimal, zero padded to `width` (0 for no padding)"""
+
+    values: "np.ndarray"
+    width: int
+
+
+class _Lookup(NamedTuple):
+    """Strings picked from a small `table` by `index`"""
+
+    table: list[str]
+    index: "np.ndarray"
+
+
+_Column = str | _Number | _Lookup
+
+
+def _token_columns(token: str, fields: _Fields, locale: locales.Locale) -> list[_Column]:
+    """Returns the columns rendering a token, the same way `Arrow.format` does"""
+
+    def table(method, last: int) -> list[str]:
+        values = [method(i) for i in range(1, last + 1)]
+        return values[:1] + values  # index 0 is never looked up, mirrors 1 to keep the width
+
+    match token:
+        case "YYYY":
+            return [_Number(fields.year, 4)]
+        case "YY":
+            return [_Number(fields.year % 100, 2)]
+        case "MMMM":
+            return [_Lookup(table(locale.month_name, 12), fields.month)]
+        case "MMM":
+            return [_Lookup(table(locale.month_abbreviation, 12), fields.month)]
+        case "MM":
+            return [_Number(fields.month, 2)]
+        case "M":
+            return [_Number(fields.month, 0)]
+        case "DDDD":
+            return [_Number(fields.yearday, 3)]
+        case "DDD":
+            return [_Number(fields.yearday, 0)]
+        case "DD":
+            return [_Number(fields.day, 2)]
+        case "D":
+            return [_Number(fields.day, 0)]
+        case "Do":
+            return [_Lookup(table(locale.ordinal_number, 31), fields.day)]
+        case "dddd":
+            return [_Lookup(table(locale.day_name, 7), fields.isoweekday)]
+        case "ddd":
+            return [_Lookup(table(locale.day_abbreviation, 7), fields.isoweekday)]
+        case "d":
+            return [_Number(fields.isoweekday, 0)]
+        case "HH":
+            return [_Number(fields.hour, 2)]
+        case "H":
+            return [_Number(fields.hour, 0)]
+        case "hh":
+            return [_Number(fields.hour_12, 2)]
+        case "h":
+            return [_Number(fields.hour_12, 0)]
+        case "mm":
+            return [_Number(fields.minute, 2)]
+        case "m":
+            return [_Number(fields.minute, 0)]
+        case "ss":
+            return [_Number(fields.second, 2)]
+        case "s":
+            return [_Number(fields.second, 0)]
+        case "a" | "A":
+            meridians = [locale.meridian(hour, token) or "" for hour in range(24)]
+            return [_Lookup(meridians, fields.hour)]
+        case "ZZ" | "Z":
+            np = fields.np
+            minutes = np.trunc(fields.offsets / 60).astype(np.int64)
+            hours, minutes = np.divmod(abs(minutes), 60)
+            sign = _Lookup(["+", "-"], (fields.offsets <= -60).astype(np.int64))
+            separator = ":" if token == "ZZ" else ""
+            return [sign, _Number(hours, 2), separator, _Number(minutes, 2)]
+        case _:
+            return [_Number(fields.sub_second // _SUB_SECONDS[token], len(token))]
+
+
+@lru_cache(maxsize=None)
+def _digit_table(width: int) -> "np.ndarray":
+    """Returns the ASCII bytes of every number below 10**width, zero padded, as a (10**width, width) matrix"""
+    np = require_numpy()
+    numbers = "".join(f"{i:0{width}d}" for i in range(10**width)).encode("ascii")
+    return np.frombuffer(numbers, dtype=np.uint8).reshape(-1, width)
+
+
+def _byte_matrix(column: _Column, size: int) -> "np.ndarray | None":
+    """Returns a column as an UTF-8 byte matrix of shape (size, width), if it has a fixed width"""
+    np = require_numpy()
+    match column:
+        case str():
+            literal = np.frombuffer(column.encode("utf-8"), dtype=np.uint8)
+            return np.broadcast_to(literal, (size, literal.size))
+        case _Number(values, width):
+            if not width or (size and (values.min() < 0 or values.max() >= 10**width)):
+                return None
+            if width <= 3:  # a table of every zero padded number beats the digit math
+                return _digit_table(width)[values]
+            powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+            return (values[:, None] // powers % 10 + 48).astype(np.uint8)
+        case _Lookup(table, index):
+            encoded = [text.encode("utf-8") for text in table]
+            if len({len(text) for text in encoded}) != 1:
+                return None
+            matrix = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+            return matrix.reshape(len(encoded), -1)[index]
+
+
+def _string_column(column: _Column) -> "np.ndarray | str":
+    """Returns a column as strings, for the variable width formats"""
+    np = require_numpy()
+    match column:
+        case str():
+            return column
+        case _Number(values, width):
+            text = values.astype(np.str_)
+            return np.char.zfill(text, width) if width else text
+        case _Lookup(table, index):
+            return np.asarray(table)[index]
+
+
+def _scalar_format(seconds, sub_seconds, tz, format: str, locale: str) -> list[str]:
+    """Formats every value through the compiled `FormatPlan`, for the tokens with no fast path"""
+    plan = compile_format(format, locale)
+    return [
+        plan.render(datetime.fromtimestamp(int(epoch), tz).replace(microsecond=int(us)))
+        for epoch, us in zip(seconds, sub_seconds)
+    ]
+
+
+def format_many(
+    values: Any,
+    format: str,
+    tz: tzinfo | None = None,
+    unit: Unit = "s",
+    locale: str = DEFAULT_LOCALE,
+    as_bytes: bool = False,
+) -> "np.ndarray":
+    """
+    Formats a whole column of epoch timestamps with an Arrow-style format, using vectorized
+    integer math for the calendar fields and the time zone offsets.
+
+    Args:
+        values (ArrayLike | Buffer): The int64 epochs, a NumPy array or any buffer of int64.
+        format (str): The Arrow-style format string.
+        tz (tzinfo | None, optional): The time zone to format in. Defaults to the local one.
+        unit (Literal["s", "ms", "us", "ns"], optional): The unit of the epochs. Defaults to "s".
+        locale (str, optional): The Arrow locale. Defaults to "en-us".
+        as_bytes (bool, optional): Returns a fixed-width (UTF-8) bytes array. Defaults to False.
+
+    Returns:
+        np.ndarray: The formatted strings (`str_`, or `bytes_` with `as_bytes`), in order.
+    """
+    np = require_numpy()
+    tz = tz or dateutil_tz.tzlocal()
+
+    if isinstance(values, np.ndarray):
+        epochs = values.astype(np.int64, copy=False).ravel()
+    elif isinstance(values, (bytes, bytearray, memoryview)):
+        epochs = np.frombuffer(values, dtype=np.int64)
+    else:
+        epochs = np.asarray(values, dtype=np.int64).ravel()
+
+    seconds, sub_seconds = np.divmod(epochs, UNITS[unit])
+    sub_seconds = sub_seconds * 1_000_000 // UNITS[unit]
+    parts = _tokenize(format)
+    logger.debug("[bulk] Formatting %s epochs with %r", epochs.size, format)
+
+    if any(is_token and text not in _VECTORIZED_TOKENS for is_token, text in parts):
+        logger.debug("[bulk] %r has tokens with no fast path, formatting one by one", format)
+        result = np.asarray(_scalar_format(seconds, sub_seconds, tz, format, locale))
+        return np.char.encode(result, "utf-8") if as_bytes else result.astype(np.str_)
+
+    offsets = _utc_offsets(seconds, tz) if epochs.size else seconds
+    fields = _Fields(seconds + offsets, sub_seconds, offsets)
+    arrow_locale = locales.get_locale(locale)
+    columns: list[_Column] = []
+    for is_token, text in parts:
+        columns.extend(_token_columns(text, fields, arrow_locale) if is_token else [text])
+
+    # Fast path: every column has a fixed byte width, so the rows are a plain byte matrix
+    matrices = [_byte_matrix(column, epochs.size) for column in columns]
+    if all(matrix is not None for matrix in matrices):
+        width = sum(matrix.shape[1] for matrix in matrices)  # type: ignore
+        rows = np.zeros((epochs.size, width or 1), dtype=np.uint8)
+        column_start = 0
+        for matrix in matrices:
+            rows[:, column_start : column_start + matrix.shape[1]] = matrix  # type: ignore
+            column_start += matrix.shape[1]  # type: ignore
+        if as_bytes:
+            return rows.view(f"S{rows.shape[1]}").ravel()
+        if not rows.size or rows.max() < 0x80:  # ASCII, the bytes are the code points
+            return rows.astype(np.uint32).view(f"U{rows.shape[1]}").ravel()
+        return np.char.decode(rows.view(f"S{rows.shape[1]}").ravel(), "utf-8")
+
+    # Variable width columns: join them as strings
+    result = np.full(epochs.size, "", dtype=np.str_)
+    for column in columns:
+        result = np.char.add(result, _string_column(column))
+    return np.char.encode(result, "utf-8") if as_bytes else result
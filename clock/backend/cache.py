@@ -0,0 +1,230 @@
+"""
+Contains the clock cache shared by the threads: the formatted times / dates and the time /
+date data, computed once per time zone, format and resolution bucket
+Usage:
+>>> cache = ClockCache()
+>>> cache.format("hh:mm:ss A", gettz("Asia/Kolkata"))  # computed once per second
+>>> cache.format("HH:mm:ss.SSS", resolution="millisecond")
+>>> cache.time_data(gettz("Asia/Kolkata"))
+>>> cache.date_data()  # computed once per local day
+>>> DateTime(gettz("Asia/Kolkata"), cache=cache).get_time()  # through the cache
+"""
+
+import threading
+from datetime import tzinfo
+from typing import Any, Callable, Literal
+
+from arrow.constants import DEFAULT_LOCALE
+
+from clock.backend import metrics
+from clock.backend._calendar import SECONDS_PER_DAY
+from clock.backend.api import LOCAL_TZ, DateData, TimeData, date_data_of, time_data_of
+from clock.backend.formatter import compile_format
+from clock.backend.logger import app_logger
+from clock.backend.source import ClockSource, default_source
+from clock.backend.zone import ZoneOffset
+
+Resolution = Literal[
+    "minute", "second", "decisecond", "centisecond", "millisecond", "microsecond"
+]
+
+# The width of the buckets, in microseconds
+RESOLUTIONS: dict[str, int] = {
+    "minute": 60_000_000,
+    "second": 1_000_000,
+    "decisecond": 100_000,
+    "centisecond": 10_000,
+    "millisecond": 1_000,
+    "microsecond": 1,
+}
+# The cached values are all dropped past this many (time zone, format, resolution) keys
+MAX_ENTRIES = 1024
+
+_COMPUTED = metrics.Counter(
+    "clock_cache_computed_total", "The values computed by the clock cache, on a miss"
+)
+
+
+def _format_resolution(format: str, locale: str) -> int:
+    """The finest bucket (in microseconds) that the tokens of the format show"""
+    resolution = RESOLUTIONS["second"]
+    for token in compile_format(format, locale).tokens:
+        if token is None:
+            continue
+        if token[0] == "S":
+            resolution = min(resolution, 10 ** max(6 - len(token), 0))
+        elif token in ("X", "x"):  # the timestamps show the microseconds
+            resolution = 1
+    return resolution
+
+
+class _Slot:
+    """The lock and the zone of a key: its value is computed with the lock held, so that
+    the zone (a `ZoneOffset` isn't thread-safe) is only ever used by one thread"""
+
+    __slots__ = ("lock", "zone")
+
+    def __init__(self, tz: tzinfo) -> None:
+        self.lock = threading.Lock()
+        self.zone = ZoneOffset(tz)  # keeps the `tzinfo` alive, and so the key's `id` unique
+
+
+class ClockCache:
+    """Computes each value once per bucket of time, for every thread reading it.
+
+    A value is kept per key (time zone, format, locale, resolution) along with the span of
+    epochs it holds for, as a single tuple swapped as a whole. A reader within the span
+    gets it with a dictionary lookup and no lock. On a miss, the readers of the key queue
+    on the key's lock, so that a single one of them computes the value and the others find
+    it computed, while the other keys are computed meanwhile. The value is rendered from
+    the start of the bucket (not from the reader's own instant), so every reader of a
+    bucket gets the same value, and a format showing finer than the `resolution` shows the
+    truncated instant. A reader lagging a bucket behind gets its own bucket's value,
+    computed without replacing the newer one. Past `max_entries` keys, every key is dropped
+    (along with the time zones it kept alive)"""
+
+    logger = app_logger.getChild("cache")
+
+    def __init__(
+        self, source: ClockSource | None = None, max_entries: int = MAX_ENTRIES
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be positive, got {max_entries!r}")
+
+        self.class_name = f"[{self.__class__.__name__}]"
+        self.source = source if source is not None else default_source()
+        self.max_entries = max_entries
+
+        # key -> (start, end, value), the epochs (in microseconds) the value holds for
+        self._entries: dict[tuple, tuple[int, int, Any]] = {}
+        # key -> its lock and zone, the time zone is in the key by `id` (not every `tzinfo`
+        # is hashable), an entry is only kept along with the slot keeping its `tzinfo` alive
+        self._slots: dict[tuple, _Slot] = {}
+        self._lock = threading.Lock()  # of the two dictionaries, never held while computing
+
+        self.logger.debug(f"{self.class_name} Caching up to {max_entries} values")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._slots.clear()
+
+    def _compute(
+        self,
+        key: tuple,
+        tz: tzinfo | None,
+        now: int,
+        compute: Callable[..., tuple[int, int, Any]],
+        *args: Any,
+    ) -> Any:
+        """The miss: computes the value (once, among the readers of the key) and keeps it"""
+        slot = self._slots.get(key)
+        if slot is None:
+            with self._lock:
+                slot = self._slots.get(key)
+                if slot is None:
+                    if len(self._slots) >= self.max_entries:
+                        self.logger.debug("%s Full, dropping every value", self.class_name)
+                        self._entries.clear()
+                        self._slots.clear()
+                    slot = self._slots[key] = _Slot(tz or LOCAL_TZ)
+
+        with slot.lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now < entry[1]:  # computed while queueing
+                return entry[2]
+            computed = compute(slot.zone, now, *args)
+            with self._lock:
+                entry = self._entries.get(key)
+                # Not if the slot was dropped meanwhile, its `tzinfo` may be gone
+                if self._slots.get(key) is slot and (entry is None or computed[0] >= entry[0]):
+                    self._entries[key] = computed
+        if metrics.enabled:
+            _COMPUTED.inc()
+        return computed[2]
+
+    def format(
+        self,
+        format: str,
+        tz: tzinfo | None = None,
+        locale: str = DEFAULT_LOCALE,
+        resolution: Resolution | None = None,
+        at: int | None = None,
+    ) -> str:
+        """Returns the current time formatted in the time zone (by default, the local one).
+
+        Args:
+            format (str): The `Arrow` format.
+            tz (tzinfo | None, optional): The time zone. Defaults to the local one.
+            locale (str, optional): The locale of the names. Defaults to "en_us".
+            resolution (Resolution | None, optional): The width of the buckets. Defaults to
+                the finest the format shows (the "second", or finer with "S…" tokens).
+            at (int | None, optional): The instant, in epoch microseconds. Defaults to the
+                cache's clock source.
+
+        Returns:
+            str: The formatted start of the instant's bucket.
+        """
+        now = self.source.time_ns() // 1000 if at is None else at
+        key = (id(tz or LOCAL_TZ), format, locale, resolution)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= now < entry[1]:
+            return entry[2]
+        return self._compute(key, tz, now, self._format, format, locale, resolution)
+
+    def _format(
+        self, zone: ZoneOffset, now: int, format: str, locale: str, resolution: str | None
+    ) -> tuple[int, int, str]:
+        width = (
+            _format_resolution(format, locale) if resolution is None else RESOLUTIONS[resolution]
+        )
+        start = now // width * width
+        return start, start + width, compile_format(format, locale).render(zone.datetime_at(start))
+
+    def time_data(
+        self,
+        tz: tzinfo | None = None,
+        resolution: Resolution = "decisecond",
+        at: int | None = None,
+    ) -> TimeData:
+        """Returns the current `TimeData` in the time zone, of the start of its bucket (by
+        default a tenth of a second, what the `sub_second` shows)"""
+        now = self.source.time_ns() // 1000 if at is None else at
+        key = (id(tz or LOCAL_TZ), TimeData, resolution)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= now < entry[1]:
+            return entry[2]
+        return self._compute(key, tz, now, self._time_data, resolution)
+
+    def _time_data(
+        self, zone: ZoneOffset, now: int, resolution: str
+    ) -> tuple[int, int, TimeData]:
+        width = RESOLUTIONS[resolution]
+        start = now // width * width
+        return start, start + width, time_data_of(zone.datetime_at(start))
+
+    def date_data(self, tz: tzinfo | None = None, at: int | None = None) -> DateData:
+        """Returns the current `DateData` in the time zone, computed once per local day (and
+        again past a DST transition)"""
+        now = self.source.time_ns() // 1000 if at is None else at
+        key = (id(tz or LOCAL_TZ), DateData)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= now < entry[1]:
+            return entry[2]
+        return self._compute(key, tz, now, self._date_data)
+
+    def _date_data(self, zone: ZoneOffset, now: int) -> tuple[int, int, DateData]:
+        seconds = now // 1_000_000
+        dt = zone.datetime_at(now)
+        offset = zone.at(seconds)
+        # The local day, within the span of the offset
+        midnight = (seconds + offset) // SECONDS_PER_DAY * SECONDS_PER_DAY - offset
+        start = max(midnight, zone.valid_from)
+        end = min(midnight + SECONDS_PER_DAY, zone.valid_until)
+        return start * 1_000_000, end * 1_000_000, date_data_of(dt)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(entries={len(self)}, max_entries={self.max_entries})"
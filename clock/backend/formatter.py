@@ -0,0 +1,161 @@
+"""
+Contains the compiled format plans used by `DateTime.get_time` / `DateTime.get_date`
+
+`Arrow.format` tokenizes the format string on every call, even though the clock keeps
+on rendering the very same handful of formats. This module parses an Arrow-style token
+string once into a `FormatPlan` and keeps the plans in a bounded LRU cache keyed by the
+format and the locale, so that rendering is just a walk over pre-resolved parts.
+
+Usage:
+>>> plan = compile_format("hh:mm:ss A")
+>>> plan.render(datetime.now())
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable
+
+from arrow import locales
+from arrow.constants import DEFAULT_LOCALE
+from arrow.formatter import DateTimeFormatter
+
+PLAN_CACHE_SIZE = 128
+
+# Shared string tables, so that the hot tokens are a plain tuple lookup
+TWO_DIGITS: tuple[str, ...] = tuple(f"{i:02d}" for i in range(100))
+DIGITS: tuple[str, ...] = tuple(f"{i}" for i in range(100))
+THREE_DIGITS: tuple[str, ...] = tuple(f"{i:03d}" for i in range(1000))
+HOUR_12: tuple[int, ...] = tuple(h if 0 < h < 13 else abs(h - 12) for h in range(24))
+
+Renderer = Callable[[datetime], str]
+
+
+def _locale_table(
+    method: Callable[[int], str | None], first: int, last: int
+) -> tuple[str | None, ...]:
+    """Pre-renders a locale method for every possible input, index 0 is left unused"""
+    return (None,) * first + tuple(method(i) for i in range(first, last + 1))
+
+
+def _token_renderer(
+    token: str, locale: locales.Locale, formatter: DateTimeFormatter
+) -> Renderer:
+    """Returns a callable rendering the given token exactly like `Arrow.format` does"""
+    match token:
+        case "YYYY":
+            return lambda dt: locale.year_full(dt.year)
+        case "YY":
+            return lambda dt: locale.year_abbreviation(dt.year)
+        case "MMMM":
+            month_names = _locale_table(locale.month_name, 1, 12)
+            return lambda dt: month_names[dt.month]
+        case "MMM":
+            month_abbreviations = _locale_table(locale.month_abbreviation, 1, 12)
+            return lambda dt: month_abbreviations[dt.month]
+        case "MM":
+            return lambda dt: TWO_DIGITS[dt.month]
+        case "M":
+            return lambda dt: DIGITS[dt.month]
+        case "DD":
+            return lambda dt: TWO_DIGITS[dt.day]
+        case "D":
+            return lambda dt: DIGITS[dt.day]
+        case "Do":
+            ordinals = _locale_table(locale.ordinal_number, 1, 31)
+            return lambda dt: ordinals[dt.day]
+        case "dddd":
+            day_names = _locale_table(locale.day_name, 1, 7)
+            return lambda dt: day_names[dt.isoweekday()]
+        case "ddd":
+            day_abbreviations = _locale_table(locale.day_abbreviation, 1, 7)
+            return lambda dt: day_abbreviations[dt.isoweekday()]
+        case "d":
+            return lambda dt: DIGITS[dt.isoweekday()]
+        case "HH":
+            return lambda dt: TWO_DIGITS[dt.hour]
+        case "H":
+            return lambda dt: DIGITS[dt.hour]
+        case "hh":
+            return lambda dt: TWO_DIGITS[HOUR_12[dt.hour]]
+        case "h":
+            return lambda dt: DIGITS[HOUR_12[dt.hour]]
+        case "mm":
+            return lambda dt: TWO_DIGITS[dt.minute]
+        case "m":
+            return lambda dt: DIGITS[dt.minute]
+        case "ss":
+            return lambda dt: TWO_DIGITS[dt.second]
+        case "s":
+            return lambda dt: DIGITS[dt.second]
+        case "S":
+            return lambda dt: DIGITS[dt.microsecond // 100000]
+        case "SS":
+            return lambda dt: TWO_DIGITS[dt.microsecond // 10000]
+        case "SSS":
+            return lambda dt: THREE_DIGITS[dt.microsecond // 1000]
+        case "a" | "A":
+            meridians = tuple(locale.meridian(hour, token) for hour in range(24))
+            return lambda dt: meridians[dt.hour]
+        case _:
+            # Rare tokens (timezones, timestamps, ISO weeks, ...) are delegated as is, the
+            # ones it matches but doesn't render ("dd", "YYY", ...) are empty, like `Arrow.format`
+            return lambda dt: formatter._format_token(dt, token) or ""  # type: ignore
+
+
+class FormatPlan:
+    """A format string, tokenized once and resolved into literals and token renderers"""
+
+    __slots__ = ("format", "locale", "parts", "tokens")
+
+    def __init__(self, format: str, locale: str = DEFAULT_LOCALE) -> None:
+        self.format = format
+        self.locale = locale
+
+        formatter = DateTimeFormatter(locale)
+        items: list[tuple[str | None, str | Renderer]] = []  # (token, part)
+        position = 0
+        for match in DateTimeFormatter._FORMAT_RE.finditer(format):
+            if match.start() > position:
+                items.append((None, format[position : match.start()]))
+            token = match.group(0)
+            if token.startswith("[") and token.endswith("]"):
+                items.append((None, token[1:-1]))
+            else:
+                renderer = _token_renderer(token, formatter.locale, formatter)
+                items.append((token, renderer))
+            position = match.end()
+        if position < len(format):
+            items.append((None, format[position:]))
+
+        items = _merge_literals(items)
+        self.parts: tuple[str | Renderer, ...] = tuple(part for _, part in items)
+        # The token of each part, `None` for the literals
+        self.tokens: tuple[str | None, ...] = tuple(token for token, _ in items)
+
+    def render(self, dt: datetime) -> str:
+        """Renders the given `datetime` (or `Arrow.datetime`) with the compiled format"""
+        return "".join(
+            [part if part.__class__ is str else part(dt) for part in self.parts]  # type: ignore
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(format={self.format!r}, locale={self.locale!r})"
+
+
+def _merge_literals(
+    items: list[tuple[str | None, str | Renderer]],
+) -> list[tuple[str | None, str | Renderer]]:
+    """Joins adjacent literal parts, so that they cost a single item while rendering"""
+    merged: list[tuple[str | None, str | Renderer]] = []
+    for token, part in items:
+        if token is None and merged and merged[-1][0] is None:
+            merged[-1] = (None, merged[-1][1] + part)  # type: ignore
+        elif token is not None or part:
+            merged.append((token, part))
+    return merged
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def compile_format(format: str, locale: str = DEFAULT_LOCALE) -> FormatPlan:
+    """Returns the (cached) `FormatPlan` for the given format and locale"""
+    return FormatPlan(format, locale)
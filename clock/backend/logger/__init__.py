@@ -7,10 +7,12 @@ from typing import TypeAlias
 from clock.backend.logger.logger import (
     RichConsoleHandler,
     RichFileHandler,
+    StructuredFileHandler,
     app_logger,
     configure_present_loggers,
     flet_core_logger,
     flet_logger,
+    stop_queued_logging,
 )
 
 Logger: TypeAlias = logging.Logger
@@ -19,8 +21,10 @@ __all__ = [
     "app_logger",
     "RichConsoleHandler",
     "RichFileHandler",
+    "StructuredFileHandler",
     "configure_present_loggers",
     "logging",
     "flet_logger",
     "flet_core_logger",
+    "stop_queued_logging",
 ]
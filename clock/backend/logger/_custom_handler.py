@@ -7,7 +7,8 @@ using the rich library for formatted output.
 The module defines two functions:
 
 1. RichConsoleHandler: Creates a RichHandler instance for console logging.
-2. RichFileHandler: Creates a RichHandler instance for file logging.
+2. RichFileHandler: Creates a RichHandler instance for file logging, into a buffered,
+   rotating and compressing `RotatingFileSink`.
 
 These handlers can be used with the standard Python logging module to log messages
 with rich formatting and custom log time format.
@@ -31,13 +32,28 @@ Example usage:
     logger.warning("This is a warning message.")
     logger.error("This is an error message.")
     ```
+
+Rich is only imported once a handler gets created, so that importing the logger package
+(and thus `clock.backend`) stays cheap for the consumers that never log to Rich.
 """
 
+from __future__ import annotations
+
 import logging
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from clock.backend.logger._file_sink import (
+    DEFAULT_BACKUP_COUNT,
+    DEFAULT_BUFFER_SIZE,
+    DEFAULT_FLUSH_INTERVAL,
+    DEFAULT_MAX_BYTES,
+    RotatingFileSink,
+    When,
+)
 
-from rich.console import Console
-from rich.logging import RichHandler
+if TYPE_CHECKING:
+    from rich.logging import RichHandler
 
 
 def RichConsoleHandler(level: int | str = logging.NOTSET) -> RichHandler:
@@ -50,6 +66,9 @@ def RichConsoleHandler(level: int | str = logging.NOTSET) -> RichHandler:
     Returns:
         RichHandler: A RichHandler instance for console logging.
     """
+    from rich.console import Console
+    from rich.logging import RichHandler
+
     return RichHandler(
         level=level,
         console=Console(file=None),
@@ -59,19 +78,53 @@ def RichConsoleHandler(level: int | str = logging.NOTSET) -> RichHandler:
 
 
 def RichFileHandler(
-    level: int | str = logging.NOTSET, file: Path = Path("log.log")
+    level: int | str = logging.NOTSET,
+    file: Path = Path("log.log"),
+    width: int = 115,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    max_bytes: int | None = DEFAULT_MAX_BYTES,
+    when: When | None = None,
+    backup_count: int = DEFAULT_BACKUP_COUNT,
+    compress: bool = True,
 ) -> RichHandler:
     """
     Create a RichHandler instance for file logging.
 
+    The records are rendered into a `RotatingFileSink`: buffered in memory, written out
+    by a background thread, rotated by size and / or time and flushed at exit.
+
     Args:
         level (int | str, optional): The logging level. Defaults to logging.NOTSET.
         file (Path, optional): The file path to log to. Defaults to Path("log.log").
+        width (int, optional): The width the records are rendered at. Defaults to 115.
+        buffer_size (int, optional): The bytes buffered before writing out right away.
+            Defaults to 64 KiB.
+        flush_interval (float, optional): The seconds between the background flushes.
+            Defaults to 1.0.
+        max_bytes (int | None, optional): The size to rotate at, `None` never rotates by
+            size. Defaults to 10 MiB.
+        when (Literal["midnight", "hour"] | None, optional): Rotates at every local
+            midnight / hour too. Defaults to None.
+        backup_count (int, optional): The rotated segments to keep. Defaults to 5.
+        compress (bool, optional): Whether to gzip the rotated segments. Defaults to True.
 
     Returns:
         RichHandler: A RichHandler instance for file logging.
     """
-    file_console = Console(file=open(file, "a+", encoding="utf-8"), width=115)
+    from rich.console import Console
+    from rich.logging import RichHandler
+
+    sink = RotatingFileSink(
+        file,
+        buffer_size=buffer_size,
+        flush_interval=flush_interval,
+        max_bytes=max_bytes,
+        when=when,
+        backup_count=backup_count,
+        compress=compress,
+    )
+    file_console = Console(file=sink, width=width)  # type: ignore
     return RichHandler(
         level=level,
         console=file_console,
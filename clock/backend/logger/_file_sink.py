@@ -0,0 +1,256 @@
+"""
+Module: file_sink
+
+This module provides the buffered, rotating file that `RichFileHandler` writes to.
+
+The writes only append to an in-memory buffer, that a background thread writes out
+every `flush_interval` seconds (or as soon as it holds `buffer_size` bytes). The file
+is rotated by size and / or at every midnight or hour, the rotated segments are
+gzip-compressed on a worker thread, and only the last `backup_count` are kept.
+Every sink is flushed and closed at the interpreter exit.
+
+Example usage:
+    ```python
+    from pathlib import Path
+    from file_sink import RotatingFileSink
+
+    sink = RotatingFileSink(Path("app.log"), max_bytes=10 * 1024 * 1024, when="midnight")
+    sink.write("Buffered, written out by the background thread.\\n")
+    sink.close()  # writes out the buffer, and closes the file
+    ```
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+import weakref
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Literal
+
+When = Literal["midnight", "hour"]
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+_sinks: "weakref.WeakSet[RotatingFileSink]" = weakref.WeakSet()
+# The rotated segments waiting for the compression thread
+_compressions: "queue.Queue[Path]" = queue.Queue()
+_compressor: threading.Thread | None = None
+_compressor_lock = threading.Lock()
+
+
+def _compress(path: Path) -> None:
+    """Gzips the rotated segment next to itself (`.gz`), and removes the original"""
+    import gzip
+    import shutil
+
+    try:
+        with open(path, "rb") as source, gzip.open(f"{path}.gz", "wb") as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+    except FileNotFoundError:  # already pruned
+        return
+    path.unlink(missing_ok=True)
+
+
+def _compress_forever() -> None:
+    while True:
+        path = _compressions.get()
+        try:
+            _compress(path)
+        except OSError:
+            pass  # left uncompressed
+        finally:
+            _compressions.task_done()
+
+
+def _start_compressor() -> None:
+    """Starts the compression thread, once. Started along with the first compressing sink,
+    since threads can't be started anymore while the interpreter shuts down"""
+    global _compressor
+
+    with _compressor_lock:
+        if _compressor is None:
+            _compressor = threading.Thread(
+                target=_compress_forever, name="log-gzip", daemon=True
+            )
+            _compressor.start()
+
+
+class RotatingFileSink:
+    """
+    A text file, written out in the background and rotated by size and / or time.
+
+    Args:
+        file (Path): The file path to log to.
+        buffer_size (int, optional): The bytes buffered before writing out right away.
+            Defaults to 64 KiB.
+        flush_interval (float, optional): The seconds between the background flushes.
+            Defaults to 1.0.
+        max_bytes (int | None, optional): The size to rotate at, `None` never rotates by
+            size. Defaults to 10 MiB.
+        when (Literal["midnight", "hour"] | None, optional): Rotates at every local
+            midnight / hour too. Defaults to None.
+        backup_count (int, optional): The rotated segments to keep. Defaults to 5.
+        compress (bool, optional): Whether to gzip the rotated segments. Defaults to True.
+    """
+
+    encoding = "utf-8"
+
+    def __init__(
+        self,
+        file: Path,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_bytes: int | None = DEFAULT_MAX_BYTES,
+        when: When | None = None,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+        compress: bool = True,
+    ) -> None:
+        self.path = Path(file)
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.when = when
+        self.backup_count = backup_count
+        self.compress = compress
+
+        self._lock = threading.Lock()
+        self._buffer = bytearray()
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+        self._rollover_at = self._next_rollover(time.time())
+        self._closed = False
+
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically, name="log-flush", daemon=True
+        )
+        self._flusher.start()
+        if compress:
+            _start_compressor()
+        _sinks.add(self)
+
+    def write(self, text: str) -> int:
+        self.write_bytes(text.encode(self.encoding))
+        return len(text)
+
+    def write_bytes(self, data: bytes) -> None:
+        """Buffers the already encoded `data`, for the sinks of the binary records"""
+        with self._lock:
+            self._buffer += data
+            if (
+                self._closed
+                or len(self._buffer) >= self.buffer_size
+                or self._rollover_due()
+            ):
+                self._write_out()
+
+    def flush(self) -> None:
+        """Does nothing, the buffer is written out by the background thread (see `sync`).
+        The consoles flush after every print, which would defeat the buffering"""
+
+    def sync(self) -> None:
+        """Writes the buffer out to the file now"""
+        with self._lock:
+            self._write_out()
+
+    def isatty(self) -> bool:
+        return False
+
+    def close(self) -> None:
+        """Writes the buffer out, stops the background thread and closes the file"""
+        self._stop.set()
+        with self._lock:
+            if self._closed:
+                return
+            self._write_out(rotate=False)
+            self._closed = True
+            self._file.close()
+
+    def _flush_periodically(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.sync()
+
+    def _next_rollover(self, now: float) -> float | None:
+        if self.when is None:
+            return None
+        local = datetime.fromtimestamp(now)
+        if self.when == "hour":
+            boundary = local.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        else:
+            boundary = datetime.combine(local.date() + timedelta(days=1), datetime.min.time())
+        return boundary.timestamp()
+
+    def _rollover_due(self) -> bool:
+        return self._size_due() or self._time_due()
+
+    def _size_due(self) -> bool:
+        return self.max_bytes is not None and self._size + len(self._buffer) >= self.max_bytes
+
+    def _time_due(self) -> bool:
+        return self._rollover_at is not None and time.time() >= self._rollover_at
+
+    def _write_out(self, rotate: bool = True) -> None:
+        """Writes the buffer to the file, rotating it when due (with the lock held).
+        The records of a new period go to a new segment, and a full segment is rotated
+        right after the write that filled it"""
+        if self._closed:  # written after the close (e.g. during the exit), unbuffered
+            with open(self.path, "ab") as file:
+                file.write(self._buffer)
+            self._buffer.clear()
+            return
+        if rotate and self._time_due():
+            if self._size:
+                self._rotate()
+            else:  # nothing to rotate, just wait for the next period
+                self._rollover_at = self._next_rollover(time.time())
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._file.flush()
+            self._size += len(self._buffer)
+            self._buffer.clear()
+        if rotate and self._size_due():
+            self._rotate()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        # Sorting the names sorts the segments by age
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        rotated = self.path.with_name(f"{self.path.name}.{stamp}")
+        while rotated.exists() or Path(f"{rotated}.gz").exists():  # the clock went back
+            rotated = self.path.with_name(f"{rotated.name}-1")
+        os.replace(self.path, rotated)
+
+        self._file = open(self.path, "ab")
+        self._size = 0
+        self._rollover_at = self._next_rollover(time.time())
+
+        if self.compress:
+            _compressions.put(rotated)
+        self._prune()
+
+    def _prune(self) -> None:
+        """Removes the oldest rotated segments, beyond `backup_count`"""
+        segments = self.path.parent.glob(f"{self.path.name}.*")
+        # A segment being compressed shows up twice (plain and `.gz`) for a moment
+        names = sorted({path.name.removesuffix(".gz") for path in segments})
+        for name in names[: max(len(names) - self.backup_count, 0)]:
+            self.path.with_name(name).unlink(missing_ok=True)
+            self.path.with_name(f"{name}.gz").unlink(missing_ok=True)
+
+
+def close_all_sinks() -> None:
+    """Flushes and closes every sink, then waits for the pending compressions.
+    Registered to run at the interpreter exit"""
+    for sink in list(_sinks):
+        sink.close()
+    if _compressor is not None:
+        _compressions.join()
+
+
+atexit.register(close_all_sinks)
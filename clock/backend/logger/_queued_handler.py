@@ -0,0 +1,173 @@
+"""
+Module: queued_handler
+
+This module provides the non-blocking logging pipeline used by
+`configure_present_loggers(..., queued=True)`.
+
+The producers (the loggers) only put the records on a bounded queue through a
+`QueuedHandler`, while a `BatchQueueListener` running on a background thread
+drains the queue in batches and hands them over to the real (Rich) handlers.
+So that the rendering of the markup, tracebacks and the terminal / disk I/O
+never happens on the calling thread.
+
+Example usage:
+    ```python
+    import logging
+    import queue
+    from custom_handler import RichConsoleHandler
+    from queued_handler import BatchQueueListener, QueuedHandler
+
+    records = queue.Queue(maxsize=10_000)
+    listener = BatchQueueListener(records, RichConsoleHandler(level=logging.DEBUG))
+    listener.start()
+
+    logger = logging.getLogger(__name__)
+    logger.addHandler(QueuedHandler(records, when_full="drop"))
+    logger.info("This is rendered on the listener's thread.")
+
+    listener.stop()  # flushes whatever is left in the queue
+    ```
+"""
+
+import copy
+import logging
+import queue
+from contextlib import ExitStack
+from logging.handlers import QueueHandler, QueueListener
+from typing import Literal, Sequence
+
+from clock.backend import metrics
+
+WhenFull = Literal["drop", "block"]
+
+DEFAULT_QUEUE_SIZE = 10_000
+DEFAULT_BATCH_SIZE = 256
+
+
+class QueuedHandler(QueueHandler):
+    """
+    A `QueueHandler` that puts the records on a bounded queue.
+
+    Args:
+        queue (queue.Queue): The queue shared with the `BatchQueueListener`.
+        when_full (Literal["drop", "block"], optional): Whether to drop the record or
+            to wait for a free slot, when the queue is full. Defaults to "drop".
+        handlers (Sequence[logging.Handler] | None, optional): The listener's handlers
+            the records go to, so that several sets of handlers can share one listener.
+            Defaults to None (every handler of the listener).
+    """
+
+    def __init__(
+        self,
+        queue: queue.Queue,
+        when_full: WhenFull = "drop",
+        handlers: Sequence[logging.Handler] | None = None,
+    ) -> None:
+        super().__init__(queue)
+        self.when_full: WhenFull = when_full
+        self.targets = tuple(handlers) if handlers is not None else None
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merges the message with its arguments, but keeps `exc_info` for the Rich tracebacks"""
+        if record.args:
+            record = copy.copy(record)
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        item = (record, self.targets)
+        if self.when_full == "block":
+            self.queue.put(item)
+            return
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchQueueListener(QueueListener):
+    """
+    A `QueueListener` that drains up to `batch_size` records at a time, and lets the
+    Rich handlers write each batch with a single write to their console. The queued items
+    are (record, handlers) pairs, see `QueuedHandler`, and more handlers can be added
+    while it runs.
+
+    Args:
+        queue (queue.Queue): The queue shared with the `QueuedHandler`.
+        *handlers (logging.Handler): The handlers doing the actual rendering and writing.
+        batch_size (int, optional): The maximum records handled per batch. Defaults to 256.
+    """
+
+    def __init__(
+        self,
+        queue: queue.Queue,
+        *handlers: logging.Handler,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        super().__init__(queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+
+    def add_handlers(self, *handlers: logging.Handler) -> None:
+        """Adds the handlers, swapping the tuple as a whole for the listener's thread"""
+        self.handlers = self.handlers + tuple(h for h in handlers if h not in self.handlers)
+
+    def handle(self, item: tuple[logging.LogRecord, tuple | None]) -> None:  # type: ignore
+        record, handlers = item
+        record = self.prepare(record)
+        for handler in self.handlers if handlers is None else handlers:
+            if not self.respect_handler_level or record.levelno >= handler.level:
+                handler.handle(record)
+
+    def enqueue_sentinel(self) -> None:
+        # Blocks, so that a full queue still gets flushed on `stop()`
+        self.queue.put(self._sentinel)
+
+    def _drain(self) -> tuple[list[tuple], bool]:
+        """Waits for a record, then takes whatever else is already queued (up to a batch)"""
+        records: list[tuple] = []
+        record = self.dequeue(True)
+        while True:
+            if record is self._sentinel:
+                return records, True
+            records.append(record)
+            if len(records) >= self.batch_size:
+                return records, False
+            try:
+                record = self.dequeue(False)
+            except queue.Empty:
+                return records, False
+
+    def _monitor(self) -> None:
+        has_task_done = hasattr(self.queue, "task_done")
+        stopping = False
+        while not stopping:
+            records, stopping = self._drain()
+            with ExitStack() as stack:
+                for handler in self.handlers:
+                    # Rich consoles buffer everything printed inside their context
+                    if console := getattr(handler, "console", None):
+                        stack.enter_context(console)
+                for record in records:
+                    self.handle(record)
+            for handler in self.handlers:
+                handler.flush()
+            if has_task_done:
+                for _ in range(len(records) + stopping):
+                    self.queue.task_done()
+
+
+for _owner, _name, _handler in (
+    (QueuedHandler, "emit", "queued"),  # on the logging thread
+    (BatchQueueListener, "handle", "listener"),  # the rendering, on the listener's thread
+):
+    metrics.instrument(
+        _owner,
+        _name,
+        metrics.Histogram(
+            "clock_log_emit_seconds",
+            "The duration of handling a log record",
+            {"handler": _handler},
+        ),
+    )
@@ -0,0 +1,219 @@
+"""
+Module: structured_handler
+
+This module provides a compact, structured alternative to the Rich rendering of the records.
+
+`StructuredFileHandler` writes every record as a line of JSON ("jsonl"), or as a
+length-prefixed binary record ("binary"), into the same buffered and rotating
+`RotatingFileSink` as `RichFileHandler`. The field names are encoded once, the
+timestamps are rendered once per second, and the logger names and paths once per name,
+so that a record costs little more than encoding its message. The files are turned back
+into the Rich output on demand, by the reader (`python -m clock.backend.logger.reader`).
+
+The binary record is laid out as (little-endian):
+
+    marker (B, 0xB1) | body length (I) | created (d) | levelno (H) | lineno (I)
+    | name | message | pathname | exc_text    (each: length (I) + UTF-8 bytes)
+
+Example usage:
+    ```python
+    import logging
+    from pathlib import Path
+    from structured_handler import StructuredFileHandler
+
+    logger = logging.getLogger(__name__)
+    logger.addHandler(StructuredFileHandler(level=logging.DEBUG, file=Path("app.jsonl")))
+
+    logger.info("This is written as a line of JSON.")
+    ```
+"""
+
+import logging
+import struct
+import time
+from pathlib import Path
+from typing import Literal
+
+from clock.backend import metrics
+from clock.backend.logger._file_sink import (
+    DEFAULT_BACKUP_COUNT,
+    DEFAULT_BUFFER_SIZE,
+    DEFAULT_FLUSH_INTERVAL,
+    DEFAULT_MAX_BYTES,
+    RotatingFileSink,
+    When,
+)
+
+Format = Literal["jsonl", "binary"]
+
+RECORD_MARKER = 0xB1
+HEADER = struct.Struct("<BI")  # marker, body length
+FIXED = struct.Struct("<dHI")  # created, levelno, lineno
+LENGTH = struct.Struct("<I")
+
+# The logger names and paths encoded so far, are forgotten past this many
+_MAX_CACHED = 1024
+
+
+class StructuredFileHandler(logging.Handler):
+    """
+    A handler writing the records as JSON lines or binary records, into a `RotatingFileSink`.
+
+    Args:
+        level (int | str, optional): The logging level. Defaults to logging.NOTSET.
+        file (Path, optional): The file path to log to. Defaults to Path("log.jsonl").
+        format (Literal["jsonl", "binary"], optional): The encoding of the records.
+            Defaults to "jsonl".
+        buffer_size (int, optional): The bytes buffered before writing out right away.
+            Defaults to 64 KiB.
+        flush_interval (float, optional): The seconds between the background flushes.
+            Defaults to 1.0.
+        max_bytes (int | None, optional): The size to rotate at, `None` never rotates by
+            size. Defaults to 10 MiB.
+        when (Literal["midnight", "hour"] | None, optional): Rotates at every local
+            midnight / hour too. Defaults to None.
+        backup_count (int, optional): The rotated segments to keep. Defaults to 5.
+        compress (bool, optional): Whether to gzip the rotated segments. Defaults to True.
+    """
+
+    def __init__(
+        self,
+        level: int | str = logging.NOTSET,
+        file: Path = Path("log.jsonl"),
+        format: Format = "jsonl",
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_bytes: int | None = DEFAULT_MAX_BYTES,
+        when: When | None = None,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+        compress: bool = True,
+    ) -> None:
+        if format not in ("jsonl", "binary"):
+            raise ValueError(f"format must be 'jsonl' or 'binary', got {format!r}")
+
+        # Imported here, so that importing the logger package stays cheap without this handler
+        from json.encoder import encode_basestring_ascii  # type: ignore
+
+        super().__init__(level)
+        self._quote = encode_basestring_ascii
+        self.format_name: Format = format
+        self.sink = RotatingFileSink(
+            file,
+            buffer_size=buffer_size,
+            flush_interval=flush_interval,
+            max_bytes=max_bytes,
+            when=when,
+            backup_count=backup_count,
+            compress=compress,
+        )
+        self._encode = self._encode_jsonl if format == "jsonl" else self._encode_binary
+        self._exception_formatter = logging.Formatter()
+
+        self._second = -1
+        self._stamp = ""
+        self._levels: dict[int, str] = {}
+        self._strings: dict[str, str] = {}  # JSON strings
+        self._blobs: dict[str, bytes] = {}  # length-prefixed UTF-8
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.sink.write_bytes(self._encode(record))
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        """Does nothing, the sink writes out in the background (see `sync`)"""
+
+    def sync(self) -> None:
+        """Writes the buffered records out to the file now"""
+        self.sink.sync()
+
+    def close(self) -> None:
+        self.sink.close()
+        super().close()
+
+    def _exc_text(self, record: logging.LogRecord) -> str:
+        """The traceback and stack of the record, formatted like `logging.Formatter` does"""
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self._exception_formatter.formatException(record.exc_info)
+        text = record.exc_text or ""
+        if record.stack_info:
+            text = f"{text}\n{record.stack_info}" if text else record.stack_info
+        return text
+
+    def _json_string(self, value: str) -> str:
+        """The JSON string of a logger name / path, encoded once"""
+        encoded = self._strings.get(value)
+        if encoded is None:
+            if len(self._strings) >= _MAX_CACHED:
+                self._strings.clear()
+            encoded = self._strings[value] = self._quote(value)
+        return encoded
+
+    def _level_field(self, record: logging.LogRecord) -> str:
+        field = self._levels.get(record.levelno)
+        if field is None:
+            field = self._levels[record.levelno] = (
+                f',"level":{self._quote(record.levelname)}'
+                f',"levelno":{record.levelno},"name":'
+            )
+        return field
+
+    def _encode_jsonl(self, record: logging.LogRecord) -> bytes:
+        created = record.created
+        second = int(created)
+        if second != self._second:  # the date and time are rendered once per second
+            self._second = second
+            self._stamp = time.strftime('{"time":"%Y-%m-%dT%H:%M:%S.', time.gmtime(second))
+        parts = [
+            self._stamp,
+            f'{int((created - second) * 1_000_000):06d}Z"',
+            self._level_field(record),
+            self._json_string(record.name),
+            ',"message":',
+            self._quote(record.getMessage()),
+            ',"pathname":',
+            self._json_string(record.pathname),
+            f',"lineno":{record.lineno}',
+        ]
+        if exc_text := self._exc_text(record):
+            parts += (',"exc_text":', self._quote(exc_text))
+        parts.append("}\n")
+        return "".join(parts).encode("ascii")
+
+    def _blob(self, value: str) -> bytes:
+        """The length-prefixed UTF-8 of a logger name / path, encoded once"""
+        blob = self._blobs.get(value)
+        if blob is None:
+            if len(self._blobs) >= _MAX_CACHED:
+                self._blobs.clear()
+            blob = self._blobs[value] = _length_prefixed(value)
+        return blob
+
+    def _encode_binary(self, record: logging.LogRecord) -> bytes:
+        body = b"".join(
+            (
+                FIXED.pack(record.created, min(record.levelno, 0xFFFF), record.lineno or 0),
+                self._blob(record.name),
+                _length_prefixed(record.getMessage()),
+                self._blob(record.pathname),
+                _length_prefixed(self._exc_text(record)),
+            )
+        )
+        return HEADER.pack(RECORD_MARKER, len(body)) + body
+
+
+def _length_prefixed(value: str) -> bytes:
+    data = value.encode("utf-8", "backslashreplace")
+    return LENGTH.pack(len(data)) + data
+
+
+metrics.instrument(
+    StructuredFileHandler,
+    "emit",
+    metrics.Histogram(
+        "clock_log_emit_seconds",
+        "The duration of handling a log record",
+        {"handler": "structured"},
+    ),
+)
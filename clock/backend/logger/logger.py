@@ -1,17 +1,34 @@
 """This module contains logging related things.
 And Mainly an base logger that can be used to derive child loggers"""
 
+from __future__ import annotations
+
+import atexit
 import logging
+import queue
+import threading
+from typing import TYPE_CHECKING
 
 from clock.backend.logger._custom_handler import (  # noqa: F401
     RichConsoleHandler,  # type: ignore
     RichFileHandler,  # type: ignore
 )
+from clock.backend.logger._structured_handler import StructuredFileHandler  # noqa: F401
+
+if TYPE_CHECKING:  # `logging.handlers` is only imported once queued logging is used
+    from clock.backend.logger._queued_handler import (
+        BatchQueueListener,
+        QueuedHandler,
+        WhenFull,
+    )
 
 app_logger: logging.Logger = logging.getLogger("clock")
 flet_logger: logging.Logger = logging.getLogger("flet")
 flet_core_logger: logging.Logger = logging.getLogger("flet_core")
 
+_listener: BatchQueueListener | None = None
+_listener_lock = threading.Lock()
+
 
 def _configure_handler(logger: logging.Logger, handler: list[logging.Handler]):
     """Just removes any default handler to given logger and adds the given handlers to it.
@@ -23,12 +40,59 @@ def _configure_handler(logger: logging.Logger, handler: list[logging.Handler]):
             logger.addHandler(hndlr)
 
 
+def _start_listener(
+    handlers: list[logging.Handler], queue_size: int | None, when_full: WhenFull
+) -> QueuedHandler:
+    """Hands the handlers over to the process-wide background listener (started on the
+    first call, with a queue of `queue_size`), and returns the handler feeding them. The
+    earlier handlers keep being fed by the same listener"""
+    global _listener
+    from clock.backend.logger._queued_handler import (
+        DEFAULT_QUEUE_SIZE,
+        BatchQueueListener,
+        QueuedHandler,
+    )
+
+    with _listener_lock:
+        if _listener is None:
+            records: queue.Queue = queue.Queue(maxsize=queue_size or DEFAULT_QUEUE_SIZE)
+            _listener = BatchQueueListener(records)
+            _listener.start()
+        _listener.add_handlers(*handlers)
+        return QueuedHandler(_listener.queue, when_full=when_full, handlers=handlers)
+
+
+def stop_queued_logging():
+    """Flushes the records left in the queue and stops the background listener, if any.
+    Registered to run at the interpreter exit"""
+    global _listener
+
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+atexit.register(stop_queued_logging)
+
+
 def configure_present_loggers(
     loggers: list[logging.Logger] | None = None,
     handlers: list[logging.Handler] | None = None,
+    queued: bool = False,
+    queue_size: int | None = None,
+    when_full: WhenFull = "drop",
 ):
-    """Just attaches the handlers to loggers"""
+    """Just attaches the handlers to loggers.
+
+    With `queued`, the loggers only put their records on a bounded queue (of `queue_size`,
+    by default `DEFAULT_QUEUE_SIZE`, sized by the first call)
+    and a background listener renders and writes them with the given handlers, in batches.
+    A single listener serves the whole process, every call adds its handlers to it.
+    `when_full` tells whether to "drop" the record or "block" the caller on a full queue"""
     if loggers:
         if handlers:
+            if queued:
+                handlers = [_start_listener(handlers, queue_size, when_full)]
             for logger in loggers:
                 _configure_handler(logger, handlers)
@@ -0,0 +1,127 @@
+"""
+Reads the files of `StructuredFileHandler` back, and renders them like `RichConsoleHandler`
+Usage:
+>>> python -m clock.backend.logger.reader app.jsonl
+>>> python -m clock.backend.logger.reader app.bin.* app.bin --level WARNING  # with the rotated
+>>> for record in read_records(Path("app.jsonl")): ...
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Iterator
+
+from clock.backend.logger._structured_handler import FIXED, HEADER, LENGTH, RECORD_MARKER
+
+
+def _make_record(
+    created: float,
+    levelno: int,
+    name: str,
+    message: str,
+    pathname: str,
+    lineno: int,
+    exc_text: str | None,
+) -> logging.LogRecord:
+    return logging.makeLogRecord(
+        {
+            "name": name,
+            "msg": message,
+            "args": None,
+            "levelno": levelno,
+            "levelname": logging.getLevelName(levelno),
+            "pathname": pathname,
+            "filename": os.path.basename(pathname),
+            "module": os.path.splitext(os.path.basename(pathname))[0],
+            "lineno": lineno,
+            "created": created,
+            "msecs": (created - int(created)) * 1000,
+            "exc_text": exc_text or None,
+        }
+    )
+
+
+def _read_jsonl(file: IO[bytes]) -> Iterator[logging.LogRecord]:
+    for line in file:
+        try:
+            fields = json.loads(line)
+        except ValueError:  # the torn last line of a crashed process
+            print(f"Skipping an unreadable line: {line[:80]!r}", file=sys.stderr)
+            continue
+        yield _make_record(
+            datetime.fromisoformat(fields["time"]).timestamp(),
+            fields["levelno"],
+            fields["name"],
+            fields["message"],
+            fields["pathname"],
+            fields["lineno"],
+            fields.get("exc_text"),
+        )
+
+
+def _read_binary(file: IO[bytes]) -> Iterator[logging.LogRecord]:
+    while header := file.read(HEADER.size):
+        if len(header) < HEADER.size:
+            print("Skipping a truncated record at the end", file=sys.stderr)
+            return
+        marker, length = HEADER.unpack(header)
+        if marker != RECORD_MARKER:
+            raise ValueError(f"Not a structured log record, at byte {file.tell() - HEADER.size}")
+        body = file.read(length)
+        if len(body) < length:
+            print("Skipping a truncated record at the end", file=sys.stderr)
+            return
+
+        created, levelno, lineno = FIXED.unpack_from(body)
+        offset = FIXED.size
+        strings = []
+        for _ in range(4):  # name, message, pathname, exc_text
+            (size,) = LENGTH.unpack_from(body, offset)
+            offset += LENGTH.size
+            strings.append(body[offset : offset + size].decode("utf-8", "replace"))
+            offset += size
+        name, message, pathname, exc_text = strings
+        yield _make_record(created, levelno, name, message, pathname, lineno, exc_text)
+
+
+def read_records(path: Path) -> Iterator[logging.LogRecord]:
+    """Yields the records of a JSON lines or binary log file (gzipped or not), in order"""
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as file:  # type: ignore
+        first = file.peek(1)[:1] if hasattr(file, "peek") else b""
+        if first == bytes([RECORD_MARKER]):
+            yield from _read_binary(file)
+        else:
+            yield from _read_jsonl(file)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m clock.backend.logger.reader",
+        description="Renders the structured log files with Rich. The rotated segments "
+        "(sorted by name) come before the current file.",
+    )
+    parser.add_argument("files", nargs="+", type=Path)
+    parser.add_argument("--level", default="NOTSET", help="the lowest level shown")
+    args = parser.parse_args(argv)
+
+    from clock.backend.logger._custom_handler import RichConsoleHandler
+
+    handler = RichConsoleHandler(level=args.level.upper())
+    try:
+        for path in args.files:
+            for record in read_records(path):
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+    except BrokenPipeError:  # piped into `head` and the likes
+        sys.stderr.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
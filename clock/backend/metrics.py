@@ -0,0 +1,299 @@
+"""
+Contains the hot-path instrumentation: fixed-bucket histograms and counters, a snapshot of
+them, and their Prometheus text format (optionally served on a local port)
+Usage:
+>>> metrics.enable()
+>>> metrics.snapshot()["clock_tick_lateness_seconds"].quantile(0.99)
+>>> print(metrics.render())  # the Prometheus text format
+>>> metrics.serve(port=9464)  # GET http://127.0.0.1:9464/metrics
+
+Everything is off by default. The timed methods are registered with `instrument`, and only
+swapped for their timing wrappers by `enable()` (and back by `disable()`), so that turned
+off they cost nothing at all. The inline observations (e.g. of the `Ticker`) check
+`metrics.enabled` first.
+
+As the class attributes are swapped, a bound method taken before `enable()` (e.g. handed
+over as a callback) keeps calling the untimed function. The callbacks of the instrumented
+methods are looked up on every call instead (see `ClockService._run`, `Subscription`).
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Iterable, NamedTuple
+
+# Seconds, from 10µs (a `DateTime` call) up to 1s (a tick missed altogether)
+DEFAULT_BUCKETS = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+enabled = False
+_metrics: list["Histogram | Counter"] = []
+# (owner, name, histogram, the owner's own attribute if any)
+_instrumented: list[tuple[Any, str, "Histogram", Any]] = []
+_lock = threading.Lock()
+
+
+def _labels_text(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels.items():
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class HistogramSnapshot(NamedTuple):
+    """The counts of a histogram at one moment, per bucket (not cumulative, the last is +Inf)"""
+
+    bounds: tuple[float, ...]
+    counts: tuple[int, ...]
+    count: int
+    sum: float
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimates the `q` quantile, interpolating within its bucket (like Prometheus'
+        `histogram_quantile`). Falls in the +Inf bucket as the highest bound"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(self.bounds):
+                    return self.bounds[-1]
+                low = self.bounds[index - 1] if index else 0.0
+                return low + (self.bounds[index] - low) * (rank - seen) / count
+            seen += count
+        return self.bounds[-1]
+
+
+class Histogram:
+    """Counts the observed values (in seconds) in fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: dict[str, str] | None = None,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels or {}
+        self.bounds = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self.reset()
+        with _lock:
+            _metrics.append(self)
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}{_labels_text(self.labels)}"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * (len(self.bounds) + 1)
+            self._sum = 0.0
+            self._count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> HistogramSnapshot:
+        with self._lock:
+            return HistogramSnapshot(self.bounds, tuple(self._counts), self._count, self._sum)
+
+    def samples(self) -> Iterable[str]:
+        snapshot = self.snapshot()
+        cumulative = 0
+        for bound, count in zip((*self.bounds, "+Inf"), snapshot.counts):
+            cumulative += count
+            labels = _labels_text({**self.labels, "le": str(bound)})
+            yield f"{self.name}_bucket{labels} {cumulative}"
+        labels = _labels_text(self.labels)
+        yield f"{self.name}_sum{labels} {snapshot.sum!r}"
+        yield f"{self.name}_count{labels} {snapshot.count}"
+
+
+class Counter:
+    """Counts the occurrences of something"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: dict[str, str] | None = None) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels or {}
+        self._lock = threading.Lock()
+        self.value = 0
+        with _lock:
+            _metrics.append(self)
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}{_labels_text(self.labels)}"
+
+    def reset(self) -> None:
+        with self._lock:
+            self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def samples(self) -> Iterable[str]:
+        yield f"{self.name}{_labels_text(self.labels)} {self.value}"
+
+
+def _timed(function: Callable, histogram: Histogram) -> Callable:
+    """Wraps the function (or coroutine function), observing its duration"""
+    import functools
+    import inspect
+
+    perf_counter = time.perf_counter
+    observe = histogram.observe
+
+    if inspect.iscoroutinefunction(function):
+
+        @functools.wraps(function)
+        async def timed_async(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return await function(*args, **kwargs)
+            finally:
+                observe(perf_counter() - start)
+
+        return timed_async
+
+    @functools.wraps(function)
+    def timed(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            observe(perf_counter() - start)
+
+    return timed
+
+
+def _patch(owner: Any, name: str, histogram: Histogram) -> Any:
+    own = owner.__dict__.get(name)
+    setattr(owner, name, _timed(getattr(owner, name), histogram))
+    return own
+
+
+def instrument(owner: Any, name: str, histogram: Histogram) -> None:
+    """Times every call of the method `owner.name` into the histogram, while enabled. Only
+    the calls looking the method up after `enable()` are timed, not the bound methods
+    taken before"""
+    with _lock:
+        own = _patch(owner, name, histogram) if enabled else owner.__dict__.get(name)
+        _instrumented.append((owner, name, histogram, own))
+
+
+def enable() -> None:
+    """Turns the instrumentation on"""
+    global enabled
+
+    with _lock:
+        if enabled:
+            return
+        enabled = True
+        for owner, name, histogram, _ in _instrumented:
+            _patch(owner, name, histogram)
+
+
+def disable() -> None:
+    """Turns the instrumentation off, the values observed so far are kept"""
+    global enabled
+
+    with _lock:
+        if not enabled:
+            return
+        enabled = False
+        for owner, name, _, own in reversed(_instrumented):
+            if own is None:  # it was inherited
+                delattr(owner, name)
+            else:
+                setattr(owner, name, own)
+
+
+def reset() -> None:
+    """Forgets every observed value"""
+    for metric in list(_metrics):
+        metric.reset()
+
+
+def snapshot() -> dict[str, HistogramSnapshot | int]:
+    """Returns the current values, keyed by the metric name (with its labels)"""
+    return {
+        metric.key: metric.snapshot() if isinstance(metric, Histogram) else metric.value
+        for metric in list(_metrics)
+    }
+
+
+def render() -> str:
+    """Returns every metric in the Prometheus text exposition format"""
+    families: dict[str, list[Histogram | Counter]] = {}
+    for metric in list(_metrics):
+        families.setdefault(metric.name, []).append(metric)
+
+    lines = []
+    for name, family in families.items():
+        lines.append(f"# HELP {name} {family[0].help}")
+        lines.append(f"# TYPE {name} {family[0].kind}")
+        for metric in family:
+            lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+def serve(host: str = "127.0.0.1", port: int = 9464) -> Any:
+    """Serves `render()` on `GET /metrics`, from a background thread. Returns the server"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass  # a scrape every few seconds is not worth a log line
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
@@ -0,0 +1,365 @@
+"""
+Contains the compiled parsers of Arrow-style formats, for ingesting whole columns (or
+streams) of timestamps
+
+`arrow.get(string, format)` builds a parser, an `Arrow` and a `datetime` for every row.
+This module compiles a format once into a `ParsePlan` (the very same regular expression
+`arrow.get` matches with, and a converter per token), keeps the plans in a bounded LRU cache
+keyed by the format and the locale, and turns every match straight into integer fields and
+an epoch, resolving the time zone through the cached `ZoneOffset`.
+
+Usage:
+>>> parse_many(["14 Nov, 2023 10:13:20 PM"], "DD MMM, YYYY hh:mm:ss A", tz=tz.UTC)
+[1700000000]
+>>> for epoch in iter_parse(open("app.log"), "YYYY-MM-DD HH:mm:ss", errors="skip"): ...
+>>> parse_array(lines, "YYYY-MM-DD HH:mm:ss.SSS", unit="ms")  # an int64 NumPy array
+>>> parse_many(lines, "hh:mm:ss A", into="time")  # `TimeData`, no time zone involved
+"""
+
+from datetime import datetime, tzinfo
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Literal
+
+from arrow.constants import DEFAULT_LOCALE
+from arrow.parser import DateTimeParser, ParserMatchError
+from dateutil import tz as dateutil_tz
+
+from clock.backend._calendar import (
+    MICROSECONDS_PER_DAY,
+    MONTH_DAYS,
+    SECONDS_PER_DAY,
+    civil_from_days,
+    days_from_civil,
+)
+from clock.backend.api import DateData, time_data_of_day
+from clock.backend.bulk import UNITS, Unit, require_numpy
+from clock.backend.formatter import PLAN_CACHE_SIZE
+from clock.backend.logger import app_logger
+from clock.backend.zone import ZoneOffset
+
+if TYPE_CHECKING:
+    import numpy as np
+
+Into = Literal["epoch", "time", "date"]
+Errors = Literal["raise", "skip"]
+
+# The slots of the parsed fields
+_YEAR, _MONTH, _DAY, _HOUR, _MINUTE, _SECOND, _MICROSECOND, _MERIDIAN, _OFFSET = range(9)
+# Same defaults as `arrow.get`, a format with no date is on 0001-01-01
+_DEFAULTS = (1, 1, 1, 0, 0, 0, 0, None, None)
+# The tokens ignored by `arrow.get` when the date is given by the other tokens
+_IGNORED_TOKENS = frozenset(("d",))
+_DAY_OF_WEEK_TOKENS = frozenset(("dddd", "ddd"))
+
+logger = app_logger.getChild("parser")
+
+Converter = tuple[str, int, Callable[[str], Any]]
+
+
+def _two_digit_year(value: str) -> int:
+    year = int(value)
+    return 1900 + year if year > 68 else 2000 + year
+
+
+def _microseconds(value: str) -> int:
+    """The six most significant digits of the fraction, rounded half to even like `arrow.get`"""
+    value = value.ljust(7, "0")
+    seventh = int(value[6])
+    if seventh == 5:
+        rounding = int(value[5]) % 2
+    else:
+        rounding = seventh > 5
+    return int(value[:6]) + rounding
+
+
+def _utc_offset(value: str) -> int:
+    """The seconds east of UTC of "Z", "+05:30", "-0800" or "+01" """
+    if value in ("Z", "z"):
+        return 0
+    sign = -1 if value[0] == "-" else 1
+    digits = value[1:].replace(":", "")
+    return sign * (int(digits[:2]) * 3600 + int(digits[2:4] or 0) * 60)
+
+
+def _token_converter(token: str, arrow_parser: DateTimeParser) -> Converter | None:
+    """Returns the (group, slot, converter) of a token, `None` for the tokens with no fast path"""
+    locale = arrow_parser.locale
+    match token:
+        case "YYYY":
+            return (token, _YEAR, int)
+        case "YY":
+            return (token, _YEAR, _two_digit_year)
+        case "MMMM" | "MMM":
+            return (token, _MONTH, lambda value: locale.month_number(value.lower()))
+        case "MM" | "M":
+            return (token, _MONTH, int)
+        case "DD" | "D":
+            return (token, _DAY, int)
+        case "Do":
+            return ("value", _DAY, int)
+        case "HH" | "H" | "hh" | "h":
+            return (token, _HOUR, int)
+        case "mm" | "m":
+            return (token, _MINUTE, int)
+        case "ss" | "s":
+            return (token, _SECOND, int)
+        case "S":
+            return (token, _MICROSECOND, _microseconds)
+        case "a" | "A":
+            meridians = {
+                locale.meridians["am"]: "am",
+                locale.meridians["AM"]: "am",
+                locale.meridians["pm"]: "pm",
+                locale.meridians["PM"]: "pm",
+            }
+            return (token, _MERIDIAN, meridians.get)
+        case "ZZ" | "Z":
+            return (token, _OFFSET, _utc_offset)
+        case _:
+            return None
+
+
+class ParsePlan:
+    """A format string, compiled once into its regular expression and token converters.
+
+    The tokens `arrow.get` resolves through other means (timestamps, time zone names, ISO
+    weeks, days of the year, or a weekday with no day) are parsed by Arrow's own token
+    parser, row by row, and are then converted the same way"""
+
+    __slots__ = ("format", "locale", "tokens", "_pattern", "_converters", "_arrow_parser")
+
+    def __init__(self, format: str, locale: str = DEFAULT_LOCALE) -> None:
+        self.format = format
+        self.locale = locale
+
+        arrow_parser = DateTimeParser(locale)
+        tokens, self._pattern = arrow_parser._generate_pattern_re(format)
+        self.tokens: tuple[str, ...] = tuple(tokens)
+
+        converters = []
+        fast = True
+        for token in self.tokens:
+            if token in _IGNORED_TOKENS:
+                continue
+            if token in _DAY_OF_WEEK_TOKENS:
+                # Only a day of week with no day moves the date, like `arrow.get`
+                if not {"DD", "D", "Do"} & set(self.tokens):
+                    fast = False
+                continue
+            converter = _token_converter(token, arrow_parser)
+            if converter is None:
+                fast = False
+            converters.append(converter)
+        self._converters: tuple[Converter, ...] | None = tuple(converters) if fast else None  # type: ignore
+        self._arrow_parser = arrow_parser
+
+    @property
+    def vectorized(self) -> bool:
+        """Whether every token has a fast path (no `datetime` is built for the rows)"""
+        return self._converters is not None
+
+    def _match(self, string: str):
+        match = self._pattern.search(string)
+        if match is None:
+            raise ParserMatchError(f"Failed to match {self.format!r} when parsing {string!r}.")
+        return match
+
+    def local(self, string: str) -> tuple[int, int | None]:
+        """Parses a string into its wall time (in microseconds since the epoch, as if it was
+        UTC) and its UTC offset in seconds (`None` when the string has none).
+
+        Raises `ParserMatchError` when the format does not match, and `ValueError` for
+        out of range fields (e.g. the 31st of February), like `arrow.get`"""
+        if self._converters is None:
+            return self._local_from_arrow(string)
+
+        group = self._match(string).group
+        fields = list(_DEFAULTS)
+        for name, slot, convert in self._converters:
+            fields[slot] = convert(group(name))
+        year, month, day, hour, minute, second, microsecond, meridian, offset = fields
+
+        if meridian == "pm" and hour < 12:
+            hour += 12
+        elif meridian == "am":
+            if hour > 12:
+                raise ParserMatchError(
+                    f"Hour token value must be between 0 and 12 inclusive, got {hour}."
+                )
+            if hour == 12:
+                hour = 0
+
+        carry = 0  # 24:00:00 is the next midnight, a rounded up fraction the next second
+        if hour == 24:
+            if minute or second or microsecond:
+                raise ValueError("Midnight at the end of day must not contain minutes or seconds")
+            hour, carry = 0, SECONDS_PER_DAY
+        if microsecond == 1_000_000:
+            microsecond, carry = 0, carry + 1
+
+        if not 1 <= month <= 12:
+            raise ValueError(f"month must be in 1..12, got {month} in {string!r}")
+        last = MONTH_DAYS[month]
+        if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+            last = 29
+        if not 1 <= year <= 9999 or not 1 <= day <= last:
+            raise ValueError(f"day is out of range for month, in {string!r}")
+        if hour > 23 or minute > 59 or second > 59:
+            raise ValueError(f"time is out of range, in {string!r}")
+
+        seconds = (
+            days_from_civil(year, month, day) * SECONDS_PER_DAY
+            + hour * 3600
+            + minute * 60
+            + second
+            + carry
+        )
+        return seconds * 1_000_000 + microsecond, offset
+
+    def _local_from_arrow(self, string: str) -> tuple[int, int | None]:
+        """The slow path, through Arrow's token parser and a `datetime`"""
+        match = self._match(string)
+        arrow_parser = self._arrow_parser
+        parts: dict = {}
+        for token in self.tokens:
+            if token == "Do":
+                value: Any = match.group("value")
+            elif token == "W":
+                value = (match.group("year"), match.group("week"), match.group("day"))
+            else:
+                value = match.group(token)
+            arrow_parser._parse_token(token, value, parts)  # type: ignore
+        dt: datetime = arrow_parser._build_datetime(parts)  # type: ignore
+
+        offset = dt.utcoffset()
+        seconds = days_from_civil(dt.year, dt.month, dt.day) * SECONDS_PER_DAY + (
+            dt.hour * 3600 + dt.minute * 60 + dt.second
+        )
+        return (
+            seconds * 1_000_000 + dt.microsecond,
+            None if offset is None else int(offset.total_seconds()),
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(format={self.format!r}, locale={self.locale!r})"
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def compile_parser(format: str, locale: str = DEFAULT_LOCALE) -> ParsePlan:
+    """Returns the (cached) `ParsePlan` for the given format and locale"""
+    return ParsePlan(format, locale)
+
+
+def _epochs(
+    plan: ParsePlan, strings: Iterable[str], tz: tzinfo, unit: Unit, errors: Errors
+) -> Iterator[int]:
+    zone = ZoneOffset(tz)
+    scale = UNITS[unit]
+    skipped = 0
+    for string in strings:
+        try:
+            local, offset = plan.local(string)
+            seconds, microsecond = divmod(local, 1_000_000)
+            if offset is None:  # a wall time of the time zone
+                seconds = zone.epoch_of(seconds)
+            else:
+                seconds -= offset
+        except (ValueError, OverflowError):  # `ParserMatchError` too
+            if errors == "raise":
+                raise
+            skipped += 1
+            continue
+        yield seconds * scale + microsecond * scale // 1_000_000
+    if skipped:
+        logger.info(f"[parser] Skipped {skipped} string(s) not matching {plan.format!r}")
+
+
+def _data(plan: ParsePlan, strings: Iterable[str], into: Into, errors: Errors) -> Iterator[Any]:
+    """The `TimeData` / `DateData` of the wall times, as written. The same object is yielded
+    again for the consecutive rows with the same fields"""
+    last_key = data = None
+    skipped = 0
+    for string in strings:
+        try:
+            local, _ = plan.local(string)
+        except ValueError:
+            if errors == "raise":
+                raise
+            skipped += 1
+            continue
+        days, day_time = divmod(local, MICROSECONDS_PER_DAY)
+        key = day_time if into == "time" else days
+        if key != last_key:
+            data = time_data_of_day(day_time) if into == "time" else DateData(*civil_from_days(days))
+            last_key = key
+        yield data
+    if skipped:
+        logger.info(f"[parser] Skipped {skipped} string(s) not matching {plan.format!r}")
+
+
+def iter_parse(
+    strings: Iterable[str],
+    format: str,
+    tz: tzinfo | None = None,
+    unit: Unit = "s",
+    locale: str = DEFAULT_LOCALE,
+    into: Into = "epoch",
+    errors: Errors = "raise",
+) -> Iterator[Any]:
+    """
+    Lazily parses a stream of strings (e.g. the lines of an open file) with an Arrow-style
+    format, searching for the timestamp within each string like `arrow.get` does.
+
+    Args:
+        strings (Iterable[str]): The strings, consumed one at a time.
+        format (str): The Arrow-style format string.
+        tz (tzinfo | None, optional): The time zone of the strings with no UTC offset.
+            Defaults to the local one.
+        unit (Literal["s", "ms", "us", "ns"], optional): The unit of the epochs. Defaults to "s".
+        locale (str, optional): The Arrow locale. Defaults to "en-us".
+        into (Literal["epoch", "time", "date"], optional): Yields the epochs, or the
+            `TimeData` / `DateData` of the wall times as written. Defaults to "epoch".
+        errors (Literal["raise", "skip"], optional): Whether the strings that do not parse
+            raise (`ParserMatchError` / `ValueError`), or are left out. Defaults to "raise".
+
+    Returns:
+        Iterator[int | TimeData | DateData]: The parsed values, in order.
+    """
+    if into not in ("epoch", "time", "date"):
+        raise ValueError(f"into must be 'epoch', 'time' or 'date', got {into!r}")
+    if errors not in ("raise", "skip"):
+        raise ValueError(f"errors must be 'raise' or 'skip', got {errors!r}")
+
+    plan = compile_parser(format, locale)
+    logger.debug(f"[parser] Parsing with {plan} (vectorized: {plan.vectorized})")
+    if into == "epoch":
+        return _epochs(plan, strings, tz or dateutil_tz.tzlocal(), unit, errors)
+    return _data(plan, strings, into, errors)
+
+
+def parse_many(
+    strings: Iterable[str],
+    format: str,
+    tz: tzinfo | None = None,
+    unit: Unit = "s",
+    locale: str = DEFAULT_LOCALE,
+    into: Into = "epoch",
+    errors: Errors = "raise",
+) -> list[Any]:
+    """Parses a list (or any iterable) of strings at once, refer to `iter_parse`"""
+    return list(iter_parse(strings, format, tz, unit, locale, into, errors))
+
+
+def parse_array(
+    strings: Iterable[str],
+    format: str,
+    tz: tzinfo | None = None,
+    unit: Unit = "s",
+    locale: str = DEFAULT_LOCALE,
+    errors: Errors = "raise",
+) -> "np.ndarray":
+    """Parses the strings into an int64 NumPy array of epochs, refer to `iter_parse`.
+    Needs `numpy`, the counterpart of `clock.backend.bulk.format_many`"""
+    np = require_numpy()
+    epochs = iter_parse(strings, format, tz, unit, locale, "epoch", errors)
+    return np.fromiter(epochs, dtype=np.int64)
@@ -0,0 +1,190 @@
+"""
+Contains the incremental renderer, that only reformats the parts of the time / date strings
+whose fields changed since the last tick
+Usage:
+>>> renderer = IncrementalRenderer(DateTime(), "hh:mm:ss A", "DD MMM, YYYY")
+>>> changes = renderer.tick()
+>>> changes.time  # `None` when the time string did not change
+"""
+
+from datetime import datetime
+from enum import IntFlag
+from typing import Callable, Literal, NamedTuple
+
+from arrow import Arrow
+from arrow.constants import DEFAULT_LOCALE
+
+from clock.backend.api import DateTime
+from clock.backend.formatter import FormatPlan, compile_format
+from clock.backend.logger import app_logger
+
+
+class Change(IntFlag):
+    """The fields of an instant, that can change from one tick to the next"""
+
+    NONE = 0
+    SUB_SECOND = 1 << 0
+    SECOND = 1 << 1
+    MINUTE = 1 << 2
+    HOUR = 1 << 3
+    SESSION = 1 << 4
+    DAY = 1 << 5
+    MONTH = 1 << 6
+    YEAR = 1 << 7
+    OFFSET = 1 << 8  # the UTC offset (a DST transition)
+    ALL = (1 << 9) - 1
+
+
+# Plain ints, for `IncrementalRenderer._changes`
+_SUB_SECOND = int(Change.SUB_SECOND)
+_SECOND = int(Change.SECOND)
+_MINUTE = int(Change.MINUTE)
+_HOUR = int(Change.HOUR)
+_SESSION = int(Change.SESSION)
+_DAY = int(Change.DAY)
+_MONTH = int(Change.MONTH)
+_YEAR = int(Change.YEAR)
+_ALL = int(Change.ALL)
+_OFFSET = int(Change.OFFSET)
+
+# The fields each token is rendered from, the unknown tokens are re-rendered on any change
+_TOKEN_FIELDS: dict[str, Change] = {
+    **dict.fromkeys(["YYYY", "YY"], Change.YEAR),
+    **dict.fromkeys(["MMMM", "MMM", "MM", "M"], Change.MONTH),
+    **dict.fromkeys(["DDDD", "DDD", "DD", "D", "Do", "dddd", "ddd", "d", "W"], Change.DAY),
+    **dict.fromkeys(["HH", "H", "hh", "h"], Change.HOUR),
+    **dict.fromkeys(["a", "A"], Change.SESSION),
+    **dict.fromkeys(["mm", "m"], Change.MINUTE),
+    **dict.fromkeys(["ss", "s"], Change.SECOND),
+    **dict.fromkeys([f"S{'S' * i}" for i in range(6)], Change.SUB_SECOND),
+    **dict.fromkeys(["ZZZ", "ZZ", "Z"], Change.OFFSET),
+}
+
+
+# What a clock front end shows, and the order of its lines
+Show = Literal["time", "date", "datetime", "timedate"]
+SHOW_LINES: dict[Show, tuple[str, ...]] = {
+    "time": ("time",),
+    "date": ("date",),
+    "datetime": ("date", "time"),
+    "timedate": ("time", "date"),
+}
+# The frame rates (Hz) of the sub-second display of the app, from a tenth to a sixtieth
+SUB_SECOND_RATES = (10.0, 60.0)
+
+
+class ChangeSet(NamedTuple):
+    """What changed since the last tick, the strings are `None` when they did not change"""
+
+    fields: Change
+    time: str | None
+    date: str | None
+
+
+class _IncrementalPlan:
+    """Keeps the last rendered parts of a `FormatPlan`, to re-render only the stale ones"""
+
+    __slots__ = ("plan", "masks", "mask", "cache", "renderers")
+
+    def __init__(self, plan: FormatPlan) -> None:
+        self.plan = plan
+        # Plain ints, the `IntFlag` operators are too slow for the tick path
+        self.masks: tuple[int, ...] = tuple(
+            0 if token is None else int(_TOKEN_FIELDS.get(token, Change.ALL))
+            for token in plan.tokens
+        )
+        self.mask = 0
+        for mask in self.masks:
+            self.mask |= mask
+        self.cache: list[str] = [
+            part if isinstance(part, str) else "" for part in plan.parts
+        ]
+        # (index, mask, renderer) of the tokens, the literals are never re-rendered
+        self.renderers: tuple[tuple[int, int, Callable[[datetime], str]], ...] = tuple(
+            (index, mask, plan.parts[index])  # type: ignore
+            for index, mask in enumerate(self.masks)
+            if mask
+        )
+
+    def render(self, dt: datetime, changed: int) -> str | None:
+        """Returns the re-rendered string, or `None` if none of its fields changed"""
+        if not changed & self.mask:
+            return None
+
+        cache = self.cache
+        for index, mask, renderer in self.renderers:
+            if mask & changed:
+                cache[index] = renderer(dt)
+        return "".join(cache)
+
+
+class IncrementalRenderer:
+    """Renders the time and date strings of every tick, reformatting only the changed fields"""
+
+    logger = app_logger.getChild("renderer")
+
+    def __init__(
+        self,
+        date_time: DateTime,
+        time_format: str = "hh:mm:ss A",
+        date_format: str = "DD MMM, YYYY",
+        locale: str = DEFAULT_LOCALE,
+    ) -> None:
+        self.class_name = f"[{self.__class__.__name__}]"
+        self.date_time = date_time
+        self._time = _IncrementalPlan(compile_format(time_format, locale))
+        self._date = _IncrementalPlan(compile_format(date_format, locale))
+        self._last: datetime | None = None
+        # The UTC offset is only looked up when a format shows it (or has unknown tokens)
+        self._watch_offset = bool((self._time.mask | self._date.mask) & _OFFSET)
+
+        self.logger.info(
+            f"{self.class_name} Rendering {time_format!r} and {date_format!r} incrementally"
+        )
+
+    def reset(self) -> None:
+        """Forgets the last instant, so that the next tick renders everything"""
+        self._last = None
+
+    def _changes(self, dt: datetime) -> int:
+        """Compares the instant's fields with the last instant's, field by field (no tuple
+        of them is built on the tick path)"""
+        last, self._last = self._last, dt
+        if last is None:
+            return _ALL
+
+        changed = 0
+        if dt.microsecond != last.microsecond:
+            changed = _SUB_SECOND
+        if dt.second != last.second:
+            changed |= _SECOND
+        if dt.minute != last.minute:
+            changed |= _MINUTE
+        if dt.hour != last.hour:
+            changed |= _HOUR if dt.hour // 12 == last.hour // 12 else _HOUR | _SESSION
+        if dt.day != last.day:
+            changed |= _DAY
+        if dt.month != last.month:
+            changed |= _MONTH
+        if dt.year != last.year:
+            changed |= _YEAR
+        if self._watch_offset and dt.utcoffset() != last.utcoffset():
+            changed = _ALL
+        return changed
+
+    def tick(self, instant: Arrow | datetime | float | None = None) -> ChangeSet:
+        """Reads the clock once (or takes the given instant, or epoch seconds) and returns
+        what changed"""
+        if instant is None:
+            dt = self.date_time.now()
+        elif isinstance(instant, datetime):
+            dt = instant
+        else:
+            dt = self.date_time.as_datetime(instant)
+
+        changed = self._changes(dt)
+        return ChangeSet(
+            fields=Change(changed),
+            time=self._time.render(dt, changed),
+            date=self._date.render(dt, changed),
+        )
@@ -0,0 +1,348 @@
+"""
+Contains the alarms, timers and stopwatches: a heap of due instants, woken up only for the
+earliest one (no polling on every tick)
+Usage:
+>>> scheduler = Scheduler(DateTime(gettz("Asia/Kolkata")))
+>>> scheduler.start()  # inside a running event loop
+>>> scheduler.alarm(time(6, 30), ring, weekdays=WEEKDAYS)  # every weekday at 06:30 local time
+>>> scheduler.alarm_at(1_800_000_000, ring)  # once, at an epoch (or an aware `datetime`)
+>>> job = scheduler.timer(25 * 60, ring)  # a countdown, `job.remaining()` seconds left
+>>> job.cancel()
+>>> stopwatch = Stopwatch().start()
+>>> stopwatch.lap()
+"""
+
+import asyncio
+import heapq
+import inspect
+import itertools
+import threading
+import time as _time
+from datetime import datetime, time, tzinfo
+from typing import Any, Awaitable, Callable, Iterable
+
+from clock.backend import metrics
+from clock.backend._calendar import SECONDS_PER_DAY
+from clock.backend.api import LOCAL_TZ, DateTime
+from clock.backend.logger import app_logger
+from clock.backend.zone import ZoneOffset
+
+JobCallback = Callable[["Job"], Awaitable[Any] | Any]
+
+WEEKDAYS = frozenset(range(5))  # Monday to Friday, as `date.weekday()`
+WEEKEND = frozenset((5, 6))
+# The longest sleep, after which the clock source is read again (the wall clock may have
+# been stepped meanwhile)
+MAX_SLEEP = 60.0
+
+_LATENESS = metrics.Histogram(
+    "clock_scheduler_lateness_seconds", "How late the alarms and timers fired, after their due"
+)
+
+
+class Recurrence:
+    """A local time of day, on every day or on some weekdays, in a time zone"""
+
+    __slots__ = ("at", "zone", "weekdays", "_seconds")
+
+    def __init__(
+        self, at: time, zone: ZoneOffset, weekdays: Iterable[int] | None = None
+    ) -> None:
+        self.at = at.replace(tzinfo=None)
+        self.zone = zone
+        self.weekdays = frozenset(weekdays) if weekdays is not None else None
+        if self.weekdays is not None and not self.weekdays <= set(range(7)):
+            raise ValueError(f"weekdays must be within 0 (Monday) to 6, got {weekdays!r}")
+        if self.weekdays == frozenset():
+            raise ValueError("weekdays must not be empty")
+        self._seconds = at.hour * 3600 + at.minute * 60 + at.second
+
+    @property
+    def tz(self) -> tzinfo:
+        return self.zone.tz
+
+    def next_after(self, epoch: float) -> float:
+        """Returns the first occurrence strictly after the epoch (in seconds)"""
+        seconds = int(epoch // 1)
+        days = (seconds + self.zone.at(seconds)) // SECONDS_PER_DAY
+        for _ in range(9):  # a week, plus the day before / after of the DST shifts
+            # 1970-01-01 (day 0) was a Thursday
+            if self.weekdays is None or (days + 3) % 7 in self.weekdays:
+                due = (
+                    self.zone.epoch_of(days * SECONDS_PER_DAY + self._seconds)
+                    + self.at.microsecond / 1_000_000
+                )
+                if due > epoch:
+                    return due
+            days += 1
+        raise AssertionError("unreachable, every weekday was tried")
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(at={self.at}, tz={self.tz}, weekdays={self.weekdays})"
+
+
+class Job:
+    """A scheduled alarm or timer, cancel it with `cancel()`"""
+
+    __slots__ = (
+        "scheduler", "callback", "due", "recurrence", "name", "cancelled", "done", "fired"
+    )
+
+    def __init__(
+        self,
+        scheduler: "Scheduler",
+        callback: JobCallback,
+        due: float,
+        recurrence: Recurrence | None = None,
+        name: str = "",
+    ) -> None:
+        self.scheduler = scheduler
+        self.callback = callback
+        self.due = due  # epoch seconds, of the next firing
+        self.recurrence = recurrence
+        self.name = name
+        self.cancelled = False
+        self.done = False  # a one-off job that fired, it is off the heap
+        self.fired = 0
+
+    def remaining(self) -> float:
+        """The seconds left until the next firing (0 once due)"""
+        return max(self.due - self.scheduler.source.time(), 0.0)
+
+    def cancel(self) -> None:
+        self.scheduler.cancel(self)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(name={self.name!r}, due={self.due}, "
+            f"recurrence={self.recurrence})"
+        )
+
+
+class Scheduler:
+    """Fires the jobs at their due instants (read from the `DateTime`'s clock source).
+
+    The jobs are kept in a heap by their due instant: scheduling is O(log n), cancelling
+    marks the job and leaves it in the heap until it reaches the top (the heap is rebuilt
+    once most of it is cancelled). A single event loop timer is armed for the earliest
+    job, and re-armed only when an earlier job comes in, so tens of thousands of alarms
+    cost nothing until they are due. The jobs can be scheduled and cancelled from any
+    thread, the callbacks are called on the event loop (coroutines become tasks)"""
+
+    logger = app_logger.getChild("scheduler")
+
+    def __init__(self, date_time: DateTime | None = None) -> None:
+        self.class_name = f"[{self.__class__.__name__}]"
+        self.date_time = date_time if date_time is not None else DateTime()
+        self.source = self.date_time.source
+        self.tz = self.date_time.tz or LOCAL_TZ
+
+        self._heap: list[tuple[float, int, Job]] = []
+        self._counter = itertools.count()  # ties are fired in the order of scheduling
+        self._cancelled = 0
+        self._lock = threading.RLock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._armed_for: float | None = None
+        self._tasks: set[asyncio.Task] = set()
+        # Shared by the alarms of a time zone, by `id` (not every `tzinfo` is hashable)
+        self._zones: dict[int, ZoneOffset] = {}
+
+        self.logger.debug(f"{self.class_name} Scheduling in {self.tz}")
+
+    def __len__(self) -> int:
+        """The pending jobs"""
+        return len(self._heap) - self._cancelled
+
+    def start(self) -> None:
+        """Starts firing the jobs, on the running event loop"""
+        self._loop = asyncio.get_running_loop()
+        self.logger.info(f"{self.class_name} Started, with {len(self)} job(s)")
+        self._arm()
+
+    def stop(self) -> None:
+        """Stops firing the jobs, they are kept (and fire late, once started again)"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer, self._armed_for, self._loop = None, None, None
+        self.logger.info(f"{self.class_name} Stopped")
+
+    def _push(self, job: Job) -> Job:
+        with self._lock:
+            heapq.heappush(self._heap, (job.due, next(self._counter), job))
+            earlier = self._armed_for is None or job.due < self._armed_for
+        if earlier:
+            self._wake()
+        return job
+
+    def alarm_at(self, when: datetime | float, callback: JobCallback, name: str = "") -> Job:
+        """Fires once, at the aware `datetime` (or epoch seconds)"""
+        if isinstance(when, datetime):
+            if when.tzinfo is None:
+                raise ValueError("the datetime of an alarm must be aware")
+            when = when.timestamp()
+        return self._push(Job(self, callback, when, name=name))
+
+    def alarm(
+        self,
+        at: time,
+        callback: JobCallback,
+        weekdays: Iterable[int] | None = None,
+        tz: tzinfo | None = None,
+        name: str = "",
+    ) -> Job:
+        """Fires at the local time of day `at`, every day (or on the `weekdays`, 0 is Monday),
+        in the time zone `tz` (by default, the `DateTime`'s). Follows the DST transitions"""
+        tz = tz or self.tz
+        # The zones are shared with `_fire`, on the event loop (a `ZoneOffset` isn't
+        # thread-safe)
+        with self._lock:
+            zone = self._zones.get(id(tz))
+            if zone is None:  # keeps the `tzinfo` alive, and so its `id` unique
+                zone = self._zones[id(tz)] = ZoneOffset(tz)
+            recurrence = Recurrence(at, zone, weekdays)
+            due = recurrence.next_after(self.source.time())
+        return self._push(Job(self, callback, due, recurrence, name))
+
+    def timer(self, seconds: float, callback: JobCallback, name: str = "") -> Job:
+        """Fires once, after counting down the seconds"""
+        if seconds < 0:
+            raise ValueError(f"seconds must not be negative, got {seconds!r}")
+        return self._push(Job(self, callback, self.source.time() + seconds, name=name))
+
+    def cancel(self, job: Job) -> None:
+        with self._lock:
+            if job.cancelled or job.done or job.scheduler is not self:
+                return
+            job.cancelled = True
+            self._cancelled += 1
+            if self._cancelled > 64 and self._cancelled * 2 > len(self._heap):
+                self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+
+    def _pop_cancelled(self) -> None:
+        """Drops the cancelled jobs off the top of the heap (with the lock held)"""
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+            self._cancelled -= 1
+
+    def _wake(self) -> None:
+        """Re-arms the timer for the earliest job, from whichever thread"""
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._arm()
+        else:
+            try:
+                loop.call_soon_threadsafe(self._arm)
+            except RuntimeError:  # the loop is closed
+                pass
+
+    def _arm(self) -> None:
+        with self._lock:
+            if self._loop is None:
+                return
+            self._pop_cancelled()
+            due = self._heap[0][0] if self._heap else None
+            if due == self._armed_for and self._timer is not None:
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._armed_for = due
+            if due is None:
+                return
+            delay = min(max(due - self.source.time(), 0.0), MAX_SLEEP)
+            self._timer = self._loop.call_later(delay, self._fire)
+
+    def _fire(self) -> None:
+        """Fires every due job, reschedules the recurring ones and re-arms"""
+        now = self.source.time()
+        due: list[tuple[Job, float]] = []
+        with self._lock:
+            self._timer, self._armed_for = None, None
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                _, _, job = heapq.heappop(heap)
+                if job.cancelled:
+                    self._cancelled -= 1
+                    continue
+                due.append((job, job.due))
+                if job.recurrence is not None:
+                    job.due = job.recurrence.next_after(max(job.due, now))
+                    heapq.heappush(heap, (job.due, next(self._counter), job))
+                else:
+                    job.done = True
+
+        for job, job_due in due:
+            self._call(job, now - job_due)
+        self._arm()
+
+    def _call(self, job: Job, lateness: float) -> None:
+        job.fired += 1
+        if metrics.enabled:
+            _LATENESS.observe(lateness)
+        self.logger.debug(f"{self.class_name} Firing {job}")
+        try:
+            result = job.callback(job)
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        except Exception as e:
+            self.logger.error(f"{self.class_name} The callback of {job} failed: {e!r}")
+
+
+class Stopwatch:
+    """Measures the elapsed time (on a monotonic counter, never stepped), with laps"""
+
+    def __init__(self, clock: Callable[[], float] = _time.perf_counter) -> None:
+        self.clock = clock
+        self.laps: list[float] = []
+        self._elapsed = 0.0  # of the finished runs
+        self._started: float | None = None
+        self._lap_start = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._started is not None
+
+    @property
+    def elapsed(self) -> float:
+        """The seconds measured so far"""
+        if self._started is None:
+            return self._elapsed
+        return self._elapsed + self.clock() - self._started
+
+    def start(self) -> "Stopwatch":
+        if self._started is None:
+            self._started = self.clock()
+        return self
+
+    def stop(self) -> float:
+        """Pauses, and returns the elapsed seconds"""
+        if self._started is not None:
+            self._elapsed += self.clock() - self._started
+            self._started = None
+        return self._elapsed
+
+    def lap(self) -> float:
+        """Records and returns the seconds since the last lap (or the start)"""
+        elapsed = self.elapsed
+        self.laps.append(elapsed - self._lap_start)
+        self._lap_start = elapsed
+        return self.laps[-1]
+
+    def reset(self) -> None:
+        self.laps.clear()
+        self._elapsed = self._lap_start = 0.0
+        if self._started is not None:
+            self._started = self.clock()
@@ -0,0 +1,296 @@
+"""
+Contains the process-wide clock service, that computes every tick's values once and fans
+them out to every subscriber (e.g. the `TimePiece`s of every connected Flet session)
+Usage:
+>>> service = ClockService.shared()
+>>> subscription = service.subscribe_clock(print, time_format="hh:mm:ss A")
+>>> subscription.cancel()
+"""
+
+import abc
+import asyncio
+import inspect
+import threading
+import weakref
+from concurrent.futures import Future
+from datetime import tzinfo
+from typing import Any, Callable, Hashable, Iterable
+
+from clock.backend import metrics
+from clock.backend.api import DateTime
+from clock.backend.logger import app_logger
+from clock.backend.renderer import Change, ChangeSet, IncrementalRenderer
+from clock.backend.ticker import Ticker
+from clock.backend.world import WorldClock, ZoneReading
+
+Callback = Callable[[Any], Any]
+
+
+class Channel(abc.ABC):
+    """Something computed once per tick, and handed to all of its subscribers"""
+
+    @abc.abstractmethod
+    def compute(self, epoch: float) -> Any:
+        """Returns the value of the tick, `None` when there is nothing new to deliver"""
+
+    @abc.abstractmethod
+    def current(self) -> Any:
+        """Returns the full current value, for subscribers that (re)join mid-stream"""
+
+
+class RendererChannel(Channel):
+    """The incremental time and date strings, of a time zone and formats"""
+
+    def __init__(self, tz: tzinfo | None, time_format: str, date_format: str) -> None:
+        self.renderer = IncrementalRenderer(DateTime(tz), time_format, date_format)
+        self._time: str | None = None
+        self._date: str | None = None
+
+    def compute(self, epoch: float) -> ChangeSet | None:
+        changes = self.renderer.tick(epoch)
+        if changes.time is not None:
+            self._time = changes.time
+        if changes.date is not None:
+            self._date = changes.date
+        if changes.time is None and changes.date is None:
+            return None
+        return changes
+
+    def current(self) -> ChangeSet | None:
+        if self._time is None:
+            return None
+        return ChangeSet(fields=Change.ALL, time=self._time, date=self._date)
+
+
+class WorldChannel(Channel):
+    """The readings of a `WorldClock`"""
+
+    def __init__(self, zones: tuple[str, ...]) -> None:
+        self.world_clock = WorldClock(zones)
+        self._readings: list[ZoneReading] | None = None
+
+    def compute(self, epoch: float) -> list[ZoneReading]:
+        self._readings = self.world_clock.read(epoch)
+        return self._readings
+
+    def current(self) -> list[ZoneReading] | None:
+        return self._readings
+
+
+class Subscription:
+    """A subscriber of a channel. Bound methods are only weakly referenced, so a dropped
+    control unsubscribes itself"""
+
+    def __init__(
+        self, service: "ClockService", key: Hashable, callback: Callback
+    ) -> None:
+        self.service = service
+        self.key = key
+        self._callback: Callable[[], Callback | None]
+        if inspect.ismethod(callback):
+            # The method is looked up again on every delivery (rather than kept like a
+            # `WeakMethod`), so that the ones timed by `metrics.enable()` later are timed
+            owner, name = weakref.ref(callback.__self__), callback.__name__
+            self._callback = lambda: (
+                None if (instance := owner()) is None else getattr(instance, name)
+            )
+        else:
+            self._callback = lambda: callback
+        self.is_async = inspect.iscoroutinefunction(callback)
+        try:
+            self.loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            self.loop = None
+        self._pending: Future | None = None
+        self._stale = False  # a value was skipped, so the next delivery is the full one
+
+    def cancel(self) -> None:
+        self.service.unsubscribe(self)
+
+    def deliver(self, value: Any, channel: Channel) -> None:
+        """Hands over the value (from the service's thread) to the subscriber's event loop"""
+        callback = self._callback()
+        if callback is None:
+            self.cancel()
+            return
+
+        if self._pending is not None and not self._pending.done():
+            self._stale = True  # the subscriber is lagging, don't queue up behind it
+            return
+        if self._stale:
+            self._stale = False
+            value = channel.current()
+
+        if self.loop is None:  # a plain callable, called on the service's thread
+            try:
+                callback(value)
+            except Exception as e:
+                self._drop(e)
+            return
+
+        coroutine = callback(value) if self.is_async else None
+        try:
+            if coroutine is not None:
+                self._pending = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+                self._pending.add_done_callback(self._delivered)
+            else:
+                self.loop.call_soon_threadsafe(callback, value)
+        except RuntimeError as e:  # the subscriber's event loop is closed
+            if coroutine is not None:
+                coroutine.close()
+            self._drop(e)
+
+    def _delivered(self, future: Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            self._drop(future.exception())
+
+    def _drop(self, error: BaseException | None) -> None:
+        self.service.logger.error(
+            f"{self.service.class_name} Dropping a failing subscriber: {error}"
+        )
+        self.cancel()
+
+
+class ClockService:
+    """Runs a single `Ticker` on a background thread, computes each channel once per tick
+    and fans the values out to the subscribers. Starts with the first subscriber and
+    stops with the last one"""
+
+    logger = app_logger.getChild("service")
+    _shared: "ClockService | None" = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, rate: float = 1.0) -> None:
+        self.class_name = f"[{self.__class__.__name__}]"
+        self.rate = rate
+        self.channels: dict[Hashable, Channel] = {}
+        self.subscribers: dict[Hashable, set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self.ticker = Ticker(rate)
+
+    @classmethod
+    def shared(cls) -> "ClockService":
+        """Returns the process-wide service"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self.subscribers.values())
+
+    def subscribe(
+        self, key: Hashable, make_channel: Callable[[], Channel], callback: Callback
+    ) -> Subscription:
+        """Subscribes the callback to the channel of the key (made by `make_channel` if new)"""
+        subscription = Subscription(self, key, callback)
+        with self._lock:
+            channel = self.channels.get(key)
+            if channel is None:
+                self.logger.debug(f"{self.class_name} Opening the channel: {key}")
+                channel = self.channels[key] = make_channel()
+                self.subscribers[key] = set()
+            self.subscribers[key].add(subscription)
+            self._start()
+
+        self.logger.info(f"{self.class_name} Subscribed to {key}")
+        if (current := channel.current()) is not None:
+            subscription.deliver(current, channel)
+        return subscription
+
+    def subscribe_clock(
+        self,
+        callback: Callable[[ChangeSet], Any],
+        tz: tzinfo | None = None,
+        time_format: str = "hh:mm:ss A",
+        date_format: str = "DD MMM, YYYY",
+    ) -> Subscription:
+        """Subscribes to the `ChangeSet`s of the time and date strings"""
+        key = ("clock", tz, time_format, date_format)
+        return self.subscribe(
+            key, lambda: RendererChannel(tz, time_format, date_format), callback
+        )
+
+    def subscribe_world(
+        self, callback: Callable[[list[ZoneReading]], Any], zones: Iterable[str]
+    ) -> Subscription:
+        """Subscribes to the readings of a world clock"""
+        zones = tuple(zones)
+        return self.subscribe(("world", zones), lambda: WorldChannel(zones), callback)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self.subscribers.get(subscription.key)
+            if subscribers is None or subscription not in subscribers:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                self.logger.debug(f"{self.class_name} Closing the channel: {subscription.key}")
+                del self.subscribers[subscription.key]
+                del self.channels[subscription.key]
+            if not self.subscribers:
+                self._stop()
+        self.logger.info(f"{self.class_name} Unsubscribed from {subscription.key}")
+
+    def _tick(self, epoch: float) -> None:
+        with self._lock:
+            channels = [
+                (self.channels[key], tuple(subscribers))
+                for key, subscribers in self.subscribers.items()
+            ]
+        for channel, subscribers in channels:
+            value = channel.compute(epoch)
+            if value is None:
+                continue
+            for subscription in subscribers:
+                subscription.deliver(value, channel)
+
+    def _run(self, loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        try:
+            # Looked up on every tick, so that `metrics.enable()` times it from then on
+            loop.run_until_complete(self.ticker.run(lambda epoch: self._tick(epoch)))
+        except asyncio.CancelledError:
+            pass
+        finally:
+            loop.close()
+
+    def _start(self) -> None:
+        """Starts the ticker thread, if not running (called with the lock held)"""
+        if self._thread is not None:
+            return
+        self.logger.info(f"{self.class_name} Starting the shared ticker")
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._loop,), name="clock-service", daemon=True
+        )
+        self._thread.start()
+
+    def _stop(self) -> None:
+        """Stops the ticker thread (called with the lock held)"""
+        if self._thread is None or self._loop is None:
+            return
+        self.logger.info(f"{self.class_name} Stopping the shared ticker")
+        loop = self._loop
+
+        def cancel():
+            for task in asyncio.all_tasks(loop):
+                task.cancel()
+
+        loop.call_soon_threadsafe(cancel)
+        self._thread, self._loop = None, None
+
+
+metrics.instrument(
+    ClockService,
+    "_tick",
+    metrics.Histogram(
+        "clock_tick_fanout_seconds",
+        "The duration of computing a tick and handing it to the subscribers",
+        {"owner": "service"},
+    ),
+)
@@ -0,0 +1,250 @@
+"""
+Contains the clock sources, where `DateTime` reads the current instant from
+Usage:
+>>> source = MonotonicClock(reanchor_interval=1.0)
+>>> source.time_ns()  # nanoseconds since the epoch
+>>> dt = DateTime(source=source)
+>>> DateTime(source=FrozenClock(1_700_000_000))  # tests, always the same instant
+>>> DateTime(source=FixedStepClock(1_700_000_000, step=60))  # a minute per simulated tick
+>>> DateTime(source=ScaledClock(1000))  # 1000x real time
+>>> DateTime(source=ReplayClock.from_file("stamps.log", "YYYY-MM-DD HH:mm:ss"))
+"""
+
+import abc
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+
+from clock.backend.logger import app_logger
+
+if TYPE_CHECKING:
+    from datetime import tzinfo
+
+    from clock.backend.bulk import Unit
+    from clock.backend.parser import Errors
+
+# The units of the replayed epochs, per second
+_UNITS: dict[str, int] = {"s": 1, "ms": 1_000, "us": 1_000_000, "ns": 1_000_000_000}
+
+
+class ClockSource(abc.ABC):
+    """Tells the current instant, as nanoseconds since the epoch"""
+
+    @abc.abstractmethod
+    def time_ns(self) -> int:
+        """Returns the current instant as nanoseconds since the epoch, like `time.time_ns`"""
+
+    def time(self) -> float:
+        """Returns the current instant as seconds since the epoch, like `time.time`"""
+        return self.time_ns() / 1_000_000_000
+
+
+class SystemClock(ClockSource):
+    """Reads the wall clock on every call"""
+
+    def time_ns(self) -> int:
+        return time.time_ns()
+
+
+class MonotonicClock(ClockSource):
+    """Reads the wall clock once, and derives the later instants from a monotonic counter.
+
+    Every `reanchor_interval` seconds the wall clock is read again. When it disagrees with
+    the derived instant by more than `step_threshold` seconds, the wall clock was stepped
+    (by NTP, by hand, or the counter stood still through a suspend) and the step is
+    counted in `steps`. Either way, the readings follow the wall clock from then on"""
+
+    logger = app_logger.getChild("source")
+
+    def __init__(
+        self,
+        reanchor_interval: float = 1.0,
+        step_threshold: float = 0.01,
+        wall: Callable[[], int] = time.time_ns,
+        monotonic: Callable[[], int] = time.perf_counter_ns,
+    ) -> None:
+        if reanchor_interval <= 0:
+            raise ValueError(f"reanchor_interval must be positive, got {reanchor_interval!r}")
+
+        self.class_name = f"[{self.__class__.__name__}]"
+        self.reanchor_interval = reanchor_interval
+        self.step_threshold = step_threshold
+        self._wall = wall
+        self._monotonic = monotonic
+        self._reanchor_ns = int(reanchor_interval * 1_000_000_000)
+        self._step_ns = int(step_threshold * 1_000_000_000)
+
+        self.steps = 0
+        # (wall, monotonic) nanoseconds, swapped as a whole so that the readers of other
+        # threads never see half of an anchor. The re-anchoring ones take the lock
+        self._anchor = (wall(), monotonic())
+        self._lock = threading.Lock()
+
+        self.logger.debug(
+            "%s Re-anchoring every %ss, steps over %ss are reported",
+            self.class_name,
+            reanchor_interval,
+            step_threshold,
+        )
+
+    def time_ns(self) -> int:
+        wall, monotonic = self._anchor
+        elapsed = self._monotonic() - monotonic
+        if 0 <= elapsed < self._reanchor_ns:
+            return wall + elapsed
+        return self.reanchor(wall + elapsed)
+
+    def reanchor(self, derived: int | None = None) -> int:
+        """Reads the wall clock again and returns it, comparing it with the derived instant"""
+        with self._lock:
+            wall = self._wall()
+            self._anchor = (wall, self._monotonic())
+            stepped = derived is not None and abs(wall - derived) > self._step_ns
+            if stepped:
+                self.steps += 1
+        if stepped:
+            self.logger.info(
+                "%s The wall clock stepped by %+.3fs, re-anchored",
+                self.class_name,
+                (wall - derived) / 1_000_000_000,  # type: ignore[operator]
+            )
+        return wall
+
+
+class SimulatedClock(ClockSource):
+    """A clock that only moves when told to, for tests and for the simulated tick loop
+    (`Ticker.simulate`), which calls `tick` between the ticks instead of sleeping"""
+
+    # Whether `tick` returns `False` at some point, a simulation on an endless clock needs
+    # a number of ticks or an end
+    runs_out = False
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now_ns = round(start * 1_000_000_000)
+
+    def time_ns(self) -> int:
+        return self.now_ns
+
+    def set(self, seconds: float) -> None:
+        self.now_ns = round(seconds * 1_000_000_000)
+
+    def advance(self, seconds: float) -> None:
+        self.now_ns += round(seconds * 1_000_000_000)
+
+    @abc.abstractmethod
+    def tick(self, interval: float) -> bool:
+        """Moves on to the instant of the next tick, `interval` seconds of the ticker later.
+        Returns `False` once there is no next instant"""
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(now={self.time()})"
+
+
+class FrozenClock(SimulatedClock):
+    """Always tells the same instant, unless `set` / `advance`d by hand"""
+
+    def tick(self, interval: float) -> bool:
+        return True
+
+
+class FixedStepClock(SimulatedClock):
+    """Moves by a fixed `step` (in seconds) on every tick, by the ticker's interval when
+    not given. A step longer than the interval simulates faster than the ticks"""
+
+    def __init__(self, start: float = 0.0, step: float | None = None) -> None:
+        if step is not None and step <= 0:
+            raise ValueError(f"step must be positive, got {step!r}")
+        super().__init__(start)
+        self.step = step
+
+    def tick(self, interval: float) -> bool:
+        self.advance(self.step if self.step is not None else interval)
+        return True
+
+
+class ReplayClock(SimulatedClock):
+    """Tells the instants (epochs, in `unit`) of an iterable one after the other, moving on
+    to the next one on every tick. The iterable is consumed lazily, a file is never read
+    whole"""
+
+    runs_out = True
+
+    def __init__(self, instants: Iterable[float], unit: "Unit" = "s") -> None:
+        if unit not in _UNITS:
+            raise ValueError(f"unit must be one of {tuple(_UNITS)}, got {unit!r}")
+        self._per_unit = 1_000_000_000 // _UNITS[unit]  # nanoseconds
+        self._instants: Iterator[float] = iter(instants)
+        self.replayed = 0
+        super().__init__()
+        if not self.tick(0):
+            raise ValueError("there is no instant to replay")
+
+    @classmethod
+    def from_file(
+        cls,
+        file: str | Path,
+        format: str | None = None,
+        tz: "tzinfo | None" = None,
+        errors: "Errors" = "raise",
+    ) -> "ReplayClock":
+        """Replays the lines of the file: epoch seconds, or timestamps in the `Arrow` format
+        (parsed in the time zone `tz`, by default the local one, see `iter_parse`)"""
+        lines = _read_lines(Path(file))
+        if format is None:
+            return cls(float(line) for line in lines if line.strip())
+
+        from clock.backend.parser import iter_parse
+
+        return cls(iter_parse(lines, format, tz=tz, unit="us", errors=errors), unit="us")
+
+    def set(self, seconds: float) -> None:
+        raise TypeError("a replayed clock can't be set, it follows its instants")
+
+    def tick(self, interval: float) -> bool:
+        try:
+            instant = next(self._instants)
+        except StopIteration:
+            return False
+        self.replayed += 1
+        self.now_ns = round(instant * self._per_unit)
+        return True
+
+
+def _read_lines(file: Path) -> Iterator[str]:
+    with file.open(encoding="utf-8") as lines:
+        yield from lines
+
+
+class ScaledClock(ClockSource):
+    """Runs `scale` times faster (or slower) than the real time, from `start` (by default,
+    the current instant). A `Ticker` on it sleeps the real time: `Ticker(rate,
+    clock=source.time, speed=source.scale)`"""
+
+    def __init__(
+        self,
+        scale: float,
+        start: float | None = None,
+        monotonic: Callable[[], int] = time.perf_counter_ns,
+    ) -> None:
+        if scale <= 0:
+            raise ValueError(f"scale must be positive, got {scale!r}")
+        self.scale = scale
+        self._monotonic = monotonic
+        self._start_ns = time.time_ns() if start is None else round(start * 1_000_000_000)
+        self._origin = monotonic()
+
+    def time_ns(self) -> int:
+        return self._start_ns + round((self._monotonic() - self._origin) * self.scale)
+
+
+_default: ClockSource | None = None
+
+
+def default_source() -> ClockSource:
+    """Returns the process-wide `MonotonicClock`, shared by the `DateTime`s by default"""
+    global _default
+
+    if _default is None:
+        _default = MonotonicClock()
+    return _default
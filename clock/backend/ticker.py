@@ -0,0 +1,154 @@
+"""
+Contains a drift-free ticker, that wakes up on the wall-clock (sub-)second boundaries
+Usage:
+>>> ticker = Ticker(rate=1)
+>>> task = ticker.start(lambda tick: print(tick))  # inside a running event loop
+>>> ticker.stop()
+>>> await ticker.simulate(callback, FixedStepClock(start), ticks=86_400)  # no sleeping
+"""
+
+import asyncio
+import inspect
+import math
+import time
+from typing import Any, Awaitable, Callable
+
+from clock.backend import metrics
+from clock.backend.logger import app_logger
+from clock.backend.source import SimulatedClock
+
+TickCallback = Callable[[float], Awaitable[Any] | Any]
+
+_LATENESS = metrics.Histogram(
+    "clock_tick_lateness_seconds", "How late each tick woke up, after its wall-clock boundary"
+)
+_JITTER = metrics.Histogram(
+    "clock_tick_jitter_seconds", "How much the lateness changed from one tick to the next"
+)
+_MISSED = metrics.Counter("clock_ticks_missed_total", "The ticks skipped for running late")
+
+
+class Ticker:
+    """Calls back on every absolute deadline `k / rate` (in epoch seconds), as an asyncio task.
+
+    Every sleep is computed from the wall clock against the next absolute deadline, so the
+    error never accumulates like it does with `sleep(1)`. If the callback (or the event loop)
+    ran late past whole ticks, those ticks are skipped and counted in `missed`. A callback
+    raising is logged, and the ticking goes on. On a clock running faster than the real
+    time (e.g. a `ScaledClock`), the sleeps are divided by its `speed`"""
+
+    logger = app_logger.getChild("ticker")
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        clock: Callable[[], float] = time.time,
+        speed: float = 1.0,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate!r}")
+        if speed <= 0:
+            raise ValueError(f"speed must be positive, got {speed!r}")
+
+        self.class_name = f"[{self.__class__.__name__}]"
+        self.interval = 1 / rate
+        self.clock = clock
+        self.speed = speed
+
+        self.ticks = 0
+        self.missed = 0
+        self.lateness = 0.0  # seconds, of the last tick
+        self._task: asyncio.Task | None = None
+
+        self.logger.debug(f"{self.class_name} Ticking every {self.interval}s")
+
+    def next_deadline(self, now: float) -> float:
+        """Returns the first tick boundary strictly after `now`"""
+        return (math.floor(now / self.interval) + 1) * self.interval
+
+    async def run(self, callback: TickCallback) -> None:
+        """Calls `callback(deadline)` on every tick, until cancelled"""
+        self.logger.info(f"{self.class_name} Started ticking")
+        deadline = self.next_deadline(self.clock())
+        try:
+            while True:
+                delay = deadline - self.clock()
+                if delay > self.interval:  # the wall clock was stepped back
+                    deadline = self.next_deadline(self.clock())
+                    continue
+                if delay > 0:
+                    await asyncio.sleep(delay / self.speed)
+
+                now = self.clock()
+                if now < deadline:  # woke up early, just go back to sleep
+                    continue
+
+                lateness, self.lateness = self.lateness, now - deadline
+                skipped = int(self.lateness // self.interval)
+                if metrics.enabled:
+                    _LATENESS.observe(self.lateness)
+                    if self.ticks:
+                        _JITTER.observe(abs(self.lateness - lateness))
+                    if skipped:
+                        _MISSED.inc(skipped)
+                if skipped:
+                    self.missed += skipped
+                    deadline += skipped * self.interval
+                    self.logger.debug(f"{self.class_name} Missed {skipped} tick(s)")
+
+                self.ticks += 1
+                try:
+                    result = callback(deadline)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception:  # a bad tick must not stop the following ones
+                    self.logger.exception(f"{self.class_name} The tick at {deadline} failed")
+
+                deadline += self.interval
+        finally:
+            self.logger.info(f"{self.class_name} Stopped ticking")
+
+    async def simulate(
+        self,
+        callback: TickCallback,
+        source: SimulatedClock,
+        ticks: int | None = None,
+        until: float | None = None,
+    ) -> int:
+        """Calls `callback(now)` on the instants of the simulated clock, moving it on between
+        the ticks (`source.tick(interval)`) instead of sleeping, as fast as the callback
+        goes. Stops after `ticks` ticks, past the epoch `until`, or at the end of the
+        clock's instants, and returns the ticks run. Without `ticks`, it also stops once an
+        endless clock stands still (e.g. a `FrozenClock`), as `until` would never come"""
+        if ticks is None and until is None and not source.runs_out:
+            raise ValueError(f"{source!r} never runs out, simulate it with ticks or until")
+
+        self.logger.info(f"{self.class_name} Started simulating on {source!r}")
+        count = 0
+        now = source.time()
+        while (ticks is None or count < ticks) and (until is None or now < until):
+            count += 1
+            result = callback(now)
+            if inspect.isawaitable(result):
+                await result
+            if not source.tick(self.interval):
+                break
+            previous, now = now, source.time()
+            if ticks is None and not source.runs_out and now <= previous:
+                self.logger.warning(f"{self.class_name} {source!r} stands still, stopped")
+                break
+        self.ticks += count
+        self.logger.info(f"{self.class_name} Simulated {count} tick(s)")
+        return count
+
+    def start(self, callback: TickCallback) -> asyncio.Task:
+        """Runs the ticker as a task of the running event loop, and returns it"""
+        self.stop()
+        self._task = asyncio.get_running_loop().create_task(self.run(callback))
+        return self._task
+
+    def stop(self) -> None:
+        """Cancels the running task, if any"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
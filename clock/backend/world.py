@@ -0,0 +1,92 @@
+"""
+Contains the world clock, deriving the time and date of many time zones from a single UTC read
+Usage:
+>>> world = WorldClock(["UTC", "Asia/Kolkata", "America/New_York"])
+>>> for reading in world.read():
+...     print(reading.name, reading.time.asdict(), reading.date.asdict())
+"""
+
+import time
+from datetime import tzinfo
+from typing import Callable, Iterable, NamedTuple
+
+from dateutil import tz as dateutil_tz
+
+from clock.backend._calendar import SECONDS_PER_DAY, civil_from_days
+from clock.backend.api import DateData, TimeData
+from clock.backend.logger import app_logger
+from clock.backend.zone import ZoneOffset
+
+
+class ZoneReading(NamedTuple):
+    """Time and Date datum of a single zone, of a world clock reading"""
+
+    name: str
+    time: TimeData
+    date: DateData
+    offset: int  # seconds east of UTC
+
+
+class WorldClock:
+    """Reads UTC once per call and derives the local `TimeData` / `DateData` of every zone.
+
+    Each zone's UTC offset is cached up to its next transition, so that the time zone
+    rules are only looked up again once a transition has passed"""
+
+    logger = app_logger.getChild("world")
+
+    def __init__(
+        self,
+        zones: Iterable[str | tzinfo],
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.class_name = f"[{self.__class__.__name__}]"
+        self.clock = clock
+
+        self.names: list[str] = []
+        self.offsets: list[ZoneOffset] = []
+        # The last `DateData` of each zone, shared across the readings of the same day
+        self._days: list[int] = []
+        self._dates: list[DateData | None] = []
+        for zone in zones:
+            self.add_zone(zone)
+
+        self.logger.info(f"{self.class_name} Initialized with {len(self.names)} zones")
+
+    def add_zone(self, zone: str | tzinfo) -> None:
+        """Adds a time zone, by its IANA name or as a `tzinfo`"""
+        tz = dateutil_tz.gettz(zone) if isinstance(zone, str) else zone
+        if tz is None:
+            raise ValueError(f"Unknown time zone {zone!r}")
+
+        name = zone if isinstance(zone, str) else str(zone)
+        self.logger.debug(f"{self.class_name} Adding the time zone: {name}")
+        self.names.append(name)
+        self.offsets.append(ZoneOffset(tz))
+        self._days.append(0)
+        self._dates.append(None)
+
+    def read(self, epoch: float | None = None) -> list[ZoneReading]:
+        """Returns the readings of every zone at the given (or the current) epoch, in order"""
+        if epoch is None:
+            epoch = self.clock()
+
+        seconds = int(epoch // 1)
+        microsecond = int((epoch - seconds) * 1_000_000)
+
+        readings = []
+        for index, name in enumerate(self.names):
+            offset = self.offsets[index].at(seconds)
+            days, day_seconds = divmod(seconds + offset, SECONDS_PER_DAY)
+            hour, rest = divmod(day_seconds, 3600)
+            minute, second = divmod(rest, 60)
+
+            date = self._dates[index]
+            if date is None or self._days[index] != days:
+                date = self._dates[index] = DateData(*civil_from_days(days))
+                self._days[index] = days
+
+            readings.append(
+                ZoneReading(name, TimeData(hour, minute, second, microsecond), date, offset)
+            )
+        return readings
@@ -0,0 +1,120 @@
+"""
+Contains the cached UTC offsets of the time zones, looked up again only past a transition
+Usage:
+>>> zone = ZoneOffset(gettz("Europe/London"))
+>>> zone.at(1_700_000_000)  # seconds east of UTC
+>>> zone.datetime_at(1_700_000_000_123_456)  # an aware `datetime`, from microseconds
+>>> zone.epoch_of(1_700_000_000)  # the epoch of a local wall time (in seconds)
+"""
+
+from datetime import datetime, timedelta, tzinfo
+
+from clock.backend._calendar import SECONDS_PER_DAY
+
+# How far ahead to look for the next transition, zones without any are re-checked after it
+TRANSITION_HORIZON = 400 * SECONDS_PER_DAY
+_PROBE_STEP = SECONDS_PER_DAY
+# The epochs that `datetime.fromtimestamp` takes in any time zone (a day within the years 1
+# and 9999), the lookups past them get the offset of the nearest one
+_MIN_EPOCH = -62_135_596_800 + SECONDS_PER_DAY
+_MAX_EPOCH = 253_402_300_800 - 2 * SECONDS_PER_DAY
+
+
+class ZoneOffset:
+    """The UTC offset of a time zone, cached until its next (DST) transition"""
+
+    __slots__ = (
+        "tz",
+        "offset",
+        "valid_from",
+        "valid_until",
+        "settled_from",
+        "_previous",
+        "_epoch",
+    )
+
+    def __init__(self, tz: tzinfo) -> None:
+        self.tz = tz
+        # The local `datetime`s are built by adding the local seconds to it (the aware
+        # arithmetic doesn't look the offset up)
+        self._epoch = datetime(1970, 1, 1, tzinfo=tz)
+        self.offset = 0
+        self.valid_from = 0
+        self.valid_until = -1  # nothing cached yet
+        # Within a day of a transition the local times can repeat, and the `fold` of the
+        # `datetime` matters, see `datetime_at`
+        self.settled_from = 0
+        # The window cached before the current one, as (valid_from, valid_until, offset,
+        # settled_from): the lookups that go back and forth across a transition hit either
+        self._previous = (0, -1, 0, 0)
+
+    def _utc_offset(self, epoch: int) -> int:
+        epoch = min(max(epoch, _MIN_EPOCH), _MAX_EPOCH)
+        return int(datetime.fromtimestamp(epoch, self.tz).utcoffset().total_seconds())  # type: ignore
+
+    def _next_transition(self, epoch: int, offset: int) -> int:
+        """Returns the first second after `epoch` with another offset (or the horizon)"""
+        low, high = epoch, epoch
+        while high - epoch < TRANSITION_HORIZON:
+            high = min(high + _PROBE_STEP, epoch + TRANSITION_HORIZON)
+            if self._utc_offset(high) != offset:
+                break
+            low = high
+        else:
+            return high
+
+        while high - low > 1:  # offset(low) == offset, offset(high) != offset
+            middle = (low + high) // 2
+            if self._utc_offset(middle) == offset:
+                low = middle
+            else:
+                high = middle
+        return high
+
+    def at(self, epoch: int) -> int:
+        """Returns the UTC offset (in seconds) at the given epoch (in seconds)"""
+        if self.valid_from <= epoch < self.valid_until:
+            return self.offset
+        previous = self._previous
+        self._previous = (self.valid_from, self.valid_until, self.offset, self.settled_from)
+        if previous[0] <= epoch < previous[1]:
+            self.valid_from, self.valid_until, self.offset, self.settled_from = previous
+            return self.offset
+
+        self.offset = self._utc_offset(epoch)
+        self.valid_from = epoch
+        transition = self._previous[1]
+        if transition <= epoch < transition + _PROBE_STEP:
+            # Just past the end of the last window: the offset holds since its end
+            if self._utc_offset(transition) == self.offset:
+                self.valid_from = transition
+        self.valid_until = self._next_transition(epoch, self.offset)
+        if self._utc_offset(epoch - _PROBE_STEP) == self.offset:
+            self.settled_from = epoch
+        else:  # a transition in the last day
+            self.settled_from = epoch + _PROBE_STEP
+        return self.offset
+
+    def datetime_at(self, microseconds: int) -> datetime:
+        """Returns the aware `datetime` of the given epoch (in microseconds), in this time zone.
+
+        Same as `datetime.fromtimestamp(epoch, tz)`, minus the time zone rules lookup"""
+        seconds, microsecond = divmod(microseconds, 1_000_000)
+        offset = self.at(seconds)
+        if seconds < self.settled_from:
+            return datetime.fromtimestamp(microseconds / 1_000_000, self.tz)
+        return self._epoch + timedelta(0, seconds + offset, microsecond)
+
+    def epoch_of(self, local: int) -> int:
+        """Returns the epoch of a local wall time (both in seconds, the local one as if it
+        was UTC). A time skipped by a DST transition is taken right after it (02:30 ->
+        03:30), a repeated one on its first occurrence"""
+        # The offsets on either side of a transition that may fall around the time. The
+        # earlier probe is the same for the whole (local) day, so that the cached offset
+        # stays valid for every time of the day
+        before = self.at((local // SECONDS_PER_DAY - 1) * SECONDS_PER_DAY)
+        after = self.at(local + SECONDS_PER_DAY)
+        for offset in (max(before, after), min(before, after)):  # the earlier instant first
+            if self.at(local - offset) == offset:
+                return local - offset
+        return local - before  # skipped, by the offset from before the gap
@@ -1,10 +1,14 @@
+import asyncio
+import concurrent.futures
 import time
+from contextlib import asynccontextmanager, contextmanager
 from datetime import tzinfo
-from typing import Literal
+from pathlib import Path
 
 import flet as ft
 
-from clock.backend.api import DateTime
+from clock.backend import metrics
+from clock.backend.api import DateData, DateTime, TimeData
 from clock.backend.logger import (
     RichConsoleHandler,
     app_logger,
@@ -13,6 +17,25 @@ from clock.backend.logger import (
     flet_logger,
     logging,
 )
+from clock.backend.renderer import SUB_SECOND_RATES, ChangeSet, IncrementalRenderer, Show
+from clock.backend.service import ClockService
+from clock.backend.ticker import Ticker
+from clock.backend.world import WorldClock, ZoneReading
+
+ASSETS_DIR = Path(__file__).parent / "assets"
+WORLD_ZONES = ["UTC", "America/New_York", "Europe/London", "Asia/Kolkata", "Asia/Tokyo"]
+SUB_SECOND_FORMAT = "hh:mm:ss.SS A"
+IDLE_RATE = 1.0  # Hz, of the sub-second display while the window is unfocused
+
+# The window events of the desktop app (`page.on_window_event`) that change what is shown,
+# as (attribute, value) of the window's state. Flet 0.19 reports minimizing and restoring
+# the window, and its focus; the web and the mobile clients don't report any
+_WINDOW_EVENTS: dict[str, tuple[str, bool]] = {
+    "minimize": ("hidden", True),
+    "restore": ("hidden", False),
+    "focus": ("focused", True),
+    "blur": ("focused", False),
+}
 
 
 class TimePiece(ft.UserControl):
@@ -20,19 +43,15 @@ class TimePiece(ft.UserControl):
 
     def __init__(
         self,
-        show: Literal["time", "date", "datetime", "timedate"],
+        show: Show,
         tz: tzinfo | None = None,
+        frame_rate: float = 30,
     ):
         super().__init__()
         self.class_name = f"[{self.__class__.__name__}@flet]"
         self.logger.info(f"{self.class_name} Initialized the Control")
 
-        self.show: (
-            Literal["time"]
-            | Literal["date"]
-            | Literal["datetime"]
-            | Literal["timedate"]
-        ) = show
+        self.show: Show = show
 
         self.time_text = ft.Text(
             theme_style=ft.TextThemeStyle.DISPLAY_LARGE,
@@ -49,6 +68,22 @@ class TimePiece(ft.UserControl):
             self.date_text,
         ]
 
+        # Batching of the updates: at most one `update()` per frame, and none for
+        # values that the client already shows
+        self.frame_interval = 1 / frame_rate
+        # The values the client shows, and the controls to send for each combination of
+        # stale values, built once so that a steady tick allocates nothing of its own
+        self._shown_time: str | None = None
+        self._shown_date: str | None = None
+        self._stale_controls: tuple[tuple[ft.Control, ...], ...] = ()
+        self._set_stale_controls()
+        self._batch_depth = 0
+        self._last_flush = 0.0
+        # The deferred flush, on the event loop of the page (from whichever thread it was
+        # requested): a `Task`, or the `Future` of one scheduled from another thread
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._flush_task: asyncio.Future | concurrent.futures.Future | None = None
+
         # logging informations:
         self.logger.debug(f"{self.class_name} Time Zone: {tz}")
         self.logger.debug(f"{self.class_name} Information to show: {show}")
@@ -73,23 +108,183 @@ class TimePiece(ft.UserControl):
                 self._date_time_text = [self.time_text, self.date_text]
 
         self._date_time_text = self._date_time_text
+        self._set_stale_controls()
+
+    def _set_stale_controls(self):
+        """Indexed by `2 * stale time + stale date`"""
+        shown = self._date_time_text
+        self._stale_controls = tuple(
+            tuple(
+                text
+                for text, stale in ((self.time_text, index & 2), (self.date_text, index & 1))
+                if stale and text in shown
+            )
+            for index in range(4)
+        )
+
+    @property
+    def stale_controls(self) -> tuple[ft.Control, ...]:
+        """The shown `Text`s holding values that the client does not show yet"""
+        return self._stale_controls[
+            (self.time_text.value != self._shown_time) * 2
+            + (self.date_text.value != self._shown_date)
+        ]
+
+    @property
+    def dirty(self) -> bool:
+        """Whether the controls hold values that the client does not show yet"""
+        return self.time_text.value != self._shown_time or self.date_text.value != self._shown_date
+
+    def _flushed(self):
+        self._shown_time = self.time_text.value
+        self._shown_date = self.date_text.value
+        self._last_flush = time.monotonic()
+
+    def did_mount(self):
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:  # a page of a synchronous app, its updates are sent right away
+            self._loop = None
+
+    async def did_mount_async(self):
+        self._loop = asyncio.get_running_loop()
+
+    def flush(self):
+        """Sends the pending changes now, with a single update of the changed `Text`s only"""
+        if not self.dirty or self.page is None:
+            return
+        self.logger.debug("%s Sending the pending changes", self.class_name)
+        if controls := self.stale_controls:
+            self.page.update(*controls)
+        self._flushed()
+
+    async def flush_async(self):
+        """Sends the pending changes now, with a single update of the changed `Text`s only"""
+        if not self.dirty or self.page is None:
+            return
+        self.logger.debug("%s Sending the pending changes", self.class_name)
+        if controls := self.stale_controls:
+            await self.page.update_async(*controls)
+        self._flushed()
+
+    async def _flush_later(self, wait: float):
+        await asyncio.sleep(wait)
+        await self.flush_async()
+
+    def _request_flush(self):
+        """Flushes, unless batching, or coalesces into the next frame if one was just sent"""
+        if self._batch_depth or not self.dirty:
+            return
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        wait = self._last_flush + self.frame_interval - time.monotonic()
+        loop = self._loop
+        if wait <= 0 or loop is None or loop.is_closed():
+            self.flush()
+            return
+        # Deferred on the page's event loop, like the async path (never on a thread of its own)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._flush_task = loop.create_task(self._flush_later(wait))
+        else:
+            self._flush_task = asyncio.run_coroutine_threadsafe(self._flush_later(wait), loop)
+
+    async def _request_flush_async(self):
+        """Flushes, unless batching, or coalesces into the next frame if one was just sent"""
+        if self._batch_depth or not self.dirty:
+            return
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        wait = self._last_flush + self.frame_interval - time.monotonic()
+        if wait <= 0:
+            await self.flush_async()
+        else:
+            self._flush_task = asyncio.create_task(self._flush_later(wait))
+
+    @contextmanager
+    def batch(self):
+        """Collects every change made inside, and sends them with a single `update()`"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            self._request_flush()
+
+    @asynccontextmanager
+    async def batch_async(self):
+        """Collects every change made inside, and sends them with a single `update_async()`"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            await self._request_flush_async()
 
     def update_time(self, time: str):
         self.logger.debug(f"{self.class_name} Updating the time to {time}")
         self.time_text.value = time
-        self.update()
+        self._request_flush()
 
     def update_date(self, date: str):
         self.logger.debug(f"{self.class_name} Updating the date to {date}")
         self.date_text.value = date
-        self.update()
+        self._request_flush()
 
     def update_date_and_time(self, date: str, time: str):
         self.logger.debug(
             f"{self.class_name} Updating the date and time to {date} & {time}"
         )
-        self.update_date(date)
-        self.update_time(time)
+        with self.batch():
+            self.update_date(date)
+            self.update_time(time)
+
+    async def update_time_async(self, time: str):
+        self.logger.debug(f"{self.class_name} Updating the time to {time}")
+        self.time_text.value = time
+        await self._request_flush_async()
+
+    async def update_date_async(self, date: str):
+        self.logger.debug(f"{self.class_name} Updating the date to {date}")
+        self.date_text.value = date
+        await self._request_flush_async()
+
+    async def update_date_and_time_async(self, date: str, time: str):
+        self.logger.debug(
+            f"{self.class_name} Updating the date and time to {date} & {time}"
+        )
+        async with self.batch_async():
+            await self.update_date_async(date)
+            await self.update_time_async(time)
+
+    # The tick path: the log messages are only formatted when the level lets them through,
+    # and the batch is inlined rather than a context manager
+    def apply(self, changes: ChangeSet):
+        """Applies the strings that changed since the last tick, with a single update"""
+        time, date = changes.time, changes.date
+        if time is None and date is None:
+            return
+        self.logger.debug("%s Applying the changes: %s", self.class_name, changes)
+        if time is not None:
+            self.time_text.value = time
+        if date is not None:
+            self.date_text.value = date
+        self._request_flush()
+
+    async def apply_async(self, changes: ChangeSet):
+        """Applies the strings that changed since the last tick, with a single update"""
+        time, date = changes.time, changes.date
+        if time is None and date is None:
+            return
+        self.logger.debug("%s Applying the changes: %s", self.class_name, changes)
+        if time is not None:
+            self.time_text.value = time
+        if date is not None:
+            self.date_text.value = date
+        await self._request_flush_async()
 
     def build(self):
         self._set_up()
@@ -107,6 +302,184 @@ class TimePiece(ft.UserControl):
         )
 
 
+class WorldClockGrid(ft.UserControl):
+    """A grid of `TimePiece`s, one per time zone, all derived from a single `WorldClock` read"""
+
+    logger = app_logger.getChild("app.gui")
+
+    def __init__(self, zones: list[str], max_extent: int = 320):
+        super().__init__()
+        self.class_name = f"[{self.__class__.__name__}@flet]"
+        self.logger.info(f"{self.class_name} Initialized the Control")
+
+        self.world_clock = WorldClock(zones)
+        self.max_extent = max_extent
+        self.expand = True  # the grid scrolls, so it needs a bounded height
+        self.labels = [
+            ft.Text(zone, theme_style=ft.TextThemeStyle.LABEL_LARGE) for zone in zones
+        ]
+        self.pieces = [TimePiece(show="timedate") for _ in zones]
+        for piece in self.pieces:
+            piece.time_text.size = 30
+            piece.date_text.size = 20
+        # The readings each piece shows, the strings are only built again when they differ
+        self._times: list[TimeData | None] = [None] * len(zones)
+        self._dates: list[DateData | None] = [None] * len(zones)
+        self._changed: list[TimePiece] = []  # the pieces holding strings not sent yet
+
+        self.logger.debug(f"{self.class_name} Zones to show: {zones}")
+
+    async def tick_async(self):
+        """Reads the world clock and refreshes every zone"""
+        await self.apply_async(self.world_clock.read())
+
+    async def apply_async(self, readings: list[ZoneReading]):
+        """Refreshes every zone, with a single update sent for the whole grid"""
+        times, dates, changed = self._times, self._dates, self._changed
+        for index, piece in enumerate(self.pieces):
+            time, date = readings[index].time, readings[index].date
+            # The fields are strings of shared tables: comparing them allocates nothing
+            shown = times[index]
+            if (
+                shown is None
+                or time.second != shown.second
+                or time.minute != shown.minute
+                or time.hour != shown.hour
+                or time.session != shown.session
+            ):
+                piece.time_text.value = f"{time.hour}:{time.minute}:{time.second} {time.session}"
+                times[index] = time
+                if piece not in changed:
+                    changed.append(piece)
+            shown = dates[index]
+            if shown is None or (
+                date is not shown
+                and (date.day != shown.day or date.month != shown.month or date.year != shown.year)
+            ):
+                piece.date_text.value = f"{date.day} {date.month}, {date.year}"
+                dates[index] = date
+                if piece not in changed:
+                    changed.append(piece)
+
+        if changed and self.page:
+            controls = [text for piece in changed for text in piece.stale_controls]
+            if controls:
+                await self.page.update_async(*controls)
+            for piece in changed:
+                piece._flushed()
+            changed.clear()
+
+    def build(self):
+        self.logger.info(f"{self.class_name} Building the UserControl")
+        return ft.GridView(
+            controls=[
+                ft.Column(controls=[label, piece])
+                for label, piece in zip(self.labels, self.pieces)
+            ],
+            max_extent=self.max_extent,
+            child_aspect_ratio=2,
+            expand=True,
+        )
+
+
+class SubSecondDisplay:
+    """Drives a `TimePiece` at 10 to 60 frames per second, for a stopwatch-grade display.
+
+    The frames are paced by a `Ticker` reading the `DateTime`'s clock source, and each frame
+    renders its own deadline (not the instant it woke up at), so that the sub-second digits
+    step evenly. Only the tokens whose fields changed are formatted again, on most frames
+    just the sub-second digits. Follows the window: the full rate while focused,
+    `idle_rate` while unfocused, and paused while minimized"""
+
+    logger = app_logger.getChild("app.gui")
+
+    def __init__(
+        self,
+        time_piece: TimePiece,
+        rate: float = 30,
+        idle_rate: float = IDLE_RATE,
+        tz: tzinfo | None = None,
+        time_format: str = SUB_SECOND_FORMAT,
+        date_format: str = "DD MMM, YYYY",
+    ):
+        low, high = SUB_SECOND_RATES
+        if not low <= rate <= high:
+            raise ValueError(f"rate must be within {low:g} and {high:g} Hz, got {rate!r}")
+        self.class_name = f"[{self.__class__.__name__}@flet]"
+
+        self.time_piece = time_piece
+        self.rate = rate
+        self.idle_rate = idle_rate
+        self.date_time = DateTime(tz)
+        self.renderer = IncrementalRenderer(self.date_time, time_format, date_format)
+        # Every tick is a frame already, the `TimePiece` must not coalesce them
+        time_piece.frame_interval = 0
+
+        self.hidden = False
+        self.focused = True
+        self.ticker: Ticker | None = None
+        self._running_rate = 0.0
+
+        self.logger.debug(f"{self.class_name} Showing {time_format!r} at {rate:g} Hz")
+
+    @property
+    def target_rate(self) -> float:
+        """The frame rate for the current state of the window, 0 when paused"""
+        if self.hidden:
+            return 0.0
+        return self.rate if self.focused else self.idle_rate
+
+    def start(self):
+        """Starts the frames, on the running event loop"""
+        self._retime()
+
+    def stop(self):
+        if self.ticker is not None:
+            self.ticker.stop()
+            self.ticker = None
+        self._running_rate = 0.0
+
+    def _retime(self):
+        """Restarts the ticker at the target rate, if it changed"""
+        rate = self.target_rate
+        if rate == self._running_rate:
+            return
+        self.stop()
+        if rate > 0:
+            self.ticker = Ticker(rate, clock=self.date_time.source.time)
+            self.ticker.start(self._frame)
+            self._running_rate = rate
+            self.logger.info(f"{self.class_name} Running at {rate:g} Hz")
+        else:
+            self.logger.info(f"{self.class_name} Paused, the window is hidden")
+
+    async def _frame(self, deadline: float):
+        await self.time_piece.apply_async(self.renderer.tick(deadline))
+
+    async def on_window_event(self, e):
+        """Follows the window's visibility and focus, from `page.on_window_event`"""
+        update = _WINDOW_EVENTS.get(e.data)
+        if update is None:
+            return
+        attribute, value = update
+        setattr(self, attribute, value)
+        self._retime()
+
+
+_TIME_PIECE_UPDATE = metrics.Histogram(
+    "clock_ui_update_seconds", "The duration of the UI updates", {"control": "time_piece"}
+)
+metrics.instrument(TimePiece, "flush", _TIME_PIECE_UPDATE)
+metrics.instrument(TimePiece, "flush_async", _TIME_PIECE_UPDATE)
+metrics.instrument(
+    WorldClockGrid,
+    "apply_async",
+    metrics.Histogram(
+        "clock_ui_update_seconds", "The duration of the UI updates", {"control": "world_clock"}
+    ),
+)
+
+
 def setup_loggers():
     for logger in [app_logger, flet_core_logger, flet_logger]:
         logger.setLevel(logging.DEBUG)
@@ -114,11 +487,11 @@ def setup_loggers():
     configure_present_loggers(
         loggers=[app_logger, flet_core_logger, flet_logger],
         handlers=[RichConsoleHandler(level=app_logger.level)],
+        queued=True,
     )
 
 
-def main(page: ft.Page):
-    setup_loggers()
+async def main(page: ft.Page, sub_second_rate: float | None = None):
     page.title = "Clock"
     page.fonts = {
         "digital": "fonts/Technology.ttf",
@@ -128,7 +501,7 @@ def main(page: ft.Page):
         color_scheme_seed="#000be3",
     )
 
-    def theme_changer(e):
+    async def theme_changer(e):
         page.theme_mode = (
             ft.ThemeMode.DARK
             if page.theme_mode == ft.ThemeMode.LIGHT
@@ -139,7 +512,10 @@ def main(page: ft.Page):
             if page.theme_mode == ft.ThemeMode.LIGHT
             else ft.icons.DARK_MODE
         )
-        page.update()
+        await page.update_async()
+
+    async def show_info(e):
+        await page.show_dialog_async(info_dialog)
 
     page.theme_mode = ft.ThemeMode.LIGHT
 
@@ -148,7 +524,7 @@ def main(page: ft.Page):
     )
     info_button = ft.IconButton(
         icon=ft.icons.INFO,
-        on_click=lambda e: page.show_dialog(info_dialog),
+        on_click=show_info,
         tooltip="About",
     )
 
@@ -172,37 +548,91 @@ def main(page: ft.Page):
         leading=ft.Icon(name=ft.icons.ALARM, size=40),
         actions=[theme_switcher, info_button],
     )
-    dt = DateTime()
     time_piece = TimePiece(show="timedate")
     time_piece.time_text.color = ft.colors.BLUE
     time_piece.date_text.color = ft.colors.AMBER
     # Wrap TimePiece in a centered container
-    page.add(time_piece)
-    page.update()
-
-    previous_time = ""
-    previous_date = ""
-
-    try:
-        while True:
-            current_time = dt.get_time(format="hh:mm:ss A")
-            current_date = dt.get_date(format="DD MMM, YYYY")
-
-            if current_time != previous_time:
-                time_piece.update_time(current_time)
-                previous_time = current_time
-            if current_date != previous_date:
-                time_piece.update_date(current_date)
-                previous_date = current_date
-
-            time.sleep(1)  # Throttle the loop to avoid excessive CPU usage
-    except Exception as e:
-        app_logger.error(f"[main@flet] An error occurred in the main loop: {e}")
-    finally:
+    await page.add_async(time_piece)
+    world_clock = WorldClockGrid(WORLD_ZONES)
+    await page.add_async(world_clock)
+    await page.update_async()
+
+    # The sub-second display runs its own frames, on the session's event loop
+    display = None
+    if sub_second_rate:
+        display = SubSecondDisplay(time_piece, sub_second_rate)
+        display.start()
+
+    # One process-wide ticker formats every tick once, for all the sessions
+    service = ClockService.shared()
+
+    def subscribe():
+        subscriptions = [service.subscribe_world(world_clock.apply_async, WORLD_ZONES)]
+        if display is None:
+            subscriptions.append(
+                service.subscribe_clock(
+                    time_piece.apply_async,
+                    time_format="hh:mm:ss A",
+                    date_format="DD MMM, YYYY",
+                )
+            )
+        return subscriptions
+
+    subscriptions = subscribe()
+    hidden = False
+
+    async def window_event(e):
+        # Nothing is sent to a hidden window, the subscribers are caught up once it's shown
+        nonlocal subscriptions, hidden
+        if display is not None:
+            await display.on_window_event(e)
+        if _WINDOW_EVENTS.get(e.data) == ("hidden", True) and subscriptions:
+            hidden = True
+            for subscription in subscriptions:
+                subscription.cancel()
+            subscriptions = []
+            app_logger.info("[main@flet] Window hidden, paused the clock")
+        elif _WINDOW_EVENTS.get(e.data) == ("hidden", False) and not subscriptions:
+            hidden = False
+            subscriptions = subscribe()
+            app_logger.info("[main@flet] Window shown, resumed the clock")
+
+    async def start_clock(e):
+        # The client reconnected: the subscribers are caught up with the full values
+        nonlocal subscriptions
+        if display is not None:
+            display.start()
+        if not subscriptions and not hidden:
+            subscriptions = subscribe()
+            app_logger.info("[main@flet] Client reconnected, resumed the clock")
+
+    async def stop_clock(e):
+        # Both `on_disconnect` and `on_close` may come, one after the other
+        nonlocal subscriptions
+        for subscription in subscriptions:
+            subscription.cancel()
+        subscriptions = []
+        if display is not None:
+            display.stop()
         app_logger.info("[main@flet] Clock app terminated")
 
+    page.on_window_event = window_event
+    page.on_connect = start_clock
+    page.on_disconnect = stop_clock
+    page.on_close = stop_clock
 
-ft.app(
-    target=main,
-    assets_dir="assets",
-)
+def run(sub_second_rate: float | None = None):
+    """Launches the Flet app, with the sub-second display at `sub_second_rate` Hz if given"""
+    setup_loggers()  # once per process, every session logs through the same listener
+
+    async def target(page: ft.Page):
+        await main(page, sub_second_rate)
+
+    ft.app(
+        target=target,
+        assets_dir=str(ASSETS_DIR),
+    )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,389 @@
+"""
+Contains the tick stream server, publishing the clock over Server-Sent Events and WebSocket
+Usage:
+>>> python -m clock --serve --port 8765
+>>> curl -N "http://127.0.0.1:8765/events?tz=Asia/Kolkata&time_format=hh:mm:ss%20A"
+>>> curl "http://127.0.0.1:8765/now?tz=UTC"
+>>> websocat "ws://127.0.0.1:8765/ws?tz=Europe/London"
+
+Endpoints (all take the optional `tz`, `time_format` and `date_format` query parameters):
+    /events  a `text/event-stream`, one event per second
+    /ws      a WebSocket, one text message per second
+    /now     the current snapshot, as a one-shot JSON response
+    /metrics the instrumentation (see `clock.backend.metrics`), in the Prometheus text format
+
+Every second, the snapshot of each (tz, time_format, date_format) feed is serialized once
+and the very same bytes are written to all of its subscribers. A subscriber that can't keep
+up (its socket buffer is full) just misses the seconds it can't take, every message being a
+full snapshot, and gets disconnected once it stalled for `max_stall` seconds.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from datetime import tzinfo
+from typing import Literal
+from urllib.parse import parse_qs, urlsplit
+
+from dateutil import tz as dateutil_tz
+
+from clock.backend import metrics
+from clock.backend.api import DateTime, date_data_of, time_data_of
+from clock.backend.formatter import compile_format
+from clock.backend.logger import app_logger
+from clock.backend.ticker import Ticker
+
+DEFAULT_TIME_FORMAT = "HH:mm:ss"
+DEFAULT_DATE_FORMAT = "DD/MM/YYYY"
+MAX_FEEDS = 1024
+MAX_REQUEST_SIZE = 8192
+IDLE_FEED_TIMEOUT = 60  # seconds, before a feed without subscribers is closed
+
+_WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_WS_CLOSE = b"\x88\x00"
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 431: "Too Large"}
+
+FeedKey = tuple[str, str, str]  # (tz, time_format, date_format)
+
+
+def _sse_message(epoch: int, data: bytes) -> bytes:
+    return b"id: %d\ndata: %s\n\n" % (epoch, data)
+
+
+def _ws_frame(data: bytes, opcode: int = 0x1) -> bytes:
+    """An unmasked, final WebSocket frame (servers never mask)"""
+    length = len(data)
+    if length < 126:
+        header = bytes((0x80 | opcode, length))
+    elif length < 1 << 16:
+        header = bytes((0x80 | opcode, 126)) + length.to_bytes(2, "big")
+    else:
+        header = bytes((0x80 | opcode, 127)) + length.to_bytes(8, "big")
+    return header + data
+
+
+class Payload:
+    """A second's snapshot, serialized once in every framing"""
+
+    __slots__ = ("second", "json", "sse", "ws")
+
+    def __init__(self, second: int, data: bytes) -> None:
+        self.second = second
+        self.json = data
+        self.sse = _sse_message(second, data)
+        self.ws = _ws_frame(data)
+
+
+class Feed:
+    """The snapshots of a time zone and formats, cached for the current second"""
+
+    def __init__(self, key: FeedKey, tz: tzinfo | None) -> None:
+        self.key = key
+        self.date_time = DateTime(tz)
+        self.time_plan = compile_format(key[1])
+        self.date_plan = compile_format(key[2])
+        self.subscribers: set["ClockProtocol"] = set()
+        self.last_used = time.monotonic()
+        self._payload: Payload | None = None
+
+    def payload(self, second: int | None = None) -> Payload:
+        """Returns the payload of the (current) second, serializing it on the first ask"""
+        if second is None:
+            second = self.date_time.source.time_ns() // 1_000_000_000
+        if self._payload is not None and self._payload.second == second:
+            return self._payload
+
+        dt = self.date_time.as_datetime(second)
+        time_data, date_data = time_data_of(dt), date_data_of(dt)
+        data = json.dumps(
+            {
+                "epoch": second,
+                "tz": self.key[0],
+                "time": self.time_plan.render(dt),
+                "date": self.date_plan.render(dt),
+                "time_data": time_data.asdict(),
+                "date_data": date_data.asdict(),
+            },
+            separators=(",", ":"),
+        ).encode()
+        self._payload = Payload(second, data)
+        return self._payload
+
+
+class ClockProtocol(asyncio.Protocol):
+    """A single connection: parses the request, then streams the feed (or answers once)"""
+
+    def __init__(self, server: "TickServer") -> None:
+        self.server = server
+        self.transport: asyncio.Transport | None = None
+        self.buffer = b""
+        self.kind: Literal["sse", "ws"] | None = None
+        self.feed: Feed | None = None
+        self.paused_since: float | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore
+        self.transport.set_write_buffer_limits(high=self.server.write_buffer)  # type: ignore
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        if self.feed is not None:
+            self.server.unsubscribe(self)
+        self.transport = None
+
+    def pause_writing(self) -> None:
+        self.paused_since = time.monotonic()
+
+    def resume_writing(self) -> None:
+        self.paused_since = None
+
+    def data_received(self, data: bytes) -> None:
+        if self.kind == "ws":
+            self.buffer += data
+            self._ws_received()
+        elif self.kind is None:
+            self.buffer += data
+            end = self.buffer.find(b"\r\n\r\n")
+            if end > MAX_REQUEST_SIZE or (end < 0 and len(self.buffer) > MAX_REQUEST_SIZE):
+                self._respond(431, b"Request Header Fields Too Large")
+            elif end >= 0:
+                self._request_received()
+        # the SSE clients have nothing to say
+
+    def send(self, payload: Payload) -> bool:
+        """Writes the payload, unless the client stalls. Returns whether it was written"""
+        if self.paused_since is not None:
+            return False
+        self.transport.write(payload.ws if self.kind == "ws" else payload.sse)  # type: ignore
+        return True
+
+    def _respond(self, status: int, body: bytes, content_type: str = "text/plain") -> None:
+        reason = _REASONS.get(status, "Error")
+        self.transport.write(  # type: ignore
+            b"HTTP/1.1 %d %s\r\nContent-Type: %s\r\nContent-Length: %d\r\n"
+            b"Access-Control-Allow-Origin: *\r\nConnection: close\r\n\r\n%s"
+            % (status, reason.encode(), content_type.encode(), len(body), body)
+        )
+        self.transport.close()  # type: ignore
+
+    def _request_received(self) -> None:
+        head = self.buffer.split(b"\r\n\r\n", 1)[0].decode("latin-1")
+        self.buffer = b""
+        request_line, *header_lines = head.split("\r\n")
+        try:
+            method, target, _ = request_line.split(" ", 2)
+        except ValueError:
+            return self._respond(400, b"Malformed request line")
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        url = urlsplit(target)
+        if method != "GET" or url.path not in ("/events", "/ws", "/now", "/metrics"):
+            return self._respond(404, b"Not Found")
+        if url.path == "/metrics":
+            return self._respond(200, metrics.render().encode(), "text/plain; version=0.0.4")
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            feed = self.server.feed(
+                query.get("tz", "local"),
+                query.get("time_format", DEFAULT_TIME_FORMAT),
+                query.get("date_format", DEFAULT_DATE_FORMAT),
+            )
+        except ValueError as e:
+            return self._respond(400, str(e).encode())
+
+        match url.path:
+            case "/now":
+                self._respond(200, feed.payload().json, "application/json")
+            case "/events":
+                self.transport.write(  # type: ignore
+                    b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                    b"Cache-Control: no-cache\r\nAccess-Control-Allow-Origin: *\r\n"
+                    b"Connection: keep-alive\r\n\r\n"
+                )
+                self.kind = "sse"
+                self.server.subscribe(self, feed)
+            case "/ws":
+                key = headers.get("sec-websocket-key")
+                if headers.get("upgrade", "").lower() != "websocket" or not key:
+                    return self._respond(400, b"Expected a WebSocket upgrade")
+                accept = base64.b64encode(hashlib.sha1(key.encode() + _WS_GUID).digest())
+                self.transport.write(  # type: ignore
+                    b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                    b"Connection: Upgrade\r\nSec-WebSocket-Accept: %s\r\n\r\n" % accept
+                )
+                self.kind = "ws"
+                self.server.subscribe(self, feed)
+
+    def _ws_received(self) -> None:
+        """Answers the pings and the close of the client, its other messages are ignored"""
+        while len(self.buffer) >= 2:
+            opcode = self.buffer[0] & 0x0F
+            masked = self.buffer[1] & 0x80
+            length = self.buffer[1] & 0x7F
+            offset = 2
+            if length == 126:
+                if len(self.buffer) < 4:
+                    return
+                length, offset = int.from_bytes(self.buffer[2:4], "big"), 4
+            elif length == 127:
+                if len(self.buffer) < 10:
+                    return
+                length, offset = int.from_bytes(self.buffer[2:10], "big"), 10
+            if length > MAX_REQUEST_SIZE:
+                self.transport.abort()  # type: ignore
+                return
+            mask = self.buffer[offset : offset + 4] if masked else b"\x00" * 4
+            offset += 4 if masked else 0
+            if len(self.buffer) < offset + length:
+                return
+            data = bytes(
+                byte ^ mask[index % 4]
+                for index, byte in enumerate(self.buffer[offset : offset + length])
+            )
+            self.buffer = self.buffer[offset + length :]
+
+            if opcode == 0x8:  # close
+                self.transport.write(_WS_CLOSE)  # type: ignore
+                self.transport.close()  # type: ignore
+                return
+            if opcode == 0x9:  # ping
+                self.transport.write(_ws_frame(data, opcode=0xA))  # type: ignore
+
+
+class TickServer:
+    """Serves the feeds, and writes every second's payload to all the subscribers"""
+
+    logger = app_logger.getChild("server")
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        max_stall: float = 10.0,
+        write_buffer: int = 64 * 1024,
+    ) -> None:
+        self.class_name = f"[{self.__class__.__name__}]"
+        self.host = host
+        self.port = port
+        self.max_stall = max_stall
+        self.write_buffer = write_buffer
+        self.feeds: dict[FeedKey, Feed] = {}
+        self.ticker = Ticker()
+        self.skipped = 0  # messages not written to the stalling subscribers
+        self._zones: dict[str, tzinfo | None] = {"local": None}
+
+        self.logger.info(f"{self.class_name} Initialized on {host}:{port}")
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(feed.subscribers) for feed in self.feeds.values())
+
+    def _zone(self, name: str) -> tzinfo | None:
+        if name not in self._zones:
+            tz = dateutil_tz.gettz(name)
+            if tz is None:
+                raise ValueError(f"Unknown time zone {name!r}")
+            self._zones[name] = tz
+        return self._zones[name]
+
+    def feed(self, tz: str, time_format: str, date_format: str) -> Feed:
+        """Returns the feed of the time zone and the formats, opening it if needed"""
+        key = (tz, time_format, date_format)
+        feed = self.feeds.get(key)
+        if feed is None:
+            if len(self.feeds) >= MAX_FEEDS:
+                raise ValueError("Too many distinct feeds")
+            self.logger.debug(f"{self.class_name} Opening the feed: {key}")
+            feed = self.feeds[key] = Feed(key, self._zone(tz))
+        feed.last_used = time.monotonic()
+        return feed
+
+    def subscribe(self, protocol: ClockProtocol, feed: Feed) -> None:
+        protocol.feed = feed
+        feed.subscribers.add(protocol)
+        protocol.send(feed.payload())  # the current second, without waiting for the next
+
+    def unsubscribe(self, protocol: ClockProtocol) -> None:
+        if protocol.feed is not None:
+            protocol.feed.subscribers.discard(protocol)
+            protocol.feed.last_used = time.monotonic()
+            protocol.feed = None
+
+    def tick(self, deadline: float) -> None:
+        """Serializes each feed once, and writes it to all of its subscribers"""
+        second = round(deadline)
+        now = time.monotonic()
+        start = time.perf_counter()
+        sent = 0
+        for key, feed in list(self.feeds.items()):
+            if not feed.subscribers:
+                if now - feed.last_used > IDLE_FEED_TIMEOUT:
+                    self.logger.debug(f"{self.class_name} Closing the idle feed: {key}")
+                    del self.feeds[key]
+                continue
+
+            payload = feed.payload(second)
+            for protocol in list(feed.subscribers):
+                if protocol.send(payload):
+                    sent += 1
+                    continue
+                self.skipped += 1
+                if now - protocol.paused_since > self.max_stall:  # type: ignore
+                    self.logger.debug(f"{self.class_name} Dropping a stalled subscriber")
+                    self.unsubscribe(protocol)
+                    protocol.transport.abort()  # type: ignore
+
+        self.logger.debug(
+            f"{self.class_name} Sent {sent} messages in {time.perf_counter() - start:.4f}s"
+        )
+
+    async def serve(self) -> None:
+        """Serves until cancelled"""
+        loop = asyncio.get_running_loop()
+        server = await loop.create_server(
+            lambda: ClockProtocol(self), self.host, self.port, backlog=4096
+        )
+        self.logger.info(f"{self.class_name} Serving on http://{self.host}:{self.port}")
+        try:
+            async with server:
+                # Looked up on every tick, so that `metrics.enable()` times it from then on
+                await self.ticker.run(lambda deadline: self.tick(deadline))
+        finally:
+            self.logger.info(f"{self.class_name} Stopped serving")
+
+
+metrics.instrument(
+    TickServer,
+    "tick",
+    metrics.Histogram(
+        "clock_tick_fanout_seconds",
+        "The duration of computing a tick and handing it to the subscribers",
+        {"owner": "server"},
+    ),
+)
+
+
+def raise_open_files_limit() -> int | None:
+    """Raises the soft limit of open files up to the hard one (every client is a socket),
+    returns the new limit (`None` where there are no such limits)"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return hard
+
+
+def run(host: str = "127.0.0.1", port: int = 8765) -> None:
+    """Runs the tick stream server until interrupted"""
+    raise_open_files_limit()
+    try:
+        asyncio.run(TickServer(host, port).serve())
+    except KeyboardInterrupt:
+        pass
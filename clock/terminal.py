@@ -0,0 +1,172 @@
+"""
+Contains the headless terminal clock, for the boxes without a display
+Usage:
+>>> python -m clock --terminal --show timedate
+>>> asyncio.run(TerminalClock(show="time").run())
+
+On a terminal, the lines are drawn once and then only the characters that changed are
+rewritten in place (a second usually costs a couple of bytes). Nothing is drawn while the
+process is in the background of its terminal. When the output is piped, a plain line is
+written each time the shown text changes.
+"""
+
+import asyncio
+import os
+import signal
+import sys
+from datetime import tzinfo
+from typing import TextIO
+
+from clock.backend import metrics
+from clock.backend.api import DateTime
+from clock.backend.logger import app_logger
+from clock.backend.renderer import SHOW_LINES, ChangeSet, IncrementalRenderer, Show
+from clock.backend.ticker import Ticker
+
+_HIDE_CURSOR = "\x1b[?25l"
+_SHOW_CURSOR = "\x1b[?25h"
+
+
+def _column(column: int) -> str:
+    return f"\x1b[{column + 1}G"
+
+
+def _rows(rows: int) -> str:
+    """Moves the cursor up (negative) or down (positive) by the rows"""
+    if rows < 0:
+        return f"\x1b[{-rows}A"
+    return f"\x1b[{rows}B" if rows else ""
+
+
+def diff_line(old: str, new: str) -> str:
+    """Returns the escape sequences rewriting `old` into `new`, touching only the changed runs
+    (on the cursor's row)"""
+    width = max(len(old), len(new))
+    old, new = old.ljust(width), new.ljust(width)
+    output = []
+    index = 0
+    while index < width:
+        if old[index] == new[index]:
+            index += 1
+            continue
+        start = index
+        while index < width and old[index] != new[index]:
+            index += 1
+        output.append(_column(start) + new[start:index])
+    return "".join(output)
+
+
+class TerminalClock:
+    """Draws the time / date lines of the `show` mode, like `TimePiece` does in the app"""
+
+    logger = app_logger.getChild("app.terminal")
+
+    def __init__(
+        self,
+        show: Show = "timedate",
+        tz: tzinfo | None = None,
+        time_format: str = "hh:mm:ss A",
+        date_format: str = "DD MMM, YYYY",
+        file: TextIO | None = None,
+    ) -> None:
+        self.class_name = f"[{self.__class__.__name__}@terminal]"
+        self.show: Show = show
+        self.fields = SHOW_LINES[show]
+        self.file = file if file is not None else sys.stdout
+        self.is_terminal = self.file.isatty()
+        self.renderer = IncrementalRenderer(DateTime(tz), time_format, date_format)
+        self.ticker = Ticker()
+
+        self.values = {"time": "", "date": ""}
+        self.lines: list[str] | None = None  # what the terminal shows, `None` before drawing
+        self._redraw = False
+
+        self.logger.info(f"{self.class_name} Initialized (terminal={self.is_terminal})")
+        self.logger.debug(f"{self.class_name} Information to show: {show}")
+
+    def _visible(self) -> bool:
+        """Whether the process is in the foreground of its terminal"""
+        try:
+            return os.tcgetpgrp(self.file.fileno()) == os.getpgrp()
+        except (AttributeError, OSError):  # no job control (e.g. Windows)
+            return True
+
+    def _draw(self, lines: list[str]) -> str:
+        if self.lines is None or self._redraw or len(self.lines) != len(lines):
+            self._redraw = False
+            if self.lines is None:
+                return _HIDE_CURSOR + "\n".join(lines)
+            # Back to the first line, and clear the rest of the screen before drawing
+            return f"\r{_rows(1 - len(self.lines))}\x1b[J" + "\n".join(lines)
+
+        output = []
+        row = len(lines) - 1  # the cursor rests on the last line
+        for index, (old, new) in enumerate(zip(self.lines, lines)):
+            if old != new:
+                output.append(_rows(index - row) + diff_line(old, new))
+                row = index
+        output.append(_rows(len(lines) - 1 - row))
+        return "".join(output)
+
+    def apply(self, changes: ChangeSet) -> None:
+        """Writes the strings that changed since the last tick"""
+        if changes.time is not None:
+            self.values["time"] = changes.time
+        if changes.date is not None:
+            self.values["date"] = changes.date
+        lines = [self.values[field] for field in self.fields]
+        if lines == self.lines and not self._redraw:
+            return
+
+        if self.is_terminal:
+            self.file.write(self._draw(lines))
+        else:
+            self.file.write(" ".join(lines) + "\n")
+        self.file.flush()
+        self.lines = lines
+
+    def tick(self, _: float = 0) -> None:
+        if self.is_terminal and not self._visible():
+            return  # the terminal shows another job, keep the work for when it is back
+        self.apply(self.renderer.tick())
+
+    def _resized(self) -> None:
+        self.logger.debug(f"{self.class_name} Terminal resized, redrawing")
+        self._redraw = True
+
+    async def run(self) -> None:
+        """Draws every second, until cancelled"""
+        loop = asyncio.get_running_loop()
+        if self.is_terminal:
+            try:
+                loop.add_signal_handler(signal.SIGWINCH, self._resized)
+            except (AttributeError, NotImplementedError):  # no SIGWINCH (e.g. Windows)
+                pass
+        self.tick()
+        try:
+            await self.ticker.run(self.tick)
+        finally:
+            if self.is_terminal:
+                self.file.write(_SHOW_CURSOR + "\n")
+                self.file.flush()
+                try:
+                    loop.remove_signal_handler(signal.SIGWINCH)
+                except (AttributeError, NotImplementedError):
+                    pass
+
+
+metrics.instrument(
+    TerminalClock,
+    "apply",
+    metrics.Histogram(
+        "clock_ui_update_seconds", "The duration of the UI updates", {"control": "terminal"}
+    ),
+)
+
+
+def run(show: Show = "timedate") -> None:
+    """Runs the terminal clock until interrupted"""
+    try:
+        asyncio.run(TerminalClock(show=show).run())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+
+import arrow
+import pytest
+from dateutil import tz as dateutil_tz
+
+from clock.backend.api import DateData, DateTime, Snapshot, TimeData
+from clock.backend.source import FrozenClock
+
+# The clocks go back in London at this instant
+TRANSITION = 1_729_990_800
+
+
+@pytest.mark.parametrize("zone", ["Europe/London", "Australia/Lord_Howe", "Asia/Kolkata"])
+@pytest.mark.parametrize("step", [timedelta(minutes=7), 45.5, timedelta(hours=25)])
+def test_snapshot_range_matches_the_snapshots_one_by_one(zone, step):
+    dt = DateTime(dateutil_tz.gettz(zone), source=FrozenClock(TRANSITION))
+    start, end = TRANSITION - 3 * 86_400, TRANSITION + 3 * 86_400
+    seconds = step.total_seconds() if isinstance(step, timedelta) else step
+    epochs = [start + index * seconds for index in range(int((end - start) // seconds) + 1)]
+    assert list(dt.snapshot_range(start, end, step)) == [dt.snapshot(epoch) for epoch in epochs]
+
+
+def test_whole_days_keep_the_wall_time():
+    london = dateutil_tz.gettz("Europe/London")
+    dt = DateTime(london, source=FrozenClock(TRANSITION))
+    start = datetime(2024, 10, 24, 12, 30)
+    snapshots = list(dt.snapshot_range(start, datetime(2024, 10, 30, 12, 30), timedelta(days=1)))
+    assert [snapshot.date.astuple()[2] for snapshot in snapshots] == list(range(24, 31))
+    assert {snapshot.time.astuple() for snapshot in snapshots} == {(12, 30, 0, 0)}
+
+
+@pytest.mark.parametrize("zone", ["UTC", "Europe/London", "Asia/Kolkata"])
+def test_snapshot_matches_arrow(zone):
+    tz = dateutil_tz.gettz(zone)
+    dt = DateTime(tz, source=FrozenClock(1_700_000_000.25))
+    for epoch in (0, 1_700_000_000.25, TRANSITION - 0.5, TRANSITION, 951_782_400):
+        instant = arrow.get(epoch, tzinfo=tz)
+        snapshot = dt.snapshot(epoch)
+        assert snapshot == dt.snapshot(instant)
+        assert snapshot.time.asdict() == {
+            "hour": instant.format("hh"),
+            "minute": instant.format("mm"),
+            "second": instant.format("ss"),
+            "sub_second": instant.format("S"),
+            "session": instant.format("A"),
+        }
+        assert snapshot.date.asdict() == {
+            "day": instant.format("DD"),
+            "month": instant.format("MMM"),
+            "year": instant.format("YYYY"),
+        }
+        assert snapshot == Snapshot(dt.get_time_data(instant), dt.get_date_data(instant))
+
+
+def test_snapshot_reads_the_clock_once():
+    clock = FrozenClock(1_700_000_000)
+    dt = DateTime(dateutil_tz.UTC, source=clock)
+    assert dt.snapshot().time.astuple() == (22, 13, 20, 0)
+    clock.advance(86_400 + 1.5)
+    snapshot = dt.snapshot()
+    assert snapshot.time.astuple() == (22, 13, 21, 500_000)
+    assert snapshot.date.astuple() == (2023, 11, 15)
+
+
+def test_snapshot_many_keeps_the_order():
+    dt = DateTime(dateutil_tz.UTC, source=FrozenClock(0))
+    epochs = [1_700_000_000, 0, arrow.get(951_782_400)]
+    assert dt.snapshot_many(epochs) == [dt.snapshot(epoch) for epoch in epochs]
+    assert dt.snapshot_many([]) == []
+
+
+def test_time_data_renders_like_arrow():
+    day = datetime(2024, 3, 5)
+    for hour in range(24):
+        for minute, second, microsecond in ((0, 0, 0), (7, 59, 999_999), (59, 5, 100_000)):
+            instant = arrow.get(day.replace(hour=hour, minute=minute, second=second))
+            instant = instant.replace(microsecond=microsecond)
+            data = TimeData(hour, minute, second, microsecond)
+            assert data.asdict() == {
+                "hour": instant.format("hh"),
+                "minute": instant.format("mm"),
+                "second": instant.format("ss"),
+                "sub_second": instant.format("S"),
+                "session": instant.format("A"),
+            }
+            assert data.astuple() == (hour, minute, second, microsecond)
+
+
+def test_date_data_renders_like_arrow():
+    for year, month, day in ((1, 1, 1), (999, 2, 9), (2024, 2, 29), (9999, 12, 31)):
+        instant = arrow.get(datetime(year, month, day))
+        data = DateData(year, month, day)
+        assert data.asdict() == {
+            "day": instant.format("DD"),
+            "month": instant.format("MMM"),
+            "year": instant.format("YYYY"),
+        }
+        assert data.astuple() == (year, month, day)
+
+
+def test_data_are_compact_values():
+    time_data, date_data = TimeData(22, 13, 20), DateData(2023, 11, 14)
+    for data in (time_data, date_data):
+        assert not hasattr(data, "__dict__")
+    assert time_data == TimeData(22, 13, 20, 0) and time_data != TimeData(22, 13, 21)
+    assert date_data == DateData(2023, 11, 14) and date_data != DateData(2023, 11, 15)
+    assert len({time_data, TimeData(22, 13, 20), date_data, DateData(2023, 11, 14)}) == 2
+    assert time_data != date_data
+    assert repr(time_data) == (
+        "TimeData(hour='10', minute='13', second='20', sub_second='0', session='PM')"
+    )
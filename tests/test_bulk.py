@@ -0,0 +1,40 @@
+import random
+from datetime import datetime
+
+import pytest
+from dateutil import tz as dateutil_tz
+
+from clock.backend.formatter import compile_format
+
+np = pytest.importorskip("numpy")
+from clock.backend.bulk import format_many  # noqa: E402
+
+FORMATS = [
+    "DD MMM, YYYY hh:mm:ss A",
+    "YYYY-MM-DD HH:mm:ss.SSSSSS ZZ",
+    "dddd, Do MMMM YY h:m:s a",
+    "ddd d DDDD DDD Z",
+    # With tokens that have no fast path
+    "W ZZZ X",
+    "dd [dd] YYY-MM",
+]
+ZONES = ["UTC", "Europe/London", "Asia/Kolkata", "America/St_Johns", "Australia/Lord_Howe"]
+
+
+@pytest.mark.parametrize("format", FORMATS)
+@pytest.mark.parametrize("zone", ZONES)
+def test_format_many_matches_the_compiled_format(format, zone):
+    tz = dateutil_tz.gettz(zone)
+    rng = random.Random(11)
+    # Around the London transitions of 2024, and anywhere from 1900 to 2100
+    epochs = [1_711_846_800 + rng.randrange(-7_200, 7_200) for _ in range(200)]
+    epochs += [1_729_990_800 + rng.randrange(-7_200, 7_200) for _ in range(200)]
+    epochs += [rng.randrange(-2_208_988_800, 4_102_444_800) for _ in range(200)]
+    microseconds = [epoch * 1_000_000 + rng.randrange(1_000_000) for epoch in epochs]
+
+    plan = compile_format(format)
+    expected = []
+    for us in microseconds:
+        dt = datetime.fromtimestamp(us // 1_000_000, tz)
+        expected.append(plan.render(dt.replace(microsecond=us % 1_000_000)))
+    assert format_many(np.array(microseconds), format, tz=tz, unit="us").tolist() == expected
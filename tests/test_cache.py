@@ -0,0 +1,104 @@
+import gc
+import random
+import threading
+import weakref
+from datetime import datetime, timedelta, tzinfo
+
+from dateutil import tz as dateutil_tz
+
+from clock.backend import metrics
+from clock.backend.api import DateTime
+from clock.backend.cache import ClockCache
+from clock.backend.formatter import compile_format
+from clock.backend.source import FrozenClock
+
+LONDON = dateutil_tz.gettz("Europe/London")
+KOLKATA = dateutil_tz.gettz("Asia/Kolkata")
+# The clocks go forward in London at this instant
+TRANSITION = 1_711_846_800
+
+
+def test_values_match_the_uncached_ones_around_a_transition():
+    cache = ClockCache()
+    rng = random.Random(7)
+    for _ in range(5_000):
+        microseconds = (TRANSITION + rng.randrange(-200_000, 200_000)) * 1_000_000
+        microseconds += rng.randrange(1_000_000)
+        for tz in (LONDON, KOLKATA):
+            dt = datetime.fromtimestamp(microseconds / 1_000_000, tz)
+            second = datetime.fromtimestamp(microseconds // 1_000_000, tz)
+            assert cache.format("DD MMM, YYYY hh:mm:ss A", tz, at=microseconds) == (
+                compile_format("DD MMM, YYYY hh:mm:ss A").render(second)
+            )
+            assert cache.date_data(tz, at=microseconds).astuple() == (
+                dt.year,
+                dt.month,
+                dt.day,
+            )
+            assert cache.time_data(tz, at=microseconds).astuple() == (
+                dt.hour,
+                dt.minute,
+                dt.second,
+                dt.microsecond // 100_000 * 100_000,
+            )
+
+
+def test_concurrent_misses_compute_once():
+    cache = ClockCache(FrozenClock(1_700_000_000))
+    barrier = threading.Barrier(16)
+    results = []
+
+    def read() -> None:
+        barrier.wait()
+        for _ in range(500):
+            results.append(cache.format("hh:mm:ss A", KOLKATA))
+            cache.time_data(KOLKATA)
+            cache.date_data(KOLKATA)
+
+    metrics.enable()
+    try:
+        metrics.reset()
+        threads = [threading.Thread(target=read) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        computed = metrics.snapshot()["clock_cache_computed_total"]
+    finally:
+        metrics.disable()
+
+    assert computed == 3
+    assert set(results) == {"03:43:20 AM"}
+
+
+class OneHour(tzinfo):
+    """A fresh `tzinfo` object every time (dateutil caches its `tzoffset`s)"""
+
+    def utcoffset(self, dt):
+        return timedelta(hours=1)
+
+    def dst(self, dt):
+        return timedelta(0)
+
+
+def test_the_time_zones_are_bounded_and_released():
+    cache = ClockCache(FrozenClock(1_700_000_000), max_entries=8)
+    references = []
+    for _ in range(100):
+        tz = OneHour()
+        references.append(weakref.ref(tz))
+        assert cache.format("HH:mm", tz) == "23:13"
+        del tz
+    assert len(cache._slots) <= 8
+    cache.clear()
+    gc.collect()
+    assert all(reference() is None for reference in references)
+
+
+def test_date_time_through_the_cache():
+    clock = FrozenClock(1_700_000_000.25)
+    cached = DateTime(LONDON, source=clock, cache=ClockCache(clock))
+    plain = DateTime(LONDON, source=clock)
+    assert cached.get_time("hh:mm:ss A") == plain.get_time("hh:mm:ss A")
+    assert cached.get_date_data() == plain.get_date_data()
+    assert cached.get_time_data().astuple() == (22, 13, 20, 200_000)
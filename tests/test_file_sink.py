@@ -0,0 +1,111 @@
+import gzip
+import time
+from types import SimpleNamespace
+
+from clock.backend.logger import _file_sink
+from clock.backend.logger._file_sink import RotatingFileSink, close_all_sinks
+
+# Long enough for the background thread to stay out of the way
+NEVER = 3600.0
+LINE = "x" * 39 + "\n"
+
+
+def _segments(sink: RotatingFileSink) -> list[str]:
+    return sorted(path.name for path in sink.path.parent.glob(f"{sink.path.name}.*"))
+
+
+def test_the_writes_are_buffered_until_synced(tmp_path):
+    sink = RotatingFileSink(tmp_path / "app.log", flush_interval=NEVER, max_bytes=None)
+    try:
+        assert sink.write("first\n") == 6
+        assert sink.path.read_text() == ""
+        sink.sync()
+        assert sink.path.read_text() == "first\n"
+        sink.write("second\n")
+    finally:
+        sink.close()
+    assert sink.path.read_text() == "first\nsecond\n"
+
+    # Written right away once closed, e.g. by the records logged during the exit
+    sink.write("third\n")
+    assert sink.path.read_text().endswith("second\nthird\n")
+
+
+def test_a_full_buffer_is_written_out_right_away(tmp_path):
+    sink = RotatingFileSink(
+        tmp_path / "app.log", buffer_size=100, flush_interval=NEVER, max_bytes=None
+    )
+    try:
+        sink.write(LINE * 2)
+        assert sink.path.read_text() == ""
+        sink.write(LINE)
+        assert sink.path.read_text() == LINE * 3
+    finally:
+        sink.close()
+
+
+def test_rotates_by_size_and_keeps_the_last_backups(tmp_path):
+    sink = RotatingFileSink(
+        tmp_path / "app.log",
+        flush_interval=NEVER,
+        max_bytes=100,
+        backup_count=2,
+        compress=False,
+    )
+    try:
+        for index in range(10):
+            sink.write(f"{index:02d}" + LINE[2:])
+            sink.sync()
+    finally:
+        sink.close()
+
+    segments = _segments(sink)
+    assert len(segments) == 2
+    # Each segment is rotated right after the write that filled it
+    for name in segments:
+        assert (tmp_path / name).stat().st_size == 120
+    newest = (tmp_path / segments[-1]).read_text()
+    assert newest.startswith("06") and newest.splitlines()[-1].startswith("08")
+    assert sink.path.read_text().splitlines()[0].startswith("09")
+
+
+def test_the_rotated_segments_are_compressed(tmp_path):
+    sink = RotatingFileSink(
+        tmp_path / "app.log", flush_interval=NEVER, max_bytes=100, backup_count=3
+    )
+    try:
+        sink.write(LINE * 3)
+        sink.sync()
+        sink.write("current\n")
+    finally:
+        sink.close()
+    close_all_sinks()  # waits for the pending compressions
+
+    [segment] = _segments(sink)
+    assert segment.endswith(".gz")
+    assert gzip.decompress((tmp_path / segment).read_bytes()).decode() == LINE * 3
+    assert sink.path.read_text() == "current\n"
+
+
+def test_rotates_at_the_hour(tmp_path, monkeypatch):
+    now = time.time()
+    clock = SimpleNamespace(time=lambda: now)
+    monkeypatch.setattr(_file_sink, "time", clock)
+    sink = RotatingFileSink(
+        tmp_path / "app.log", flush_interval=NEVER, max_bytes=None, when="hour", compress=False
+    )
+    try:
+        sink.write("this hour\n")
+        sink.sync()
+        assert _segments(sink) == []
+
+        now += 3600
+        # The first record of the next hour goes to a new segment
+        sink.write("next hour\n")
+        [segment] = _segments(sink)
+        assert (tmp_path / segment).read_text() == "this hour\n"
+
+        sink.sync()
+        assert sink.path.read_text() == "next hour\n"
+    finally:
+        sink.close()
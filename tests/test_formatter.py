@@ -0,0 +1,35 @@
+import arrow
+import pytest
+from dateutil import tz as dateutil_tz
+
+from clock.backend.formatter import compile_format
+
+FORMATS = [
+    "hh:mm:ss A",
+    "DD MMM, YYYY",
+    "YYYY-MM-DD HH:mm:ss.SSSSSS ZZ",
+    "dddd, Do MMMM YY [at] h:m:s a",
+    "ddd d DDDD DDD W ZZZ Z X x",
+    "S SS SSS SSSS SSSSS",
+    # Matched by Arrow's token pattern, but not rendered
+    "dd",
+    "YYY",
+    "dddddd",
+    "[dd] dd YYY-MM",
+]
+EPOCHS = [0, 1_700_000_000.123456, 1_711_846_799.999999, 1_711_846_800, 951_782_400]
+ZONES = ["UTC", "Europe/London", "Asia/Kolkata", "America/St_Johns"]
+
+
+@pytest.mark.parametrize("format", FORMATS)
+@pytest.mark.parametrize("zone", ZONES)
+def test_render_matches_arrow(format, zone):
+    plan = compile_format(format)
+    for epoch in EPOCHS:
+        instant = arrow.get(epoch, tzinfo=dateutil_tz.gettz(zone))
+        assert plan.render(instant.datetime) == instant.format(format)
+
+
+def test_unrendered_tokens_are_empty():
+    dt = arrow.get(1_700_000_000).datetime
+    assert compile_format("a dd b").render(dt) == "pm  b"
@@ -0,0 +1,35 @@
+import logging
+
+from clock.backend.logger import configure_present_loggers, stop_queued_logging
+
+
+class ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+def test_queued_loggers_share_one_listener():
+    first, second = logging.getLogger("test.first"), logging.getLogger("test.second")
+    first.setLevel(logging.DEBUG)
+    second.setLevel(logging.DEBUG)
+    first_handler, second_handler = ListHandler(), ListHandler()
+    try:
+        configure_present_loggers([first], [first_handler], queued=True, when_full="block")
+        first.info("before %s", 1)
+        configure_present_loggers([second], [second_handler], queued=True, when_full="block")
+        first.info("after")
+        second.info("second")
+        # More than the queue holds: the first listener must still be draining it
+        for _ in range(20_000):
+            first.debug("filler")
+    finally:
+        stop_queued_logging()
+        first.handlers, second.handlers = [], []
+
+    assert first_handler.messages[:2] == ["before 1", "after"]
+    assert len(first_handler.messages) == 20_002
+    assert second_handler.messages == ["second"]
@@ -0,0 +1,39 @@
+from clock.backend import metrics
+from clock.backend.service import Channel, Subscription
+
+LATENCY = metrics.Histogram("test_on_value_seconds", "A subscriber's callback")
+
+
+class Control:
+    def __init__(self) -> None:
+        self.values: list[int] = []
+
+    def on_value(self, value: int) -> None:
+        self.values.append(value)
+
+
+metrics.instrument(Control, "on_value", LATENCY)
+
+
+class Latest(Channel):
+    def compute(self, epoch: float) -> int:
+        return int(epoch)
+
+    def current(self) -> int:
+        return 0
+
+
+def test_a_callback_subscribed_before_enable_is_timed():
+    control = Control()
+    subscription = Subscription(None, "key", control.on_value)  # type: ignore[arg-type]
+    metrics.enable()
+    try:
+        metrics.reset()
+        subscription.deliver(1, Latest())
+        subscription.deliver(2, Latest())
+        count = LATENCY.snapshot().count
+    finally:
+        metrics.disable()
+
+    assert control.values == [1, 2]
+    assert count == 2
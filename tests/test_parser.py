@@ -0,0 +1,79 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import arrow
+import pytest
+from dateutil import tz as dateutil_tz
+
+from clock.backend.parser import parse_many
+from clock.backend.source import ReplayClock
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ZONES = ["UTC", "Asia/Kolkata", "America/New_York", "Pacific/Kiritimati"]
+
+
+@pytest.mark.parametrize("zone", ZONES)
+@pytest.mark.parametrize(
+    "string, format",
+    [
+        ("10:13:20 PM", "hh:mm:ss A"),
+        ("00:00:00", "HH:mm:ss"),
+        ("23:59:59", "HH:mm:ss"),
+        ("9999-12-31 23:59:59", "YYYY-MM-DD HH:mm:ss"),
+    ],
+)
+def test_time_only_and_edge_years_match_arrow(zone, string, format):
+    tz = dateutil_tz.gettz(zone)
+    assert parse_many([string], format, tz=tz) == [
+        arrow.get(string, format, tzinfo=tz).int_timestamp
+    ]
+
+
+@pytest.mark.parametrize("zone", ZONES + ["Europe/London", "Australia/Lord_Howe"])
+@pytest.mark.parametrize(
+    "format",
+    [
+        "DD MMM, YYYY hh:mm:ss A",
+        "YYYY-MM-DD HH:mm:ss.SSSSSS",
+        "YYYY-MM-DDTHH:mm:ssZZ",
+        "dddd, MMMM Do YYYY h:mm:ss a",
+        "ddd, D MMM YY H:m:s.SSS Z",
+        "YYYY-DDDD HH:mm:ss",
+    ],
+)
+def test_dates_and_times_match_arrow(zone, format):
+    tz = dateutil_tz.gettz(zone)
+    rng = random.Random(13)
+    # Around the London transitions of 2024, and anywhere from 1970 to 2069
+    epochs = [1_711_846_800 + rng.randrange(-7_200, 7_200) for _ in range(50)]
+    epochs += [1_729_990_800 + rng.randrange(-7_200, 7_200) for _ in range(50)]
+    epochs += [rng.randrange(0, 3_155_760_000) for _ in range(50)]
+    strings = [
+        arrow.get(epoch + rng.randrange(1_000_000) / 1_000_000, tzinfo=tz).format(format)
+        for epoch in epochs
+    ]
+    # The time zone is only for the strings with no UTC offset, Arrow's `tzinfo` replaces it
+    tzinfo = {} if "Z" in format else {"tzinfo": tz}
+    expected = []
+    for string in strings:
+        parsed = arrow.get(string, format, **tzinfo)
+        expected.append((parsed.datetime - EPOCH) // timedelta(microseconds=1))
+    assert parse_many(strings, format, tz=tz, unit="us") == expected
+
+
+def test_skip_keeps_the_time_only_rows():
+    assert parse_many(
+        ["10:13:20 PM", "garbage", "10:13:21 PM"],
+        "hh:mm:ss A",
+        tz=dateutil_tz.UTC,
+        errors="skip",
+    ) == [-62135516800, -62135516799]
+
+
+def test_replay_of_a_time_only_format(tmp_path):
+    file = tmp_path / "stamps.log"
+    file.write_text("10:13:20 PM\n10:13:21 PM\n")
+    clock = ReplayClock.from_file(file, "hh:mm:ss A", tz=dateutil_tz.UTC)
+    assert clock.time() == -62135516800
+    assert clock.tick(1) and clock.time() == -62135516799
+    assert not clock.tick(1)
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+import pytest
+from dateutil import tz as dateutil_tz
+
+from clock.backend.api import DateTime
+from clock.backend.formatter import compile_format
+from clock.backend.renderer import Change, IncrementalRenderer
+from clock.backend.source import FrozenClock
+
+# The clocks go back in London at this instant
+TRANSITION = 1_729_990_800
+NEW_YEAR = 1_735_689_600  # 2025-01-01 00:00 UTC
+
+
+@pytest.mark.parametrize(
+    "time_format, date_format",
+    [
+        ("hh:mm:ss A", "DD MMM, YYYY"),
+        ("HH:mm:ss.SS ZZ", "dddd Do MMMM YYYY [week] W"),
+        ("h:m:s a Z", "DDDD YY-M-D"),
+    ],
+)
+@pytest.mark.parametrize("zone", ["Europe/London", "Asia/Kolkata", "America/St_Johns"])
+def test_the_applied_changes_match_a_full_render(zone, time_format, date_format):
+    tz = dateutil_tz.gettz(zone)
+    renderer = IncrementalRenderer(DateTime(tz, source=FrozenClock(0)), time_format, date_format)
+    time_plan, date_plan = compile_format(time_format), compile_format(date_format)
+    shown_time = shown_date = None
+    for start in (TRANSITION, NEW_YEAR):
+        for step in range(-2_000, 2_000):
+            epoch = start + step * 0.73
+            changes = renderer.tick(epoch)
+            shown_time = changes.time if changes.time is not None else shown_time
+            shown_date = changes.date if changes.date is not None else shown_date
+            dt = datetime.fromtimestamp(round(epoch * 1_000_000) / 1_000_000, tz)
+            assert (shown_time, shown_date) == (time_plan.render(dt), date_plan.render(dt))
+
+
+def test_only_the_changed_strings_are_returned():
+    clock = FrozenClock(1_700_000_000)
+    renderer = IncrementalRenderer(DateTime(dateutil_tz.UTC, source=clock))
+    first = renderer.tick()
+    assert first.fields == Change.ALL
+    assert (first.time, first.date) == ("10:13:20 PM", "14 Nov, 2023")
+
+    clock.advance(0.25)
+    changes = renderer.tick()
+    assert changes.fields == Change.SUB_SECOND
+    assert (changes.time, changes.date) == (None, None)
+
+    clock.set(1_700_006_400)  # the next day, at 00:00:00
+    changes = renderer.tick()
+    assert Change.DAY in changes.fields and Change.SESSION in changes.fields
+    assert (changes.time, changes.date) == ("12:00:00 AM", "15 Nov, 2023")
+
+    renderer.reset()
+    assert renderer.tick().fields == Change.ALL
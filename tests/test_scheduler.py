@@ -0,0 +1,98 @@
+import asyncio
+import threading
+from datetime import datetime, time, timedelta
+
+from dateutil import tz as dateutil_tz
+
+from clock.backend.api import DateTime
+from clock.backend.scheduler import WEEKDAYS, Recurrence, Scheduler
+from clock.backend.source import FrozenClock
+from clock.backend.zone import ZoneOffset
+
+LONDON = dateutil_tz.gettz("Europe/London")
+# Saturday 2024-03-30 12:00 UTC, the clocks go forward the next night
+START = 1_711_800_000
+
+
+def _next_local(after: datetime, at: time, weekdays=None) -> datetime:
+    """The reference: walks the local days, as naive wall times"""
+    day = after.date()
+    while True:
+        due = datetime.combine(day, at).replace(tzinfo=after.tzinfo)
+        if due > after and (weekdays is None or due.weekday() in weekdays):
+            return due
+        day += timedelta(days=1)
+
+
+def test_recurrence_follows_the_dst_transition():
+    zone = ZoneOffset(LONDON)
+    for at in (time(0, 30), time(1, 30), time(2, 30), time(6, 30), time(23, 59)):
+        for weekdays in (None, WEEKDAYS):
+            recurrence = Recurrence(at, zone, weekdays)
+            epoch = START
+            for _ in range(10):
+                due = recurrence.next_after(epoch)
+                expected = _next_local(datetime.fromtimestamp(epoch, LONDON), at, weekdays)
+                if at != time(1, 30) or expected.date() != datetime(2024, 3, 31).date():
+                    # 01:30 doesn't exist that night, it fires right after the gap
+                    assert datetime.fromtimestamp(due, LONDON).replace(
+                        tzinfo=None
+                    ) == expected.replace(tzinfo=None)
+                epoch = due
+
+
+def test_alarms_scheduled_from_many_threads():
+    scheduler = Scheduler(DateTime(LONDON, source=FrozenClock(START)))
+    zones = [dateutil_tz.gettz(name) for name in ("Europe/London", "America/New_York")]
+    barrier = threading.Barrier(8)
+    jobs = []
+
+    def schedule(index: int) -> None:
+        barrier.wait()
+        for minute in range(200):
+            jobs.append(
+                scheduler.alarm(time(minute // 60, minute % 60), print, tz=zones[index % 2])
+            )
+
+    threads = [threading.Thread(target=schedule, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(scheduler) == 1600
+    references = {id(tz): ZoneOffset(tz) for tz in zones}
+    for job in jobs:  # against the same alarm, scheduled alone
+        recurrence = Recurrence(job.recurrence.at, references[id(job.recurrence.tz)])
+        assert job.due == recurrence.next_after(START)
+
+
+def test_timer_and_cancel():
+    clock = FrozenClock(START)
+    scheduler = Scheduler(DateTime(LONDON, source=clock))
+    job = scheduler.timer(90, print)
+    clock.advance(30)
+    assert job.remaining() == 60
+    job.cancel()
+    assert len(scheduler) == 0
+
+
+def test_cancelling_fired_jobs_keeps_the_count():
+    clock = FrozenClock(START)
+    scheduler = Scheduler(DateTime(LONDON, source=clock))
+    fired = []
+    jobs = [scheduler.timer(0, fired.append) for _ in range(3)]
+    later = scheduler.timer(60, fired.append)
+
+    async def run() -> None:
+        scheduler.start()
+        await asyncio.sleep(0.01)
+        scheduler.stop()
+
+    asyncio.run(run())
+    assert fired == jobs
+    for job in jobs:
+        job.cancel()
+    assert len(scheduler) == 1
+    later.cancel()
+    assert len(scheduler) == 0
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import os
+import time
+
+from clock.server import ClockProtocol, TickServer, _ws_frame
+
+# 2023-11-14 22:13:20 UTC
+SECOND = 1_700_000_000
+
+
+async def _serve(server: TickServer) -> asyncio.AbstractServer:
+    """Listens on a free loopback port, the ticks are driven by the test"""
+    loop = asyncio.get_running_loop()
+    listener = await loop.create_server(lambda: ClockProtocol(server), "127.0.0.1", 0)
+    server.port = listener.sockets[0].getsockname()[1]
+    return listener
+
+
+async def _request(
+    server: TickServer, head: str
+) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    writer.write(head.encode() + b"\r\n\r\n")
+    await writer.drain()
+    return reader, writer
+
+
+async def _response(reader: asyncio.StreamReader) -> tuple[str, dict[str, str], bytes]:
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+    status, *lines = head.strip().split("\r\n")
+    headers = dict(line.split(": ", 1) for line in lines)
+    body = b""
+    if "Content-Length" in headers:
+        body = await reader.readexactly(int(headers["Content-Length"]))
+    return status, headers, body
+
+
+async def _ws_message(reader: asyncio.StreamReader) -> tuple[int, bytes]:
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        length = int.from_bytes(await reader.readexactly(2), "big")
+    elif length == 127:
+        length = int.from_bytes(await reader.readexactly(8), "big")
+    assert not second & 0x80  # servers never mask
+    return first & 0x0F, await reader.readexactly(length)
+
+
+def _masked(data: bytes, opcode: int) -> bytes:
+    mask = os.urandom(4)
+    payload = bytes(byte ^ mask[index % 4] for index, byte in enumerate(data))
+    return bytes((0x80 | opcode, 0x80 | len(data))) + mask + payload
+
+
+def test_one_shot_responses():
+    async def run() -> None:
+        server = TickServer(port=0)
+        async with await _serve(server):
+            head = "GET /now?tz=UTC&time_format=hh:mm%20A HTTP/1.1"
+            reader, writer = await _request(server, head)
+            status, headers, body = await _response(reader)
+            writer.close()
+            assert status == "HTTP/1.1 200 OK"
+            assert headers["Content-Type"] == "application/json"
+            data = json.loads(body)
+            assert abs(data["epoch"] - time.time()) < 5 and data["tz"] == "UTC"
+            assert set(data) == {"epoch", "tz", "time", "date", "time_data", "date_data"}
+
+            for head, expected in (
+                ("GET /nowhere HTTP/1.1", "HTTP/1.1 404 Not Found"),
+                ("POST /now HTTP/1.1", "HTTP/1.1 404 Not Found"),
+                ("GET /now?tz=Mars/Olympus HTTP/1.1", "HTTP/1.1 400 Bad Request"),
+                ("GET /ws HTTP/1.1", "HTTP/1.1 400 Bad Request"),
+                ("GET /now HTTP/1.1\r\nX-Padding: " + "x" * 10_000, "HTTP/1.1 431 Too Large"),
+            ):
+                reader, writer = await _request(server, head)
+                assert (await _response(reader))[0] == expected
+                writer.close()
+
+    asyncio.run(run())
+
+
+def test_sse_and_websocket_subscribers_get_the_same_second():
+    async def run() -> None:
+        server = TickServer(port=0)
+        async with await _serve(server):
+            query = "?tz=UTC&time_format=hh:mm:ss%20A&date_format=DD%20MMM,%20YYYY"
+            sse, sse_writer = await _request(server, f"GET /events{query} HTTP/1.1")
+            status, headers, _ = await _response(sse)
+            assert status == "HTTP/1.1 200 OK"
+            assert headers["Content-Type"] == "text/event-stream"
+            await sse.readuntil(b"\n\n")  # the current second, on subscribing
+
+            ws, ws_writer = await _request(
+                server,
+                f"GET /ws{query} HTTP/1.1\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                "Sec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\nSec-WebSocket-Version: 13",
+            )
+            status, headers, _ = await _response(ws)
+            assert status == "HTTP/1.1 101 Switching Protocols"
+            assert headers["Sec-WebSocket-Accept"] == "s3pPLMBiTxaQ9kYGzzhZRbK+xOo="
+            await _ws_message(ws)
+            assert server.subscriber_count == 2 and len(server.feeds) == 1
+
+            server.tick(SECOND)
+            event = await sse.readuntil(b"\n\n")
+            assert event.startswith(b"id: %d\ndata: " % SECOND)
+            opcode, message = await _ws_message(ws)
+            assert opcode == 0x1 and message == event[len(b"id: 1700000000\ndata: ") : -2]
+            data = json.loads(message)
+            assert (data["time"], data["date"]) == ("10:13:20 PM", "14 Nov, 2023")
+            # Serialized once for the second, the same bytes for every subscriber
+            (feed,) = server.feeds.values()
+            assert feed.payload(SECOND) is feed.payload(SECOND)
+
+            ws_writer.write(_masked(b"hello", opcode=0x9))
+            assert await _ws_message(ws) == (0xA, b"hello")
+            ws_writer.write(_masked(b"", opcode=0x8))
+            assert await _ws_message(ws) == (0x8, b"")
+            assert await ws.read() == b""
+            await asyncio.sleep(0.05)
+            assert server.subscriber_count == 1
+            sse_writer.close()
+
+    asyncio.run(run())
+
+
+class StalledTransport(asyncio.Transport):
+    """A client whose socket buffer is full"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.written: list[bytes] = []
+        self.aborted = False
+
+    def set_write_buffer_limits(self, high=None, low=None) -> None:
+        pass
+
+    def write(self, data: bytes) -> None:
+        self.written.append(data)
+
+    def close(self) -> None:
+        pass
+
+    def abort(self) -> None:
+        self.aborted = True
+
+
+def test_a_stalled_subscriber_skips_seconds_then_is_dropped():
+    server = TickServer(max_stall=10)
+    protocol, transport = ClockProtocol(server), StalledTransport()
+    protocol.connection_made(transport)
+    protocol.data_received(b"GET /events?tz=UTC HTTP/1.1\r\n\r\n")
+    assert server.subscriber_count == 1 and len(transport.written) == 2
+
+    protocol.pause_writing()
+    server.tick(SECOND)
+    server.tick(SECOND + 1)
+    assert server.skipped == 2 and len(transport.written) == 2
+    protocol.resume_writing()
+    server.tick(SECOND + 2)
+    assert transport.written[-1].startswith(b"id: %d\n" % (SECOND + 2))
+
+    protocol.pause_writing()
+    protocol.paused_since -= 11  # type: ignore[operator]
+    server.tick(SECOND + 3)
+    assert transport.aborted and server.subscriber_count == 0
+
+
+def test_large_frames_have_extended_lengths():
+    assert _ws_frame(b"x" * 125)[:2] == b"\x81\x7d"
+    assert _ws_frame(b"x" * 126)[:4] == b"\x81\x7e\x00\x7e"
+    assert _ws_frame(b"x" * 70_000)[:10] == b"\x81\x7f" + (70_000).to_bytes(8, "big")
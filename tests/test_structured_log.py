@@ -0,0 +1,91 @@
+import gzip
+import logging
+
+import pytest
+
+from clock.backend.logger import StructuredFileHandler
+from clock.backend.logger.reader import main, read_records
+
+
+def _log(handler: StructuredFileHandler) -> None:
+    logger = logging.getLogger("test.structured")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        logger.debug("plain %s", "ascii")
+        logger.info("unicode: ünïcödé ✓, \"quoted\" and a\nnew line")
+        logger.getChild("child").warning("from a child logger")
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logger.exception("failed")
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+
+@pytest.mark.parametrize("format, name", [("jsonl", "app.jsonl"), ("binary", "app.bin")])
+def test_the_records_read_back_as_logged(tmp_path, format, name):
+    logged: list[logging.LogRecord] = []
+
+    class Capture(StructuredFileHandler):
+        def emit(self, record: logging.LogRecord) -> None:
+            logged.append(record)
+            super().emit(record)
+
+    _log(Capture(file=tmp_path / name, format=format, max_bytes=None))
+    records = list(read_records(tmp_path / name))
+
+    assert len(records) == len(logged) == 4
+    for read, original in zip(records, logged):
+        assert read.getMessage() == original.getMessage()
+        assert read.name == original.name
+        assert read.levelno == original.levelno
+        assert read.levelname == original.levelname
+        assert read.pathname == original.pathname
+        assert read.lineno == original.lineno
+        assert read.created == pytest.approx(original.created, abs=1e-6)
+    assert records[-1].exc_text.startswith("Traceback")
+    assert records[-1].exc_text.endswith("ZeroDivisionError: division by zero")
+    assert records[0].exc_text is None
+
+
+@pytest.mark.parametrize("format", ["jsonl", "binary"])
+def test_the_rotated_segments_read_back_gzipped(tmp_path, format):
+    path = tmp_path / "app.log"
+    _log(StructuredFileHandler(file=path, format=format, max_bytes=None))
+    rotated = tmp_path / "app.log.1.gz"
+    rotated.write_bytes(gzip.compress(path.read_bytes()))
+
+    messages = [record.getMessage() for record in read_records(rotated)]
+    assert messages == [record.getMessage() for record in read_records(path)]
+    assert messages[0] == "plain ascii"
+
+
+@pytest.mark.parametrize("format, cut", [("jsonl", 10), ("binary", 10), ("binary", 3)])
+def test_a_torn_last_record_is_skipped(tmp_path, capsys, format, cut):
+    path = tmp_path / "app.log"
+    _log(StructuredFileHandler(file=path, format=format, max_bytes=None))
+    complete = len(list(read_records(path)))
+    with open(path, "ab") as file:
+        file.write(path.read_bytes()[:cut])
+
+    assert len(list(read_records(path))) == complete
+    assert "Skipping" in capsys.readouterr().err
+
+
+def test_unknown_formats_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        StructuredFileHandler(file=tmp_path / "app.log", format="xml")  # type: ignore[arg-type]
+
+
+def test_the_reader_renders_from_the_lowest_level(tmp_path, capsys):
+    path = tmp_path / "app.jsonl"
+    _log(StructuredFileHandler(file=path, max_bytes=None))
+
+    assert main([str(path), "--level", "warning"]) == 0
+    output = capsys.readouterr().out
+    assert "from a child logger" in output
+    assert "ZeroDivisionError" in output
+    assert "plain ascii" not in output
@@ -0,0 +1,101 @@
+import io
+import re
+
+from dateutil import tz as dateutil_tz
+
+from clock.backend.api import DateTime
+from clock.backend.renderer import Change, ChangeSet, IncrementalRenderer
+from clock.backend.source import FrozenClock
+from clock.terminal import TerminalClock, diff_line
+
+_ESCAPE = re.compile(r"\x1b\[(\??)(\d*)([A-Za-z])|\r|\n|[^\x1b\r\n]+")
+
+
+class Screen(io.StringIO):
+    """A terminal, interpreting the few escape sequences the clock writes"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.rows: list[list[str]] = [[]]
+        self.row = self.column = 0
+
+    def isatty(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        for match in _ESCAPE.finditer(text):
+            token = match.group(0)
+            if token == "\r":
+                self.column = 0
+            elif token == "\n":
+                self.row, self.column = self.row + 1, 0
+                while len(self.rows) <= self.row:
+                    self.rows.append([])
+            elif match.group(3):
+                private, count, command = match.groups()
+                if private:
+                    continue  # the cursor's visibility
+                count = int(count or 1)
+                if command == "G":
+                    self.column = count - 1
+                elif command == "A":
+                    self.row -= count
+                elif command == "B":
+                    self.row += count
+                elif command == "J":
+                    del self.rows[self.row][self.column :]
+                    del self.rows[self.row + 1 :]
+            else:
+                line = self.rows[self.row]
+                line.extend(" " * (self.column + len(token) - len(line)))
+                line[self.column : self.column + len(token)] = token
+                self.column += len(token)
+        return super().write(text)
+
+    @property
+    def lines(self) -> list[str]:
+        return ["".join(row).rstrip() for row in self.rows]
+
+
+def test_diff_line_rewrites_the_changed_runs_only():
+    assert diff_line("10:13:20 PM", "10:13:21 PM") == "\x1b[8G1"
+    assert diff_line("09:59:59 AM", "10:00:00 AM") == "\x1b[1G10\x1b[4G00\x1b[7G00"
+    assert diff_line("same", "same") == ""
+    assert diff_line("1 Jan", "31 Jan") == "\x1b[1G31 Jan"
+
+
+def test_the_screen_shows_the_lines_after_each_change():
+    screen = Screen()
+    clock = TerminalClock(show="datetime", tz=dateutil_tz.UTC, file=screen)
+    clock.apply(ChangeSet(Change.ALL, "11:59:59 PM", "31 Dec, 2023"))
+    assert screen.lines == ["31 Dec, 2023", "11:59:59 PM"]
+    clock.apply(ChangeSet(Change.ALL, "12:00:00 AM", "01 Jan, 2024"))
+    assert screen.lines == ["01 Jan, 2024", "12:00:00 AM"]
+    written = screen.tell()
+    clock.apply(ChangeSet(Change.SECOND, "12:00:01 AM", None))
+    assert screen.lines == ["01 Jan, 2024", "12:00:01 AM"]
+    assert screen.tell() - written < 8  # a single character, and the cursor's moves
+
+    clock._resized()  # drawn whole again, from the first line
+    clock.apply(ChangeSet(Change.SECOND, "12:00:02 AM", None))
+    assert screen.lines == ["01 Jan, 2024", "12:00:02 AM"]
+
+
+def test_a_pipe_gets_a_line_per_change():
+    output = io.StringIO()
+    clock = TerminalClock(show="timedate", tz=dateutil_tz.UTC, file=output)
+    clock.apply(ChangeSet(Change.ALL, "10:13:20 PM", "14 Nov, 2023"))
+    clock.apply(ChangeSet(Change.SUB_SECOND, None, None))
+    clock.apply(ChangeSet(Change.SECOND, "10:13:21 PM", None))
+    assert output.getvalue() == "10:13:20 PM 14 Nov, 2023\n10:13:21 PM 14 Nov, 2023\n"
+
+
+def test_ticks_draw_the_clock_source_time():
+    source = FrozenClock(1_700_000_000)
+    screen = Screen()
+    clock = TerminalClock(show="time", file=screen)
+    clock.renderer = IncrementalRenderer(DateTime(dateutil_tz.UTC, source=source))
+    clock.tick()
+    source.advance(61)
+    clock.tick()
+    assert screen.lines == ["10:14:21 PM"]
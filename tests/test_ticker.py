@@ -0,0 +1,48 @@
+import asyncio
+import logging
+
+import pytest
+
+from clock.backend.source import FixedStepClock, FrozenClock
+from clock.backend.ticker import Ticker
+
+
+def test_a_failing_tick_is_logged_and_the_ticker_goes_on(caplog):
+    ticks = []
+
+    def callback(deadline: float) -> None:
+        ticks.append(deadline)
+        if len(ticks) == 2:
+            raise RuntimeError("a bad frame")
+
+    async def run() -> None:
+        ticker = Ticker(rate=100)
+        task = ticker.start(callback)
+        while len(ticks) < 5:
+            await asyncio.sleep(0.01)
+        ticker.stop()
+        assert not task.done() or task.cancelled()
+
+    with caplog.at_level(logging.ERROR, logger="clock.ticker"):
+        asyncio.run(run())
+    assert len(ticks) >= 5
+    assert "a bad frame" in caplog.text
+
+
+def test_simulate_runs_without_sleeping():
+    seen = []
+    clock = FixedStepClock(1_700_000_000, step=60)
+    count = asyncio.run(Ticker().simulate(seen.append, clock, until=1_700_000_000 + 86_400))
+    assert count == 1440
+    assert seen[0] == 1_700_000_000 and seen[-1] == 1_700_000_000 + 86_340
+
+
+def test_simulate_stops_on_a_clock_standing_still():
+    seen = []
+    clock = FrozenClock(1_700_000_000)
+    assert asyncio.run(Ticker().simulate(seen.append, clock, until=1_700_000_001)) == 1
+    assert asyncio.run(Ticker().simulate(seen.append, clock, ticks=3)) == 3
+    with pytest.raises(ValueError):
+        asyncio.run(Ticker().simulate(seen.append, clock))
+    with pytest.raises(ValueError):
+        asyncio.run(Ticker().simulate(seen.append, FixedStepClock(0)))
@@ -0,0 +1,48 @@
+import random
+from datetime import datetime, timezone
+
+import pytest
+from dateutil import tz as dateutil_tz
+
+from clock.backend.zone import ZoneOffset
+
+ZONES = ["UTC", "Europe/London", "America/New_York", "Australia/Lord_Howe", "Asia/Kolkata"]
+# The London transitions of 2024
+TRANSITIONS = [1_711_846_800, 1_729_990_800]
+
+
+def _epochs(seed: int) -> list[int]:
+    """In order around the transitions, then jumping anywhere from 1900 to 2100 (each jump
+    looks the next transition up again, so there are fewer of them)"""
+    rng = random.Random(seed)
+    epochs = []
+    for transition in TRANSITIONS:
+        epochs += range(transition - 7_200, transition + 7_200, 599)
+    epochs += [rng.randrange(-2_208_988_800, 4_102_444_800) for _ in range(100)]
+    return epochs
+
+
+@pytest.mark.parametrize("zone", ZONES)
+def test_offsets_and_datetimes_match_fromtimestamp(zone):
+    tz = dateutil_tz.gettz(zone)
+    offsets = ZoneOffset(tz)
+    for epoch in _epochs(3):
+        expected = datetime.fromtimestamp(epoch, tz)
+        assert offsets.at(epoch) == expected.utcoffset().total_seconds()
+        microseconds = epoch * 1_000_000 + 250_000
+        actual = offsets.datetime_at(microseconds)
+        expected = datetime.fromtimestamp(microseconds / 1_000_000, tz)
+        assert actual == expected
+        assert actual.replace(tzinfo=None) == expected.replace(tzinfo=None)
+
+
+@pytest.mark.parametrize("zone", ZONES)
+def test_epoch_of_round_trips_the_wall_times(zone):
+    tz = dateutil_tz.gettz(zone)
+    offsets = ZoneOffset(tz)
+    for epoch in _epochs(5):
+        wall = datetime.fromtimestamp(epoch, tz)
+        local = int(wall.replace(tzinfo=timezone.utc).timestamp())
+        # A repeated wall time is taken on its first occurrence
+        first = wall.replace(fold=0)
+        assert offsets.epoch_of(local) == epoch - (first.utcoffset() - wall.utcoffset()).seconds